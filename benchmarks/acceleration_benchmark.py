@@ -0,0 +1,128 @@
+"""Epoch time and accuracy parity of XLA, mixed bfloat16 and steps_per_execution.
+
+Each mode runs in a fresh subprocess, because the Keras dtype policy is global
+and XLA clusters are compiled once per process. Every run trains the
+pipeline's CNN, as built by src/models/model_builder.py, from the same seed
+and data and reports its last epoch, so tracing and compilation in the first
+epoch are excluded. Modes combine
+'float32', 'jit', 'bf16' and 'spe=N' with '+'; the first mode is the baseline
+the others are compared against.
+
+    python benchmarks/acceleration_benchmark.py --modes float32 jit bf16 spe=32 jit+bf16+spe=32
+"""
+import argparse
+import json
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+RESULT_PREFIX = 'RESULT '
+
+
+def parse_mode(mode):
+    """TrainingAccelerator arguments for a mode such as 'jit+bf16+spe=32'"""
+    settings = {'jit_compile': False, 'mixed_precision': 'float32', 'steps_per_execution': 1}
+    for token in mode.split('+'):
+        if token == 'jit':
+            settings['jit_compile'] = True
+        elif token == 'bf16':
+            settings['mixed_precision'] = 'mixed_bfloat16'
+        elif token.startswith('spe='):
+            settings['steps_per_execution'] = int(token[len('spe='):])
+        elif token != 'float32':
+            raise ValueError(f"Unknown mode token '{token}'")
+    return settings
+
+
+def run_worker(args):
+    """Train once in the given mode and print the last epoch's time and accuracy as JSON"""
+    import tensorflow as tf
+    from src.data.data_loader import DataLoader
+    from src.data.data_preprocessor import DataPreprocessor
+    from src.data.dataset_builder import DatasetBuilder
+    from src.models.model_builder import ModelBuilder
+    from src.training.acceleration import TrainingAccelerator
+    from src.training.callbacks import ThroughputCallback
+
+    accelerator = TrainingAccelerator(**parse_mode(args.worker_mode))
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+        processed = DataPreprocessor().preprocess(x_train, y_train, x_test, y_test)
+        x, y = processed['x_train'][:args.examples], processed['y_train'][:args.examples]
+        builder = DatasetBuilder()
+        train_dataset = builder.build(x, y, training=True)
+        val_dataset = builder.build(processed['x_val'], processed['y_val'], name='val')
+
+        tf.keras.utils.set_random_seed(args.seed)
+        accelerator.set_policy()
+        model_builder = ModelBuilder()
+        model = model_builder.create_cnn_model()
+        model_builder.compile_model()
+        accelerator.configure(model)
+
+        throughput = ThroughputCallback(len(x))
+        history = model.fit(train_dataset, validation_data=val_dataset, epochs=args.epochs,
+                            callbacks=[throughput], verbose=0)
+
+    print(RESULT_PREFIX + json.dumps({
+        **accelerator.params(),
+        'epoch_time_s': throughput.epoch_stats[-1]['epoch_time_s'],
+        'examples_per_sec': throughput.epoch_stats[-1]['examples_per_sec'],
+        'val_accuracy': float(history.history['val_accuracy'][-1])
+    }))
+
+
+def run_mode(args, mode):
+    command = [
+        sys.executable, __file__, '--worker-mode', mode, '--epochs', str(args.epochs),
+        '--examples', str(args.examples), '--seed', str(args.seed)
+    ]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"No result from worker for mode={mode}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training acceleration modes")
+    parser.add_argument('--modes', nargs='+', default=['float32', 'jit', 'bf16', 'spe=32', 'jit+bf16+spe=32'])
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--examples', type=int, default=20000, help="Training examples per epoch")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=Path, help="Write all results as JSON")
+    parser.add_argument('--worker-mode', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_mode:
+        run_worker(args)
+        return
+
+    from src.training.acceleration import TrainingAccelerator
+    parity = TrainingAccelerator()
+
+    results = []
+    print(f"\n{'mode':>18} {'policy':>15} {'epoch s':>8} {'speedup':>8} {'ex/sec':>9} {'val acc':>8} {'delta':>8} {'parity':>7}")
+    for mode in args.modes:
+        stats = run_mode(args, mode)
+        baseline = results[0] if results else stats
+        stats['speedup'] = baseline['epoch_time_s'] / stats['epoch_time_s']
+        stats['accuracy_delta'] = stats['val_accuracy'] - baseline['val_accuracy']
+        stats['parity_ok'] = stats['accuracy_delta'] >= -parity.parity_tolerance
+        results.append({'mode': mode, **stats})
+        print(f"{mode:>18} {stats['precision_policy']:>15} {stats['epoch_time_s']:>8.2f} {stats['speedup']:>7.2f}x "
+              f"{stats['examples_per_sec']:>9.0f} {stats['val_accuracy']:>8.4f} {stats['accuracy_delta']:>+8.4f} "
+              f"{'✓' if stats['parity_ok'] else '❌':>7}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
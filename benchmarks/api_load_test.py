@@ -0,0 +1,151 @@
+"""Concurrent load test for the serving API.
+
+Measures p50/p99 latency of /health and /predict while /predict is under
+load, either against the in-process app (with the configured executor
+enabled or disabled) or against a running server via --url.
+
+    python benchmarks/api_load_test.py --compare
+    python benchmarks/api_load_test.py --url http://localhost:8000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+
+class SyntheticEngine:
+    """Stand-in engine that holds a CPU thread for a fixed time per call"""
+
+    name = 'synthetic'
+    version = 'synthetic'
+
+    def __init__(self, latency_ms):
+        self.latency_s = latency_ms / 1000.0
+
+    def predict(self, images):
+        time.sleep(self.latency_s)
+        return np.full((len(images), 10), 0.1, dtype='float32')
+
+
+def percentiles(latencies):
+    """Summarize latencies in milliseconds"""
+    values = np.array(latencies) * 1000.0
+    return {
+        'count': len(values),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p99_ms': float(np.percentile(values, 99))
+    }
+
+
+async def timed_request(client, method, path, **kwargs):
+    start = time.perf_counter()
+    response = await client.request(method, path, **kwargs)
+    return time.perf_counter() - start, response.status_code
+
+
+async def run_load(client, requests, concurrency, health_interval_ms=10):
+    """Fire /predict at the given concurrency while probing /health"""
+    payload = {'image': np.random.randint(0, 256, 784).tolist()}
+    semaphore = asyncio.Semaphore(concurrency)
+    predict_latencies, health_latencies, status_codes = [], [], {}
+    done = asyncio.Event()
+
+    async def predict_worker():
+        async with semaphore:
+            latency, status = await timed_request(client, 'POST', '/predict', json=payload)
+            status_codes[status] = status_codes.get(status, 0) + 1
+            if status == 200:
+                predict_latencies.append(latency)
+
+    async def health_prober():
+        # Probes run on a fixed schedule and latency is measured from the
+        # scheduled time, so time spent waiting on a blocked loop is counted
+        interval = health_interval_ms / 1000.0
+        scheduled = time.perf_counter()
+        while not done.is_set():
+            await client.get('/health')
+            health_latencies.append(time.perf_counter() - scheduled)
+            scheduled = max(scheduled + interval, time.perf_counter())
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+
+    prober = asyncio.create_task(health_prober())
+    start = time.perf_counter()
+    await asyncio.gather(*(predict_worker() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+
+    return {
+        'predict': percentiles(predict_latencies),
+        'health': percentiles(health_latencies),
+        'status_codes': status_codes,
+        'throughput_rps': requests / elapsed
+    }
+
+
+async def run_in_process(args, use_executor):
+    """Run the load against the app in this process"""
+    from src.serving.api import main
+
+    load_model = main.load_model
+    main.load_model = lambda: main.activate_engine(SyntheticEngine(args.model_latency_ms))
+    create_executor, create_cache, create_watcher = main.create_executor, main.create_cache, main.create_watcher
+    if not use_executor:
+        main.create_executor = lambda: None
+    # Every request carries the same image, so the cache would answer them all
+    main.create_cache = lambda: None
+    # The watcher would hot-reload the deployed model over the synthetic one mid-run
+    main.create_watcher = lambda: None
+
+    await main.startup_event()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            return await run_load(client, args.requests, args.concurrency)
+    finally:
+        await main.shutdown_event()
+        main.create_executor, main.create_cache, main.create_watcher = create_executor, create_cache, create_watcher
+        main.load_model = load_model
+
+
+def print_report(label, report):
+    print(f"\n{label}")
+    for endpoint in ('health', 'predict'):
+        stats = report[endpoint]
+        print(f"  /{endpoint:<8} n={stats['count']:<5} p50={stats['p50_ms']:8.2f}ms  p99={stats['p99_ms']:8.2f}ms")
+    print(f"  throughput={report['throughput_rps']:.1f} req/s  status={report['status_codes']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the MNIST serving API")
+    parser.add_argument('--url', help="Base URL of a running server (default: in-process app)")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--model-latency-ms', type=float, default=5.0,
+                        help="Per-call latency of the synthetic in-process model")
+    parser.add_argument('--compare', action='store_true',
+                        help="Run in-process with inline inference, then with the executor")
+    args = parser.parse_args()
+
+    if args.url:
+        async def remote():
+            async with httpx.AsyncClient(base_url=args.url, timeout=30.0) as client:
+                return await run_load(client, args.requests, args.concurrency)
+        print_report(f"Server at {args.url}", asyncio.run(remote()))
+        return
+
+    if args.compare:
+        print_report("Inline inference (event loop blocked)", asyncio.run(run_in_process(args, False)))
+    print_report("Bounded executor", asyncio.run(run_in_process(args, True)))
+
+
+if __name__ == "__main__":
+    main()
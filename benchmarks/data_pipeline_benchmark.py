@@ -0,0 +1,97 @@
+"""Wall time and peak RSS of training pipeline steps 1-3.
+
+Each mode runs in a fresh subprocess so peak RSS is not shared:
+  baseline  load the raw .npz and preprocess in memory (no cache)
+  cold      same, then write the processed .npy cache
+  warm      memory-map the processed cache written by the cold run
+
+    python benchmarks/data_pipeline_benchmark.py
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def run_steps(mode, cache_dir):
+    """Run steps 1-3 of the training pipeline and report time and peak memory"""
+    import tensorflow as tf
+    from src.data.data_loader import DataLoader
+    from src.data.data_preprocessor import DataPreprocessor
+    from src.data.processed_cache import ProcessedDataCache
+    from src.utils.config import config
+
+    start = time.perf_counter()
+    data_loader = DataLoader()
+    params = {
+        'validation_size': config.base['data']['validation_size'],
+        'random_state': config.base['data']['random_state']
+    }
+    processed_cache = ProcessedDataCache(data_loader.raw_data_path, params=params, cache_dir=cache_dir)
+    processed = processed_cache.load() if mode == 'warm' else None
+
+    if processed is None:
+        (x_train, y_train), (x_test, y_test) = data_loader.load_data()
+        processed = DataPreprocessor().preprocess(
+            x_train, y_train, x_test, y_test,
+            test_size=params['validation_size'], random_state=params['random_state']
+        )
+        if mode == 'cold':
+            processed = processed_cache.save(processed)
+
+    steps_1_2_s = time.perf_counter() - start
+    steps_1_2_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+    datasets = [
+        tf.data.Dataset.from_tensor_slices((processed[f'x_{split}'], processed[f'y_{split}']))
+        for split in ('train', 'val', 'test')
+    ]
+    elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'steps_1_2_s': steps_1_2_s,
+        'steps_1_2_peak_rss_mb': steps_1_2_rss_mb,
+        'wall_time_s': elapsed,
+        # ru_maxrss is reported in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        'datasets': len(datasets)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training pipeline data steps")
+    parser.add_argument('--mode', choices=['baseline', 'cold', 'warm'], help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help="Processed cache directory (default: a temporary directory)")
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_steps(args.mode, args.cache_dir)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = args.cache_dir or tmp_dir
+        results = []
+        for mode in ('baseline', 'cold', 'warm'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--mode', mode, '--cache-dir', cache_dir],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"\n{'':<10} {'steps 1-2':>24} {'steps 1-3':>24}")
+    print(f"{'mode':<10} {'time s':>11} {'peak RSS MB':>12} {'time s':>11} {'peak RSS MB':>12}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['steps_1_2_s']:>11.2f} {result['steps_1_2_peak_rss_mb']:>12.0f} "
+              f"{result['wall_time_s']:>11.2f} {result['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
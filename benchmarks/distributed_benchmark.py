@@ -0,0 +1,119 @@
+"""Data-parallel training throughput on 1, 2 and 4 local workers.
+
+Each configuration launches a fresh cluster of worker processes coordinated
+through TF_CONFIG, trains the pipeline's CNN with ModelTrainer.train_distributed
+and reports the chief's last epoch, so tracing in the first epoch is excluded.
+Cores are split evenly between workers, so on one host the per-worker numbers
+show communication overhead rather than extra hardware.
+
+    python benchmarks/distributed_benchmark.py --workers 1 2 4 --examples 20000
+"""
+import argparse
+import json
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.data.processed_cache import ARRAY_NAMES, ProcessedDataCache
+from src.training.distributed import is_chief, launch_local_workers
+from src.utils.config import config
+
+RESULT_PREFIX = 'RESULT '
+
+
+def run_worker(args):
+    """Train as one worker of the cluster in TF_CONFIG; the chief prints its last epoch as JSON"""
+    from src.models.model_builder import ModelBuilder
+    from src.training.trainer import ModelTrainer
+
+    # Keep benchmark runs and models out of the project's MLflow store and model directory
+    config.base['mlflow']['tracking_uri'] = str(Path(args.data_dir) / 'mlruns')
+    config.model_paths['trained'] = Path(args.data_dir) / 'models'
+
+    def build_model():
+        model_builder = ModelBuilder()
+        model = model_builder.create_cnn_model()
+        model_builder.compile_model()
+        return model
+
+    with redirect_stdout(StringIO()):
+        processed = ProcessedDataCache.open(args.data_dir)
+        _, history = ModelTrainer().train_distributed(
+            build_model, processed, epochs=args.epochs, global_batch_size=args.global_batch_size
+        )
+
+    if is_chief():
+        print(RESULT_PREFIX + json.dumps({name: values[-1] for name, values in history.items()}))
+
+
+def prepare_data(data_dir, examples):
+    """Preprocess MNIST once and write a subset where every worker can memory-map it"""
+    from src.data.data_loader import DataLoader
+    from src.data.data_preprocessor import DataPreprocessor
+
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+        processed = DataPreprocessor().preprocess(x_train, y_train, x_test, y_test)
+    for name in ARRAY_NAMES:
+        np.save(Path(data_dir) / f'{name}.npy', np.ascontiguousarray(processed[name][:examples]))
+
+
+def run_configuration(args, num_workers, base_port):
+    worker_argv = [
+        __file__, '--data-dir', args.data_dir, '--epochs', str(args.epochs),
+        '--global-batch-size', str(args.batch_size_per_worker * num_workers)
+    ]
+    completed = launch_local_workers(worker_argv, num_workers, base_port, capture_output=True)
+    for line in completed[0].stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"No result from the chief with {num_workers} workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-worker training scaling")
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--batch-size-per-worker', type=int, default=config.base['model']['batch_size'])
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--examples', type=int, default=20000, help="Training examples per epoch")
+    parser.add_argument('--base-port', type=int, default=config.base.get('distributed', {}).get('base_port', 23456))
+    parser.add_argument('--output', type=Path, help="Write all results as JSON")
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--global-batch-size', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.global_batch_size:
+        run_worker(args)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='distributed_benchmark_') as data_dir:
+        args.data_dir = data_dir
+        prepare_data(data_dir, args.examples)
+
+        print(f"\n{'workers':>8} {'global batch':>13} {'ex/sec':>9} {'ex/sec/worker':>14} "
+              f"{'epoch s':>8} {'efficiency':>11} {'val acc':>8}")
+        for i, num_workers in enumerate(args.workers):
+            # A fresh port range per cluster avoids clashing with sockets still closing
+            stats = run_configuration(args, num_workers, args.base_port + 10 * i)
+            results.append({'num_workers': num_workers, **stats})
+            per_worker = stats['examples_per_sec'] / num_workers
+            baseline = results[0]['examples_per_sec'] / results[0]['num_workers']
+            print(f"{num_workers:>8} {args.batch_size_per_worker * num_workers:>13} "
+                  f"{stats['examples_per_sec']:>9.0f} {per_worker:>14.0f} {stats['epoch_time_s']:>8.2f} "
+                  f"{per_worker / baseline:>10.0%} {stats['val_accuracy']:>8.4f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
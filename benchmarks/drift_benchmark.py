@@ -0,0 +1,63 @@
+"""NumPy drift engine vs the Evidently report on the full reference set.
+
+Fits reference statistics on the 60k training images once, then scores
+the test set, the test set with added noise, and (if evidently is
+installed) builds the Evidently DataDriftPreset report for comparison.
+
+    python benchmarks/drift_benchmark.py --evidently
+"""
+import argparse
+import sys
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.monitoring.data_drift import DataDriftMonitor
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark drift detection engines")
+    parser.add_argument('--evidently', action='store_true', help="Also time the Evidently report")
+    parser.add_argument('--current-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+    x_current, y_current = x_test[:args.current_size], y_test[:args.current_size]
+    noise = np.random.RandomState(0).randint(0, 80, size=x_current.shape)
+    x_noisy = np.clip(x_current.astype(np.int32) + noise, 0, 255).astype(np.uint8)
+
+    monitor = DataDriftMonitor()
+    _, fit_ms = timed(lambda: monitor.set_reference_data(x_train, y_train))
+    print(f"\nReference statistics on {len(x_train)} images: {fit_ms:.1f} ms")
+
+    print(f"{'batch':<10} {'engine':<10} {'time ms':>10} {'drift':>6} {'psi mean':>9} {'drift share':>12}")
+    for name, x in (('test', x_current), ('noisy', x_noisy)):
+        result, score_ms = timed(lambda: monitor.check_drift(x, y_current))
+        print(f"{name:<10} {'numpy':<10} {score_ms:>10.1f} {str(result['dataset_drift']):>6} "
+              f"{result['pixel_psi_mean']:>9.3f} {result['drifted_pixel_share']:>12.3f}")
+
+        if args.evidently:
+            try:
+                _, report_ms = timed(lambda: monitor.check_drift(x, y_current, engine='evidently'))
+                print(f"{name:<10} {'evidently':<10} {report_ms:>10.1f}")
+            except ImportError as e:
+                print(f"{name:<10} {'evidently':<10} skipped ({e})")
+
+
+if __name__ == "__main__":
+    main()
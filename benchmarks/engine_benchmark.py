@@ -0,0 +1,77 @@
+"""Parity check and latency benchmark for the serving inference engines.
+
+Loads the deployed model into every engine, confirms each predicts the
+same classes as Keras on the MNIST test set, then reports latency per
+engine and batch size.
+
+    python benchmarks/engine_benchmark.py --batch-sizes 1 32 256
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.serving.engines import ENGINES, TFLITE_MODEL_NAME, KerasEngine, export_tflite, load_engine
+from src.serving.payload import preprocess_images
+from src.utils.config import config
+
+
+def time_engine(engine, images, batch_size, repeats):
+    """Return per-batch latencies in milliseconds"""
+    batch = images[:batch_size]
+    engine.predict(batch)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.predict(batch)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serving inference engines")
+    parser.add_argument('--model-dir', type=Path, default=config.model_paths['deployed'])
+    parser.add_argument('--engines', nargs='+', default=sorted(ENGINES))
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 32, 256])
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    if 'tflite' in args.engines and not (args.model_dir / TFLITE_MODEL_NAME).exists():
+        keras_engine = load_engine(KerasEngine.name, args.model_dir)
+        export_tflite(keras_engine.model, args.model_dir / TFLITE_MODEL_NAME)
+
+    _, (x_test, y_test) = DataLoader().load_data()
+    images = preprocess_images(x_test)
+
+    engines = {name: load_engine(name, args.model_dir) for name in args.engines}
+
+    # Parity: every engine must match Keras argmax on the full test set
+    reference = np.argmax(load_engine(KerasEngine.name, args.model_dir).predict(images), axis=1)
+    print(f"\nKeras test accuracy: {np.mean(reference == y_test):.4f}")
+    parity_ok = True
+    for name, engine in engines.items():
+        predictions = np.argmax(engine.predict(images), axis=1)
+        mismatches = int(np.sum(predictions != reference))
+        parity_ok &= mismatches == 0
+        print(f"  {name:<12} argmax mismatches vs keras: {mismatches}")
+
+    print(f"\n{'engine':<12} {'batch':>6} {'p50 ms':>9} {'p99 ms':>9} {'img/s':>10}")
+    for name, engine in engines.items():
+        for batch_size in args.batch_sizes:
+            latencies = time_engine(engine, images, batch_size, args.repeats)
+            p50 = np.percentile(latencies, 50)
+            print(f"{name:<12} {batch_size:>6} {p50:>9.3f} {np.percentile(latencies, 99):>9.3f} "
+                  f"{batch_size / p50 * 1000.0:>10.0f}")
+
+    if not parity_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Examples/sec of the tf.data training pipeline under different settings.
+
+Iterates the training dataset without a model, so the numbers are the
+ceiling the input pipeline can feed. The first epoch includes filling
+the cache.
+
+    python benchmarks/input_pipeline_benchmark.py --batch-sizes 32 128 --epochs 3
+"""
+import argparse
+import itertools
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.data.data_preprocessor import DataPreprocessor
+from src.data.dataset_builder import DatasetBuilder
+
+
+def epoch_throughput(dataset, num_examples, epochs):
+    """Examples/sec for each full pass over the dataset"""
+    rates = []
+    for _ in range(epochs):
+        start = time.perf_counter()
+        for _ in dataset:
+            pass
+        rates.append(num_examples / (time.perf_counter() - start))
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tf.data input pipeline settings")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[32, 128])
+    parser.add_argument('--caches', nargs='+', default=['none', 'memory', 'disk'])
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--augment', action='store_true', help="Also benchmark with augmentation on")
+    parser.add_argument('--uint8', action='store_true', help="Feed raw uint8 images and normalize on the fly")
+    args = parser.parse_args()
+
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+        processed = DataPreprocessor().preprocess(x_train, y_train, x_test, y_test)
+    x, y = processed['x_train'], processed['y_train']
+    if args.uint8:
+        x = (x * 255).round().astype('uint8')
+
+    augment_options = [False, True] if args.augment else [False]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"\n{'batch':>6} {'cache':>7} {'augment':>8} {'determ.':>8}  examples/sec per epoch")
+        for batch_size, cache, augment, deterministic in itertools.product(
+                args.batch_sizes, args.caches, augment_options, [True, False]):
+            cache_setting = str(Path(tmp_dir) / f'{batch_size}_{augment}_{deterministic}') if cache == 'disk' else cache
+            builder = DatasetBuilder(
+                batch_size=batch_size, cache=cache_setting, augment=augment, deterministic=deterministic
+            )
+            rates = epoch_throughput(builder.build(x, y, training=True), len(x), args.epochs)
+            print(f"{batch_size:>6} {cache:>7} {str(augment):>8} {str(deterministic):>8}  "
+                  + "  ".join(f"{rate:>9.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""Replay-based load test and latency regression check for the serving API.
+
+Replays recorded requests (one JSON object per line) against the app
+in-process, a local uvicorn server started by the harness, or any running
+server, and reports throughput, p50/p95/p99 latency, CPU and RSS per
+scenario as JSON that can be diffed against a stored baseline.
+
+Each recorded line looks like
+    {"scenario": "single", "method": "POST", "path": "/predict", "json": {"image": [...]}}
+
+    python benchmarks/load_harness.py --output baseline.json
+    python benchmarks/load_harness.py --serve --rate 200 --output results.json --baseline baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from api_load_test import SyntheticEngine
+from src.utils.config import config
+
+SCENARIOS = ('single', 'batch', 'cached')
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+# Metrics where a larger value is a regression; all others regress when they drop
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms', 'cpu_s_per_request', 'peak_rss_mb', 'error_rate')
+
+
+def load_images(count, seed=0):
+    """Test images from the raw dataset, or random digits-shaped noise without it"""
+    raw_path = config.data_paths['raw'] / 'mnist_dataset.npz'
+    if raw_path.exists():
+        with np.load(raw_path) as data:
+            images = data['x_test']
+        return images[np.random.RandomState(seed).randint(0, len(images), count)].reshape(count, -1)
+    return np.random.RandomState(seed).randint(0, 256, size=(count, 784), dtype=np.uint8)
+
+
+def record(path, requests, batch_size):
+    """Write a recording with unique single images, batches and one repeated image"""
+    images = load_images(requests * (batch_size + 1) + 1)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        for image in images[:requests]:
+            f.write(json.dumps({'scenario': 'single', 'method': 'POST', 'path': '/predict',
+                                'json': {'image': image.tolist()}}) + '\n')
+        batches = images[requests:requests * (batch_size + 1)].reshape(requests, batch_size, -1)
+        for batch in batches:
+            f.write(json.dumps({'scenario': 'batch', 'method': 'POST', 'path': '/predict/batch',
+                                'json': {'images': batch.tolist()}}) + '\n')
+        repeated = {'image': images[-1].tolist()}
+        for _ in range(requests):
+            f.write(json.dumps({'scenario': 'cached', 'method': 'POST', 'path': '/predict',
+                                'json': repeated}) + '\n')
+    print(f"✓ Recorded {3 * requests} requests to {path}")
+
+
+def load_recording(path):
+    """Group recorded requests by scenario, pre-encoding bodies so replay does no JSON work"""
+    scenarios = {}
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            scenarios.setdefault(entry.get('scenario', entry['path']), []).append((
+                entry.get('method', 'POST'),
+                entry['path'],
+                json.dumps(entry['json']).encode() if 'json' in entry else None
+            ))
+    return scenarios
+
+
+class ProcessMonitor:
+    """CPU time and peak RSS of a process, read from /proc"""
+
+    def __init__(self, pid=None, interval_s=0.05):
+        self.pid = pid or os.getpid()
+        self.interval_s = interval_s
+        self.peak_rss = 0
+        self._task = None
+
+    def cpu_seconds(self):
+        with open(f'/proc/{self.pid}/stat') as f:
+            # Fields after the command name; utime and stime are the 12th and 13th
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+    def rss_bytes(self):
+        with open(f'/proc/{self.pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+
+    async def _sample(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, self.rss_bytes())
+            await asyncio.sleep(self.interval_s)
+
+    def start(self):
+        self.peak_rss = self.rss_bytes()
+        self._cpu_start = self.cpu_seconds()
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return self.cpu_seconds() - self._cpu_start, self.peak_rss
+
+
+async def replay(client, entries, requests, concurrency, rate, monitor):
+    """Replay entries in order (cycling if needed) and summarize the scenario
+
+    With a rate, requests are issued on a fixed open-loop schedule and latency
+    is measured from the scheduled send time, so queueing inside the server is
+    not hidden by a slow client. Without one, `concurrency` workers loop
+    back-to-back.
+    """
+    latencies, status_codes = [], {}
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {'content-type': 'application/json'}
+
+    async def send(i, scheduled):
+        method, path, body = entries[i % len(entries)]
+        async with semaphore:
+            response = await client.request(method, path, content=body, headers=headers)
+        latencies.append(time.perf_counter() - scheduled)
+        status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+    monitor.start()
+    start = time.perf_counter()
+    if rate:
+        tasks = []
+        for i in range(requests):
+            scheduled = start + i / rate
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(send(i, scheduled)))
+        await asyncio.gather(*tasks)
+    else:
+        counter = iter(range(requests))
+
+        async def worker():
+            for i in counter:
+                await send(i, time.perf_counter())
+                # In-process requests can complete without suspending; yield so
+                # server-side tasks such as the batcher are not starved
+                await asyncio.sleep(0)
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    cpu_s, peak_rss = await monitor.stop()
+
+    values = np.array(latencies) * 1000.0
+    errors = sum(count for status, count in status_codes.items() if status != 200)
+    return {
+        'requests': requests,
+        'throughput_rps': requests / elapsed,
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'error_rate': errors / requests,
+        'status_codes': {str(status): count for status, count in sorted(status_codes.items())},
+        'cpu_s_per_request': cpu_s / requests,
+        'cpu_utilization': cpu_s / elapsed,
+        'peak_rss_mb': peak_rss / 2 ** 20
+    }
+
+
+async def run_scenarios(client, scenarios, args, pid=None, before_scenario=None):
+    results = {}
+    for name, entries in scenarios.items():
+        if args.scenarios and name not in args.scenarios:
+            continue
+        # Warm up connections and the model outside the measured window
+        await replay(client, entries, min(args.concurrency, len(entries)), args.concurrency, None, ProcessMonitor(pid))
+        if before_scenario is not None:
+            await before_scenario(name)
+        results[name] = await replay(client, entries, args.requests, args.concurrency, args.rate, ProcessMonitor(pid))
+        print_scenario(name, results[name])
+    return results
+
+
+async def run_in_process(scenarios, args):
+    """Run against the app in this process; CPU and RSS include the client"""
+    from src.serving.api import main
+
+    load_model, create_watcher = main.load_model, main.create_watcher
+    if args.synthetic_latency_ms is not None:
+        main.load_model = lambda: main.activate_engine(SyntheticEngine(args.synthetic_latency_ms))
+        # The watcher would hot-reload the deployed model over the synthetic one mid-run
+        main.create_watcher = lambda: None
+
+    async def clear_cache(name):
+        # Each scenario starts cold so "single" and "batch" measure the model, not the cache
+        if main.cache is not None:
+            main.cache.backend.clear()
+
+    await main.startup_event()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test', timeout=60.0) as client:
+            return await run_scenarios(client, scenarios, args, before_scenario=clear_cache)
+    finally:
+        await main.shutdown_event()
+        main.load_model, main.create_watcher = load_model, create_watcher
+
+
+async def run_remote(scenarios, args, url, pid=None):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=60.0, limits=limits) as client:
+        return await run_scenarios(client, scenarios, args, pid=pid)
+
+
+def serve(port):
+    """Start uvicorn on the project app and wait until it reports /ready"""
+    project_root = Path(__file__).parent.parent
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'src.serving.api.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=project_root
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/ready', timeout=1.0).status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+def compare(results, baseline, tolerance):
+    """Percent change per metric against the baseline, flagging regressions beyond tolerance"""
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+    for scenario, metrics in results.items():
+        if scenario not in baseline:
+            continue
+        for metric in ('throughput_rps',) + LOWER_IS_BETTER:
+            old, new = baseline[scenario].get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            if worse and metric == 'error_rate' and new == 0:
+                worse = False
+            marker = "REGRESSION" if worse else ""
+            print(f"  {scenario:<8} {metric:<18} {old:12.3f} -> {new:12.3f} ({change:+7.1%}) {marker}")
+            if worse:
+                regressions.append(f"{scenario}.{metric}")
+    return regressions
+
+
+def print_scenario(name, stats):
+    print(f"  {name:<8} {stats['throughput_rps']:8.1f} req/s  p50={stats['p50_ms']:7.2f}ms  "
+          f"p95={stats['p95_ms']:7.2f}ms  p99={stats['p99_ms']:7.2f}ms  "
+          f"cpu={stats['cpu_s_per_request'] * 1000:.2f}ms/req  rss={stats['peak_rss_mb']:.0f}MB  "
+          f"errors={stats['error_rate']:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded requests against the MNIST serving API")
+    parser.add_argument('--recording', type=Path, default=config.DATA_DIR / 'benchmarks' / 'load_recording.jsonl',
+                        help="Recorded requests to replay; a synthetic one is written here if missing")
+    parser.add_argument('--record', type=Path, help="Write a synthetic recording to this path and exit")
+    parser.add_argument('--batch-size', type=int, default=32, help="Images per recorded batch request")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, help="Subset of scenarios to run")
+    parser.add_argument('--requests', type=int, default=500, help="Requests per scenario")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--rate', type=float, help="Open-loop request rate per second (default: closed loop)")
+    parser.add_argument('--url', help="Base URL of a running server")
+    parser.add_argument('--pid', type=int, help="PID of the --url server; without it CPU and RSS are the client's")
+    parser.add_argument('--serve', action='store_true', help="Start a local uvicorn server for the run")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--synthetic-latency-ms', type=float,
+                        help="In-process only: replace the model with a fixed-latency stand-in")
+    parser.add_argument('--output', type=Path, help="Write results JSON here")
+    parser.add_argument('--baseline', type=Path, help="Baseline results JSON to diff against")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record, args.requests, args.batch_size)
+        return
+
+    if not args.recording.exists():
+        record(args.recording, args.requests, args.batch_size)
+    scenarios = load_recording(args.recording)
+
+    if args.serve:
+        print(f"Replaying against uvicorn on port {args.port}:")
+        server = serve(args.port)
+        try:
+            results = asyncio.run(run_remote(scenarios, args, f'http://127.0.0.1:{args.port}', pid=server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+    elif args.url:
+        print(f"Replaying against {args.url}:")
+        results = asyncio.run(run_remote(scenarios, args, args.url, pid=args.pid))
+    else:
+        print("Replaying against the in-process app:")
+        results = asyncio.run(run_in_process(scenarios, args))
+
+    report = {'config': vars(args), 'results': results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+        print(f"✓ Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Peak memory and time of DataPreprocessor.preprocess vs preprocess_chunked.
+
+Peak memory is the tracemalloc peak of the preprocessing call alone (the
+raw arrays are loaded first). --scale tiles the dataset to simulate
+corpora larger than MNIST.
+
+    python benchmarks/preprocessing_benchmark.py --scale 4
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.data.data_preprocessor import DataPreprocessor
+
+
+def measure(fn):
+    """Return (seconds, peak MB allocated) for one call of fn"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chunked preprocessing")
+    parser.add_argument('--scale', type=int, default=1, help="Tile the dataset this many times")
+    parser.add_argument('--chunk-size', type=int, default=8192)
+    args = parser.parse_args()
+
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+    x_train, y_train = np.tile(x_train, (args.scale, 1, 1)), np.tile(y_train, args.scale)
+    x_test, y_test = np.tile(x_test, (args.scale, 1, 1)), np.tile(y_test, args.scale)
+    output_mb = (len(x_train) + len(x_test)) * 784 * 4 / (1024 * 1024)
+
+    runs = {
+        'eager float32': lambda: DataPreprocessor().preprocess(x_train, y_train, x_test, y_test),
+        'chunked float32': lambda: DataPreprocessor().preprocess_chunked(
+            x_train, y_train, x_test, y_test, chunk_size=args.chunk_size),
+        'chunked float16': lambda: DataPreprocessor().preprocess_chunked(
+            x_train, y_train, x_test, y_test, chunk_size=args.chunk_size, dtype='float16')
+    }
+
+    print(f"\n{len(x_train) + len(x_test)} images, float32 output {output_mb:.0f} MB")
+    print(f"{'mode':<16} {'time s':>8} {'peak MB':>9}")
+    for name, fn in runs.items():
+        elapsed, peak_mb = measure(fn)
+        print(f"{name:<16} {elapsed:>8.2f} {peak_mb:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
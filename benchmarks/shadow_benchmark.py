@@ -0,0 +1,87 @@
+"""Memory and CPU cost of serving a shadow model version next to the primary.
+
+Loads the primary and a candidate model, reporting the resident memory each
+adds, then replays MNIST test batches through the primary alone and with the
+candidate shadowing every batch. Process CPU time covers all threads, so the
+difference between the two runs is the CPU shadowing adds, including work
+TensorFlow does on its own thread pools.
+
+    python benchmarks/shadow_benchmark.py --candidate-dir models/next --batch-size 32
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.serving.model_watcher import DirectoryModelSource
+from src.serving.payload import preprocess_images
+from src.serving.versions import VersionRouter, load_version
+from src.utils.config import config
+
+
+def replay(primary, images, batch_size, router=None):
+    """Serve images in batches; returns (primary latencies in ms, process CPU seconds)"""
+    latencies = []
+    cpu_start = time.process_time()
+    for start in range(0, len(images) - batch_size + 1, batch_size):
+        batch = images[start:start + batch_size]
+        request_start = time.perf_counter()
+        probabilities = primary.predict(batch)
+        latencies.append((time.perf_counter() - request_start) * 1000.0)
+        if router is not None:
+            router.shadow(batch, probabilities)
+    if router is not None:
+        router.drain(timeout_s=300.0)
+    return np.array(latencies), time.process_time() - cpu_start
+
+
+def main():
+    serving_config = config.base.get('serving', {})
+    parser = argparse.ArgumentParser(description="Benchmark shadow serving overhead")
+    parser.add_argument('--model-dir', type=Path, default=config.model_paths['deployed'])
+    parser.add_argument('--candidate-dir', type=Path, default=None,
+                        help="Candidate model directory (default: a second copy of the primary)")
+    parser.add_argument('--engine', default=serving_config.get('engine', 'tf_function'))
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--images', type=int, default=5000)
+    parser.add_argument('--max-pending', type=int, default=64)
+    args = parser.parse_args()
+
+    _, (x_test, _) = DataLoader().load_data()
+    images = preprocess_images(x_test[:args.images])
+
+    primary = load_version('primary', DirectoryModelSource(args.model_dir, args.engine),
+                           mode='primary', warmup_batch_sizes=[args.batch_size])
+    candidate = load_version('candidate', DirectoryModelSource(args.candidate_dir or args.model_dir, args.engine),
+                             mode='shadow', warmup_batch_sizes=[args.batch_size])
+
+    baseline_ms, baseline_cpu = replay(primary.engine, images, args.batch_size)
+    router = VersionRouter([candidate], max_pending=args.max_pending)
+    shadow_ms, shadow_cpu = replay(primary.engine, images, args.batch_size, router)
+    stats = router.get_stats()['versions']['candidate']
+    router.shutdown()
+
+    served = len(baseline_ms) * args.batch_size
+    # The first version loaded also pays for initializing the TensorFlow runtime
+    print(f"\n{'version':<10} {'memory MB':>10}")
+    for version in (primary, candidate):
+        print(f"{version.name:<10} {version.memory_mb:>10.1f}")
+
+    print(f"\n{'run':<14} {'p50 ms':>8} {'p95 ms':>8} {'cpu ms/img':>11}")
+    for name, latencies, cpu in (('primary only', baseline_ms, baseline_cpu), ('with shadow', shadow_ms, shadow_cpu)):
+        print(f"{name:<14} {np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f} "
+              f"{cpu * 1000.0 / served:>11.3f}")
+
+    print(f"\nShadowing added {(shadow_cpu - baseline_cpu) / baseline_cpu:.0%} CPU; "
+          f"{stats['images_total']} images shadowed, {stats['dropped_total']} batches dropped, "
+          f"agreement {stats['agreement_rate']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
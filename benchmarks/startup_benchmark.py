@@ -0,0 +1,142 @@
+"""Cold-start cost of the serving API: import time breakdown and time to first prediction.
+
+The import breakdown comes from `python -X importtime` on the API module,
+summed per top-level package. Each startup run launches a fresh uvicorn
+process and records, from process launch, when the port answers /health,
+when /ready turns 200 and when the first /predict returns, along with the
+latency of that first and of a second prediction.
+
+    python benchmarks/startup_benchmark.py --engines tf_function tflite --runs 3
+    python benchmarks/startup_benchmark.py --background-load
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)$')
+
+# Starts the app with serving config overrides applied before the API module is imported
+SERVER_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+import uvicorn
+from src.utils.config import config
+serving_config = config.base.setdefault('serving', {{}})
+serving_config['engine'] = {engine!r}
+serving_config.setdefault('startup', {{}})['background_load'] = {background_load!r}
+uvicorn.run('src.serving.api.main:app', port={port}, log_level='warning')
+"""
+
+
+def import_breakdown(module='src.serving.api.main'):
+    """Import seconds per top-level package, slowest first"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    packages = defaultdict(float)
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        # Self times never overlap, so they add up to the total without double counting
+        if match:
+            packages[match.group(2).split('.')[0]] += int(match.group(1)) / 1e6
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def wait_for(url, deadline, process):
+    """Seconds until url returns 200, polling every 10 ms"""
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not return 200 in time")
+
+
+def measure_startup(engine, background_load, port, timeout_s=180):
+    """Timings of one cold start, in seconds from process launch"""
+    url = f'http://127.0.0.1:{port}'
+    image = {'image': np.random.default_rng(0).integers(0, 256, 784).tolist()}
+    script = SERVER_SCRIPT.format(root=str(PROJECT_ROOT), engine=engine, background_load=background_load, port=port)
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', script], cwd=PROJECT_ROOT)
+    try:
+        deadline = start + timeout_s
+        listening = wait_for(f'{url}/health', deadline, process)
+        ready = wait_for(f'{url}/ready', deadline, process)
+        startup = httpx.get(f'{url}/ready').json()['startup']
+
+        request_start = time.perf_counter()
+        httpx.post(f'{url}/predict', json=image, timeout=30.0).raise_for_status()
+        first_prediction = time.perf_counter()
+        httpx.post(f'{url}/predict', json={'image': image['image'][::-1]}, timeout=30.0).raise_for_status()
+        second_prediction_s = time.perf_counter() - first_prediction
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        'health_s': listening - start,
+        'ready_s': ready - start,
+        'first_prediction_s': first_prediction - start,
+        'first_request_ms': (first_prediction - request_start) * 1000.0,
+        'second_request_ms': second_prediction_s * 1000.0,
+        'import_s': startup['import_s'],
+        'model_load_s': startup['model_load_s'],
+        'warmup_s': startup['warmup_s']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serving cold start")
+    parser.add_argument('--engines', nargs='+', default=['tf_function', 'tflite'])
+    parser.add_argument('--background-load', action='store_true',
+                        help="Load the model after the port opens, as serving.startup.background_load does")
+    parser.add_argument('--runs', type=int, default=3, help="Cold starts per engine; the median is reported")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--output', type=Path, help="Write all results as JSON")
+    args = parser.parse_args()
+
+    print("Import time of src.serving.api.main by top-level package:")
+    imports = import_breakdown()
+    for package, seconds in list(imports.items())[:10]:
+        print(f"  {package:<20} {seconds * 1000:>8.1f}ms")
+    print(f"  {'total':<20} {sum(imports.values()) * 1000:>8.1f}ms")
+
+    results = {'imports_s': imports, 'startup': {}}
+    print(f"\n{'engine':>12} {'health s':>9} {'ready s':>8} {'1st pred s':>11} {'1st req ms':>11} "
+          f"{'2nd req ms':>11} {'import s':>9} {'load s':>7} {'warmup s':>9}")
+    for engine in args.engines:
+        runs = [measure_startup(engine, args.background_load, args.port) for _ in range(args.runs)]
+        median = {name: float(np.median([run[name] for run in runs])) for name in runs[0]}
+        results['startup'][engine] = {'median': median, 'runs': runs}
+        print(f"{engine:>12} {median['health_s']:>9.2f} {median['ready_s']:>8.2f} "
+              f"{median['first_prediction_s']:>11.2f} {median['first_request_ms']:>11.1f} "
+              f"{median['second_request_ms']:>11.1f} {median['import_s']:>9.2f} {median['model_load_s']:>7.2f} "
+              f"{median['warmup_s']:>9.2f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
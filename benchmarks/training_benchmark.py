@@ -0,0 +1,101 @@
+"""Training throughput under different batch sizes and TF thread settings.
+
+Each configuration runs in a fresh subprocess, because TensorFlow's thread
+pools can only be sized before the runtime starts. Every run trains the
+pipeline's CNN, as built by src/models/model_builder.py (two conv/pool
+blocks, dropout and a 128-unit dense layer), for a few epochs with
+ProfilingCallback and reports the last epoch, so tracing and compilation in
+the first epoch are excluded.
+
+    python benchmarks/training_benchmark.py --batch-sizes 32 128 256 --threads 0:0 4:2 1:1
+"""
+import argparse
+import itertools
+import json
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+RESULT_PREFIX = 'RESULT '
+
+
+def run_worker(args):
+    """Train once with the given settings and print the last epoch's stats as JSON"""
+    import tensorflow as tf
+    intra, inter = (int(n) for n in args.worker_threads.split(':'))
+    tf.config.threading.set_intra_op_parallelism_threads(intra)
+    tf.config.threading.set_inter_op_parallelism_threads(inter)
+
+    from src.data.data_loader import DataLoader
+    from src.data.data_preprocessor import DataPreprocessor
+    from src.data.dataset_builder import DatasetBuilder
+    from src.models.model_builder import ModelBuilder
+    from src.training.callbacks import ProfilingCallback
+
+    with redirect_stdout(StringIO()):
+        (x_train, y_train), (x_test, y_test) = DataLoader().load_data()
+        processed = DataPreprocessor().preprocess(x_train, y_train, x_test, y_test)
+        x, y = processed['x_train'][:args.examples], processed['y_train'][:args.examples]
+        dataset = DatasetBuilder(batch_size=args.worker_batch_size).build(x, y, training=True)
+
+        model_builder = ModelBuilder()
+        model = model_builder.create_cnn_model()
+        model_builder.compile_model()
+
+        profiler = ProfilingCallback(len(x), input_dataset=dataset)
+        model.fit(dataset, epochs=args.epochs, callbacks=[profiler], verbose=0)
+
+    print(RESULT_PREFIX + json.dumps(profiler.epoch_stats[-1]))
+
+
+def run_configuration(args, batch_size, threads):
+    command = [
+        sys.executable, __file__, '--worker-batch-size', str(batch_size), '--worker-threads', threads,
+        '--epochs', str(args.epochs), '--examples', str(args.examples)
+    ]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    for line in output.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"No result from worker for batch_size={batch_size}, threads={threads}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark training throughput")
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[32, 128, 256])
+    parser.add_argument('--threads', nargs='+', default=['0:0', '4:2', '1:1'],
+                        help="intra:inter op thread counts; 0 lets TensorFlow decide")
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--examples', type=int, default=20000, help="Training examples per epoch")
+    parser.add_argument('--output', type=Path, help="Write all results as JSON")
+    parser.add_argument('--worker-batch-size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-threads', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker_batch_size:
+        run_worker(args)
+        return
+
+    results = []
+    print(f"\n{'batch':>6} {'threads':>8} {'ex/sec':>9} {'epoch s':>8} {'step p50':>9} {'step p90':>9} "
+          f"{'input ms':>9} {'input-bound':>12} {'RSS MB':>7}")
+    for batch_size, threads in itertools.product(args.batch_sizes, args.threads):
+        stats = run_configuration(args, batch_size, threads)
+        results.append({'batch_size': batch_size, 'threads': threads, **stats})
+        print(f"{batch_size:>6} {threads:>8} {stats['examples_per_sec']:>9.0f} {stats['epoch_time_s']:>8.2f} "
+              f"{stats['step_time_ms_p50']:>8.2f}ms {stats['step_time_ms_p90']:>8.2f}ms "
+              f"{stats.get('input_time_per_step_ms', float('nan')):>8.2f}ms "
+              f"{stats.get('input_bound_ratio', float('nan')):>12.2f} {stats['peak_rss_mb']:>7.0f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.serving.batch_inference import BulkScorer
+
+
+def main():
+    """Offline scoring of a large image archive with the deployed model"""
+    parser = argparse.ArgumentParser(description="Score .npy/.npz arrays or PNG directories in bulk")
+    parser.add_argument('input', type=Path, help=".npy or .npz file of 28x28 images, or a directory of .png files")
+    parser.add_argument('output', type=Path, help="Directory for probabilities.npy, predictions.npy and the checkpoint")
+    parser.add_argument('--key', help="Array to score in an .npz; defaults to the first array of 28x28 images")
+    parser.add_argument('--batch-size', type=int)
+    parser.add_argument('--workers', type=int, help="Decoding processes")
+    parser.add_argument('--no-resume', action='store_true', help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+
+    print("🚀 Starting MNIST Batch Scoring...")
+    
+    scorer = BulkScorer(batch_size=args.batch_size, num_workers=args.workers)
+    summary = scorer.score(args.input, args.output, key=args.key, resume=not args.no_resume)
+    
+    print(f"\nBatch scoring completed!")
+    print(f"Predictions written to: {args.output}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
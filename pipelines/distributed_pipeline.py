@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.data.data_preprocessor import DataPreprocessor
+from src.data.processed_cache import ProcessedDataCache, load_processed_data
+from src.training.distributed import launch_local_workers
+from src.utils.config import config
+
+
+def run_worker(args):
+    """One worker of the cluster described by this process's TF_CONFIG"""
+    from src.models.model_builder import ModelBuilder
+    from src.training.trainer import ModelTrainer
+
+    def build_model():
+        model_builder = ModelBuilder()
+        model = model_builder.create_cnn_model()
+        model_builder.compile_model()
+        return model
+
+    processed = ProcessedDataCache.open(args.data_dir)
+    ModelTrainer().train_distributed(build_model, processed, epochs=args.epochs,
+                                     global_batch_size=args.global_batch_size)
+
+
+def main():
+    """Data-parallel training on local workers coordinated through TF_CONFIG"""
+    distributed_config = config.base.get('distributed', {})
+    parser = argparse.ArgumentParser(description="Train with MultiWorkerMirroredStrategy on local workers")
+    parser.add_argument('--workers', type=int, default=distributed_config.get('num_workers', 2))
+    parser.add_argument('--epochs', type=int, default=config.base['model']['epochs'])
+    parser.add_argument('--global-batch-size', type=int,
+                        help="Defaults to model.batch_size per worker")
+    parser.add_argument('--base-port', type=int, default=distributed_config.get('base_port', 23456))
+    parser.add_argument('--threads-per-worker', type=int, default=distributed_config.get('threads_per_worker'))
+    parser.add_argument('--data-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if 'TF_CONFIG' in os.environ:
+        run_worker(args)
+        return
+
+    print("🚀 Starting MNIST Distributed Training...")
+    
+    # Preprocess once here; every worker memory-maps the cached arrays and reads its own shard
+    processed, processed_cache = load_processed_data(DataLoader(), DataPreprocessor())
+    
+    print(f"\n Launching {args.workers} local workers...")
+    worker_argv = [__file__, '--epochs', str(args.epochs), '--data-dir', str(processed_cache.path)]
+    if args.global_batch_size:
+        worker_argv += ['--global-batch-size', str(args.global_batch_size)]
+    launch_local_workers(worker_argv, args.workers, args.base_port, args.threads_per_worker)
+    
+    print(f"\nDistributed training completed!")
+    print(f"Model saved to: {config.model_paths['trained'] / 'mnist_cnn_model.keras'}")
+
+
+if __name__ == "__main__":
+    main()
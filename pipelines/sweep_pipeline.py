@@ -0,0 +1,63 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Add current directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data.data_loader import DataLoader
+from src.data.data_preprocessor import DataPreprocessor
+from src.data.processed_cache import load_processed_data
+from src.mlflow_pipeline.tracking import MLflowTracker
+from src.training.sweep import STRATEGIES, SweepRunner
+from src.utils.config import config
+
+
+def main():
+    """Hyperparameter sweep over the training pipeline, one nested MLflow run per trial"""
+    parser = argparse.ArgumentParser(description="Run a hyperparameter sweep")
+    parser.add_argument('--strategy', choices=STRATEGIES)
+    parser.add_argument('--num-trials', type=int, help="Trials to sample for random/halving")
+    parser.add_argument('--max-workers', type=int, help="Concurrent trial processes")
+    parser.add_argument('--threads-per-trial', type=int, help="TensorFlow threads per trial process")
+    parser.add_argument('--max-epochs', type=int)
+    args = parser.parse_args()
+
+    print("🚀 Starting MNIST Hyperparameter Sweep...")
+    
+    # Workers memory-map the cached arrays instead of loading their own copies
+    processed, processed_cache = load_processed_data(DataLoader(), DataPreprocessor())
+    
+    runner = SweepRunner(
+        strategy=args.strategy,
+        num_trials=args.num_trials,
+        max_workers=args.max_workers,
+        threads_per_trial=args.threads_per_trial,
+        max_epochs=args.max_epochs
+    )
+    mlflow_tracker = MLflowTracker()
+    
+    with mlflow_tracker.start_run(run_name=f"sweep-{runner.strategy}") as parent_run:
+        mlflow_tracker.log_params({
+            'strategy': runner.strategy,
+            'num_trials': len(runner.trials()),
+            'max_workers': runner.max_workers,
+            'threads_per_trial': runner.threads_per_trial,
+            'rungs': runner.rungs()
+        })
+        results = runner.run(
+            processed_cache.path,
+            parent_run.info.run_id,
+            config.MODELS_DIR / 'sweeps' / parent_run.info.run_id
+        )
+        best = results[0]
+        mlflow_tracker.log_params({f"best_{name}": value for name, value in best['params'].items()})
+        mlflow_tracker.log_metrics({'best_val_accuracy': best['score']})
+    
+    print(f"\nSweep completed!")
+    print(f"Best trial {best['trial_id']}: val_accuracy={best['score']:.4f} {best['params']}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.data.data_loader import DataLoader
 from src.data.data_preprocessor import DataPreprocessor
+from src.data.processed_cache import load_processed_data
+from src.data.dataset_builder import DatasetBuilder
 from src.models.model_builder import ModelBuilder
 from src.training.trainer import ModelTrainer
+from src.training.acceleration import TrainingAccelerator
+from src.training.quantizer import ModelQuantizer
+from src.training.cascade import CascadeTrainer
+from src.training.callbacks import ProfilingCallback, ThroughputCallback
 from src.mlflow_pipeline.tracking import MLflowTracker
+from src.monitoring.data_drift import DataDriftMonitor
+from src.monitoring.drift_engine import REFERENCE_STATS_NAME
+from src.serving.engines import TFLITE_MODEL_NAME, export_tflite, load_engine
 from src.utils.config import config 
 import tensorflow as tf
 
@@ -23,59 +32,54 @@ def main():
     data_loader = DataLoader()
     preprocessor = DataPreprocessor()
     model_builder = ModelBuilder()
-    trainer = ModelTrainer()
     mlflow_tracker = MLflowTracker()
+    trainer = ModelTrainer(tracker=mlflow_tracker)
     
-    # Step 1: Load data
-    print("\n Step 1: Loading data...")
-    (x_train, y_train), (x_test, y_test) = data_loader.load_data()
+    # Steps 1-2: Load and preprocess data, reusing cached arrays when possible
+    processed, processed_cache = load_processed_data(data_loader, preprocessor)
     
-   
-
-    
-    # Step 2: Preprocess data
-    print("\n Step 2: Preprocessing data...")
-    x_train_clean, y_train_clean, x_test_clean, y_test_clean = preprocessor.clean_data(
-        x_train, y_train, x_test, y_test
-    )
-    
-    x_train_split, y_train_split, x_val, y_val = preprocessor.split_data(
-        x_train_clean, y_train_clean
-    )
-    
-    x_train_norm, x_val_norm, x_test_norm = preprocessor.normalize_data(
-        x_train_split, x_val, x_test_clean
-    )
-    
-    x_train_final, x_val_final, x_test_final = preprocessor.reshape_for_cnn(
-        x_train_norm, x_val_norm, x_test_norm
-    )
+    x_train_final, y_train_split = processed['x_train'], processed['y_train']
+    x_val_final, y_val = processed['x_val'], processed['y_val']
+    x_test_final, y_test_clean = processed['x_test'], processed['y_test']
     
     # Step 3: Create datasets
     print("\n Step 3: Creating datasets...")
-    train_dataset = tf.data.Dataset.from_tensor_slices((x_train_final, y_train_split))
-    val_dataset = tf.data.Dataset.from_tensor_slices((x_val_final, y_val))
-    test_dataset = tf.data.Dataset.from_tensor_slices((x_test_final, y_test_clean))
-    
-    # Apply batching and prefetching
-    BATCH_SIZE = 32
-    train_dataset = train_dataset.shuffle(1000).batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
-    val_dataset = val_dataset.batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
-    test_dataset = test_dataset.batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
+    dataset_builder = DatasetBuilder()
+    train_dataset, val_dataset, test_dataset = dataset_builder.build_all(processed, cache_key=processed_cache.key)
     
     # Step 4: Build and compile model
     print("\n Step 4: Building model...")
+    # XLA, mixed precision and steps_per_execution switches from config
+    accelerator = TrainingAccelerator()
+    accelerator.set_policy()
     model = model_builder.create_cnn_model()
     model_builder.compile_model()
+    accelerator.configure(model)
     model_builder.get_model_summary()
     
     # Step 5: Setup training
     print("\n⚡ Step 5: Setting up training...")
     trainer.setup_callbacks()
+    profiling_config = config.base.get('profiling', {})
+    if profiling_config.get('enabled', False):
+        # Per-step timings, input cost and peak memory, logged to the training run
+        throughput = ProfilingCallback(
+            len(x_train_final),
+            tracker=mlflow_tracker,
+            input_dataset=train_dataset,
+            input_probe_steps=profiling_config.get('input_probe_steps', 20),
+            profile_steps=profiling_config.get('profile_steps'),
+            profile_dir=profiling_config.get('profile_dir') or config.BASE_DIR / 'logs' / 'profile'
+        )
+    else:
+        throughput = ThroughputCallback(len(x_train_final), tracker=mlflow_tracker)
+    trainer.callbacks.append(throughput)
     
     # Step 6: Train model with MLflow tracking
     print("\n Step 6: Training model...")
-    history = trainer.train_model(model, train_dataset, val_dataset, epochs=2)
+    history = trainer.train_model(model, train_dataset, val_dataset, epochs=2, accelerator=accelerator)
+    # Save, export, quantize and train the cascade from a float32 model under the float32 policy
+    model = accelerator.float32_copy(model)
     
     # Step 7: Evaluate model
     print("\n Step 7: Evaluating model...")
@@ -105,6 +109,54 @@ def main():
     deployed_path = deployed_dir / 'mnist_cnn_model.keras'
     model.save(deployed_path)
     print(f"Model saved to deployed folder: {deployed_path}")
+    
+    # Export the TFLite artifact used by the lightweight serving engine
+    export_tflite(model, deployed_dir / TFLITE_MODEL_NAME)
+    
+    # Reference statistics the API's streaming drift monitor compares live traffic against
+    drift_monitor = DataDriftMonitor()
+    drift_monitor.set_reference_data(x_train_final, y_train_split)
+    drift_monitor.save_reference(deployed_dir / REFERENCE_STATS_NAME)
+    
+    # Step 9: Post-training quantization
+    if config.base.get('quantization', {}).get('enabled', False):
+        print("\n Step 9: Quantizing model...")
+        quantizer = ModelQuantizer(deployed_dir)
+        quantizer.quantize(model, x_val_final)
+        quantization_report = quantizer.evaluate(x_test_final, y_test_clean)
+        
+        with mlflow_tracker.start_run(run_name="quantization"):
+            for variant, metrics in quantization_report.items():
+                mlflow_tracker.log_metrics({f"{variant}_{name}": value for name, value in metrics.items()})
+            for quantized_path in quantizer.model_paths.values():
+                mlflow_tracker.log_artifact(str(quantized_path))
+    
+    # Step 10: Cheap first stage that answers confident images before the CNN
+    if config.base.get('cascade', {}).get('enabled', False):
+        print("\n Step 10: Training cascade first stage...")
+        serving_config = config.base.get('serving', {})
+        full_engine = load_engine(
+            serving_config.get('engine', 'tf_function'),
+            deployed_dir,
+            num_threads=serving_config.get('num_threads'),
+            quantization=serving_config.get('quantization')
+        )
+        cascade_trainer = CascadeTrainer(deployed_dir)
+        cascade_trainer.train(processed)
+        cascade_trainer.calibrate(full_engine, x_val_final, y_val)
+        cascade_report = cascade_trainer.evaluate(full_engine, x_test_final, y_test_clean)
+        cascade_paths = cascade_trainer.save(cascade_report)
+        
+        with mlflow_tracker.start_run(run_name="cascade"):
+            mlflow_tracker.log_params({
+                'cascade_threshold': cascade_trainer.threshold,
+                'cascade_hidden_units': cascade_trainer.hidden_units
+            })
+            for row in cascade_report:
+                label = 'full' if row['threshold'] is None else f"threshold_{row['threshold']:g}"
+                mlflow_tracker.log_metrics({f"{label}_{name}": value for name, value in row.items() if name != 'threshold'})
+            for cascade_path in cascade_paths:
+                mlflow_tracker.log_artifact(str(cascade_path))
 
     print(f"\nTraining pipeline completed!")
     print(f"Final Test Accuracy: {test_accuracy:.4f}")
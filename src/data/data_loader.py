@@ -26,6 +26,22 @@ class DataLoader:
         self._print_data_shapes()
         return (self.x_train, self.y_train), (self.x_test, self.y_test)
     
+    def load_prediction_log(self, log_dir=None, min_confidence=0.0, since=None) -> tuple:
+        """Load served images with their predicted labels from the API's prediction log
+
+        Predictions are model outputs, not ground truth: filter on
+        min_confidence before using them as pseudo-labels for retraining.
+        """
+        from ..serving.prediction_log import read_prediction_log
+        log_config = config.base.get('serving', {}).get('prediction_log', {})
+        log_dir = log_dir or log_config.get('log_dir') or config.DATA_DIR / 'prediction_log'
+        records = read_prediction_log(log_dir, since=since)
+        records = records[records['confidence'] >= min_confidence]
+        x = np.ascontiguousarray(records['pixels']).reshape(-1, 28, 28)
+        y = records['prediction'].astype(np.int64)
+        print(f"✓ Loaded {len(x)} logged predictions from {log_dir}")
+        return x, y
+    
     def _load_from_local(self):
         """Load dataset from local raw data"""
         with np.load(self.raw_data_path) as data:
@@ -66,4 +66,82 @@ class DataPreprocessor:
         print(f"Training shape after reshaping: {x_train_reshaped.shape}")
         print(f"Validation shape after reshaping: {x_val_reshaped.shape}")
         print(f"Test shape after reshaping: {x_test_reshaped.shape}")
-        return x_train_reshaped, x_val_reshaped, x_test_reshaped
\ No newline at end of file
+        return x_train_reshaped, x_val_reshaped, x_test_reshaped
+    
+    def preprocess(self, x_train, y_train, x_test, y_test, test_size=0.2, random_state=42) -> dict:
+        """Run cleaning, splitting, normalization and reshaping end to end"""
+        x_train_clean, y_train_clean, x_test_clean, y_test_clean = self.clean_data(
+            x_train, y_train, x_test, y_test
+        )
+        x_train_split, y_train_split, x_val, y_val = self.split_data(
+            x_train_clean, y_train_clean, test_size=test_size, random_state=random_state
+        )
+        x_train_norm, x_val_norm, x_test_norm = self.normalize_data(x_train_split, x_val, x_test_clean)
+        x_train_final, x_val_final, x_test_final = self.reshape_for_cnn(x_train_norm, x_val_norm, x_test_norm)
+        
+        return {
+            'x_train': x_train_final, 'y_train': y_train_split,
+            'x_val': x_val_final, 'y_val': y_val,
+            'x_test': x_test_final, 'y_test': y_test_clean
+        }
+    
+    def preprocess_chunked(self, x_train, y_train, x_test, y_test, test_size=0.2, random_state=42,
+                           chunk_size=8192, dtype='float32') -> dict:
+        """Preprocess in fixed-size chunks straight into preallocated output buffers
+        
+        Produces the same splits as preprocess() while holding only one
+        chunk of intermediate data at a time, so x_train/x_test can be
+        memory-mapped arrays much larger than RAM.
+        """
+        valid_train = self._non_blank_mask(x_train, chunk_size)
+        valid_test = self._non_blank_mask(x_test, chunk_size)
+        
+        # Split positions rather than pixels; same permutation as splitting the cleaned arrays
+        clean_train_idx = np.flatnonzero(valid_train)
+        y_train_clean = y_train[clean_train_idx]
+        train_pos, val_pos = train_test_split(
+            np.arange(len(clean_train_idx)),
+            test_size=test_size,
+            random_state=random_state,
+            stratify=y_train_clean
+        )
+        train_idx = clean_train_idx[train_pos]
+        val_idx = clean_train_idx[val_pos]
+        test_idx = np.flatnonzero(valid_test)
+        
+        self.x_train = self._normalize_chunked(x_train, train_idx, chunk_size, dtype)
+        self.x_val = self._normalize_chunked(x_train, val_idx, chunk_size, dtype)
+        self.x_test = self._normalize_chunked(x_test, test_idx, chunk_size, dtype)
+        self.y_train = y_train_clean[train_pos]
+        self.y_val = y_train_clean[val_pos]
+        self.y_test = y_test[test_idx]
+        
+        print(f"After cleaning - Training: {len(clean_train_idx)}, Test: {len(test_idx)}")
+        print(f"Training set: {self.x_train.shape}")
+        print(f"Validation set: {self.x_val.shape}")
+        print(f"Test set: {self.x_test.shape}")
+        return {
+            'x_train': self.x_train, 'y_train': self.y_train,
+            'x_val': self.x_val, 'y_val': self.y_val,
+            'x_test': self.x_test, 'y_test': self.y_test
+        }
+    
+    def _non_blank_mask(self, x, chunk_size):
+        """Boolean mask of images with at least one non-zero pixel, built chunk by chunk"""
+        mask = np.empty(len(x), dtype=bool)
+        for start in range(0, len(x), chunk_size):
+            chunk = x[start:start + chunk_size]
+            mask[start:start + len(chunk)] = chunk.reshape(len(chunk), -1).any(axis=1)
+        return mask
+    
+    def _normalize_chunked(self, x, indices, chunk_size, dtype):
+        """Gather, scale to [0, 1] and reshape the selected images into one output buffer"""
+        out = np.empty((len(indices), 28, 28, 1), dtype=dtype)
+        scale = np.float32(255.0)
+        for start in range(0, len(indices), chunk_size):
+            chunk = x[indices[start:start + chunk_size]]
+            np.divide(
+                chunk.reshape(len(chunk), 28, 28, 1), scale,
+                out=out[start:start + len(chunk)], dtype=np.float32, casting='same_kind'
+            )
+        return out
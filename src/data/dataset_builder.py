@@ -0,0 +1,101 @@
+import hashlib
+import tensorflow as tf
+import numpy as np
+from pathlib import Path
+from ..utils.config import config
+
+
+def array_fingerprint(*arrays):
+    """Short content hash of arrays, used to key on-disk dataset caches"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()[:16]
+
+
+class DatasetBuilder:
+    """Builds train/val/test tf.data pipelines from config"""
+
+    def __init__(self, batch_size=None, shuffle_buffer=None, cache=None, augment=None,
+                 deterministic=None, seed=None):
+        dataset_config = config.base.get('dataset', {})
+        self.batch_size = batch_size or config.base['model']['batch_size']
+        self.shuffle_buffer = shuffle_buffer or dataset_config.get('shuffle_buffer', 10000)
+        self.cache = cache if cache is not None else dataset_config.get('cache', 'memory')
+        self.augment = augment if augment is not None else dataset_config.get('augment', False)
+        self.deterministic = deterministic if deterministic is not None else dataset_config.get('deterministic', True)
+        self.seed = seed if seed is not None else config.base['data']['random_state']
+
+    def build(self, x, y, training=False, name='train', num_shards=1, shard_index=0, cache_key=None):
+        """Build one pipeline: shard -> normalize -> cache -> shuffle -> augment -> batch -> prefetch
+
+        cache_key identifies the data in disk cache file names, e.g. the
+        ProcessedDataCache key; without it the arrays are hashed.
+        """
+        dataset = tf.data.Dataset.from_tensor_slices((x, y))
+        if num_shards > 1:
+            # Each distributed worker reads a disjoint slice of the examples
+            dataset = dataset.shard(num_shards, shard_index)
+            name = f'{name}_shard{shard_index}of{num_shards}'
+
+        # uint8 inputs are scaled on the fly; already-normalized floats pass through
+        if np.asarray(x[:1]).dtype == np.uint8:
+            dataset = dataset.map(
+                self._normalize,
+                num_parallel_calls=tf.data.AUTOTUNE,
+                deterministic=self.deterministic
+            )
+
+        dataset = self._apply_cache(dataset, name, lambda: cache_key or array_fingerprint(x, y))
+
+        if training:
+            dataset = dataset.shuffle(self.shuffle_buffer, seed=self.seed, reshuffle_each_iteration=True)
+            if self.augment:
+                dataset = dataset.map(
+                    self._augment,
+                    num_parallel_calls=tf.data.AUTOTUNE,
+                    deterministic=self.deterministic
+                )
+
+        dataset = dataset.batch(self.batch_size, num_parallel_calls=tf.data.AUTOTUNE, deterministic=self.deterministic)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+    def build_all(self, processed: dict, cache_key=None):
+        """Build train, validation and test pipelines from preprocessed arrays"""
+        train_dataset = self.build(processed['x_train'], processed['y_train'], training=True, name='train',
+                                   cache_key=cache_key)
+        val_dataset = self.build(processed['x_val'], processed['y_val'], name='val', cache_key=cache_key)
+        test_dataset = self.build(processed['x_test'], processed['y_test'], name='test', cache_key=cache_key)
+
+        print(f"✓ Datasets built (batch_size={self.batch_size}, cache={self.cache}, "
+              f"augment={self.augment}, deterministic={self.deterministic})")
+        return train_dataset, val_dataset, test_dataset
+
+    def _apply_cache(self, dataset, name, cache_key_fn):
+        """Cache to memory, to files under a directory, or not at all"""
+        if not self.cache or self.cache == 'none':
+            return dataset
+        if self.cache == 'memory':
+            return dataset.cache()
+
+        cache_dir = Path(self.cache)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # tf.data reuses existing cache files as they are, so the file name must change with the data
+        prefix = f'{name}-{cache_key_fn()}'
+        for stale in cache_dir.glob(f'{name}-*'):
+            if not stale.name.startswith(prefix):
+                stale.unlink()
+        return dataset.cache(str(cache_dir / prefix))
+
+    @staticmethod
+    def _normalize(image, label):
+        image = tf.cast(image, tf.float32) / 255.0
+        return tf.reshape(image, (28, 28, 1)), label
+
+    def _augment(self, image, label):
+        """Random shift of up to 2 pixels in each direction"""
+        image = tf.image.pad_to_bounding_box(image, 2, 2, 32, 32)
+        image = tf.image.random_crop(image, (28, 28, 1), seed=self.seed)
+        return image, label
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import shutil
+import numpy as np
+from pathlib import Path
+from ..utils.config import config
+
+# Bump when the cleaning/splitting/normalization logic changes so old caches are not reused
+PREPROCESSING_VERSION = 1
+
+ARRAY_NAMES = ('x_train', 'y_train', 'x_val', 'y_val', 'x_test', 'y_test')
+
+
+class ProcessedDataCache:
+    """Cache of cleaned, split and normalized arrays as memory-mappable .npy files"""
+
+    def __init__(self, raw_data_path, params=None, cache_dir=None):
+        self.raw_data_path = Path(raw_data_path)
+        self.params = dict(params or {})
+        self.cache_dir = Path(cache_dir or config.data_paths['processed'])
+        self._key = None
+
+    @property
+    def key(self) -> str:
+        """Hash of the raw file contents and the preprocessing parameters"""
+        if self._key is None:
+            digest = hashlib.sha256()
+            with open(self.raw_data_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            digest.update(json.dumps(
+                {**self.params, 'preprocessing_version': PREPROCESSING_VERSION}, sort_keys=True
+            ).encode())
+            self._key = digest.hexdigest()[:16]
+        return self._key
+
+    @property
+    def path(self) -> Path:
+        return self.cache_dir / self.key
+
+    def exists(self) -> bool:
+        return (self.path / 'meta.json').exists()
+
+    def load(self):
+        """Memory-map the cached arrays, or return None on a cache miss"""
+        if not self.raw_data_path.exists() or not self.exists():
+            return None
+        arrays = self.open(self.path)
+        print(f"✓ Loaded processed data from cache: {self.path}")
+        return arrays
+
+    @staticmethod
+    def open(path):
+        """Memory-map the arrays of an existing cache directory, e.g. in a worker process"""
+        return {name: np.load(Path(path) / f'{name}.npy', mmap_mode='r') for name in ARRAY_NAMES}
+
+    def save(self, arrays: dict):
+        """Write the arrays once, then return them memory-mapped from disk"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write into a temporary directory and rename so readers never see a partial cache
+        staging = self.cache_dir / f'.{self.key}.tmp'
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir()
+
+        for name in ARRAY_NAMES:
+            np.save(staging / f'{name}.npy', np.ascontiguousarray(arrays[name]))
+        meta = {
+            'raw_data_path': str(self.raw_data_path),
+            'params': self.params,
+            'preprocessing_version': PREPROCESSING_VERSION,
+            'shapes': {name: list(arrays[name].shape) for name in ARRAY_NAMES}
+        }
+        (staging / 'meta.json').write_text(json.dumps(meta, indent=2))
+
+        if self.path.exists():
+            shutil.rmtree(self.path)
+        staging.rename(self.path)
+        print(f"✓ Processed data cached to: {self.path}")
+        return self.load()
+
+
+def load_processed_data(data_loader, preprocessor):
+    """Load preprocessed arrays from the cache, preprocessing and caching them on a miss"""
+    # Step 1: Load data, reusing preprocessed arrays when the raw data and params are unchanged
+    print("\n Step 1: Loading data...")
+    validation_size = config.base['data']['validation_size']
+    random_state = config.base['data']['random_state']
+    preprocessing_config = config.base['data'].get('preprocessing', {})
+    mode = preprocessing_config.get('mode')
+    dtype = preprocessing_config.get('dtype', 'float32')
+    if mode != 'chunked' and np.dtype(dtype) != np.float32:
+        # The in-memory path always normalizes to float32; a dtype it ignores must not reach the cache key
+        raise ValueError(f"data.preprocessing.dtype '{dtype}' requires mode 'chunked' (got {mode!r})")
+    processed_cache = ProcessedDataCache(
+        data_loader.raw_data_path,
+        params={
+            'validation_size': validation_size,
+            'random_state': random_state,
+            'mode': mode,
+            'dtype': dtype
+        }
+    )
+    processed = processed_cache.load()
+    
+    if processed is None:
+        (x_train, y_train), (x_test, y_test) = data_loader.load_data()
+        
+        # Step 2: Preprocess data
+        print("\n Step 2: Preprocessing data...")
+        if preprocessing_config.get('mode') == 'chunked':
+            processed = preprocessor.preprocess_chunked(
+                x_train, y_train, x_test, y_test,
+                test_size=validation_size,
+                random_state=random_state,
+                chunk_size=preprocessing_config.get('chunk_size', 8192),
+                dtype=dtype
+            )
+        else:
+            processed = preprocessor.preprocess(
+                x_train, y_train, x_test, y_test,
+                test_size=validation_size,
+                random_state=random_state
+            )
+        processed = processed_cache.save(processed)
+    else:
+        print("\n Step 2: Preprocessing skipped (cached)")
+    return processed, processed_cache
@@ -21,4 +21,16 @@ class ModelRegistry:
             version=version,
             stage=stage
         )
-        print(f"✅ Model {model_name} v{version} moved to {stage}")
\ No newline at end of file
+        print(f"✅ Model {model_name} v{version} moved to {stage}")
+    
+    def get_latest_version(self, model_name="mnist-cnn", stage="Production"):
+        """Get the latest model version in a stage, or None if the stage is empty"""
+        versions = self.client.get_latest_versions(model_name, stages=[stage])
+        if not versions:
+            return None
+        return max(versions, key=lambda v: int(v.version))
+    
+    def load_model_version(self, model_name, version):
+        """Load a registered Keras model version"""
+        import mlflow.keras
+        return mlflow.keras.load_model(f"models:/{model_name}/{version}")
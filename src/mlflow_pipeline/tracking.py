@@ -1,9 +1,19 @@
+import threading
+import time
+from contextlib import contextmanager
 import mlflow
 import mlflow.keras
+from mlflow import MlflowClient
+from mlflow.entities import Metric, Param, RunTag
 from pathlib import Path
 import tensorflow as tf
 from ..utils.config import config
 
+# MlflowClient.log_batch limits per request
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
 class MLflowTracker:
     """MLflow tracking class for experiment management"""
     
@@ -11,6 +21,12 @@ class MLflowTracker:
         self.experiment_name = config.base['mlflow']['experiment_name']
         self.tracking_uri = config.base['mlflow']['tracking_uri']
         self.setup_mlflow()
+        self.client = MlflowClient(self.tracking_uri)
+        # Params, metrics and tags waiting to be written, per run id
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_thread = None
+        self._stop_flushing = threading.Event()
     
     def setup_mlflow(self):
         """Setup MLflow tracking"""
@@ -19,22 +35,99 @@ class MLflowTracker:
         print(f"✓ MLflow tracking setup: {self.tracking_uri}")
         print(f"✓ Experiment: {self.experiment_name}")
     
+    @contextmanager
     def start_run(self, run_name=None):
-        """Start a new MLflow run"""
-        return mlflow.start_run(run_name=run_name)
+        """Start a new MLflow run, flushing buffered logs before it ends"""
+        with mlflow.start_run(run_name=run_name) as run:
+            try:
+                yield run
+            finally:
+                self.flush()
+    
+    def _buffer(self, run_id):
+        if run_id is None:
+            # Like mlflow.log_metrics, start a run when none is active
+            run = mlflow.active_run() or mlflow.start_run()
+            run_id = run.info.run_id
+        return self._pending.setdefault(run_id, {'metrics': [], 'params': [], 'tags': []})
     
-    def log_params(self, params: dict):
-        """Log parameters to MLflow"""
-        for key, value in params.items():
-            mlflow.log_param(key, value)
+    def log_params(self, params: dict, run_id=None):
+        """Buffer parameters for the active (or given) run"""
+        with self._lock:
+            self._buffer(run_id)['params'].extend(Param(key, str(value)) for key, value in params.items())
         print(f"✓ Logged {len(params)} parameters")
     
-    def log_metrics(self, metrics: dict, step=None):
-        """Log metrics to MLflow"""
-        for key, value in metrics.items():
-            mlflow.log_metric(key, value, step=step)
+    def log_metrics(self, metrics: dict, step=None, run_id=None):
+        """Buffer metrics for the active (or given) run"""
+        timestamp = int(time.time() * 1000)
+        with self._lock:
+            buffer = self._buffer(run_id)['metrics']
+            buffer.extend(Metric(key, float(value), timestamp, step or 0) for key, value in metrics.items())
+            full = len(buffer) >= MAX_METRICS_PER_BATCH
+        if full:
+            self.flush()
         print(f"✓ Logged {len(metrics)} metrics")
     
+    def set_tags(self, tags: dict, run_id=None):
+        """Buffer tags for the active (or given) run"""
+        with self._lock:
+            self._buffer(run_id)['tags'].extend(RunTag(key, str(value)) for key, value in tags.items())
+    
+    def flush(self):
+        """Write everything buffered with one log_batch call per run and size limit"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            for run_id in list(pending):
+                entries = pending[run_id]
+                while any(entries.values()):
+                    self.client.log_batch(
+                        run_id,
+                        metrics=entries['metrics'][:MAX_METRICS_PER_BATCH],
+                        params=entries['params'][:MAX_PARAMS_PER_BATCH],
+                        tags=entries['tags'][:MAX_TAGS_PER_BATCH]
+                    )
+                    # Only entries that reached the store are dropped
+                    del entries['metrics'][:MAX_METRICS_PER_BATCH]
+                    del entries['params'][:MAX_PARAMS_PER_BATCH]
+                    del entries['tags'][:MAX_TAGS_PER_BATCH]
+                del pending[run_id]
+        finally:
+            self._requeue(pending)
+    
+    def _requeue(self, pending):
+        """Put entries that were not written back in front of anything buffered since"""
+        if not pending:
+            return
+        with self._lock:
+            for run_id, entries in pending.items():
+                newer = self._pending.get(run_id, {})
+                self._pending[run_id] = {kind: values + newer.get(kind, []) for kind, values in entries.items()}
+    
+    def start_background_flush(self, interval_s=5.0):
+        """Flush buffered logs from a background thread every interval_s"""
+        if self._flush_thread is not None:
+            return
+        self._stop_flushing.clear()
+        
+        def run():
+            while not self._stop_flushing.wait(interval_s):
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"❌ MLflow background flush failed: {e}")
+        
+        self._flush_thread = threading.Thread(target=run, name="mlflow-flush", daemon=True)
+        self._flush_thread.start()
+    
+    def stop_background_flush(self):
+        """Stop the background thread and write whatever is still buffered"""
+        if self._flush_thread is not None:
+            self._stop_flushing.set()
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+    
     def log_model(self, model, model_name="mnist_cnn"):
         """Log model to MLflow"""
         mlflow.keras.log_model(model, model_name)
@@ -0,0 +1,48 @@
+import tensorflow as tf
+from ..utils.config import config
+
+
+class ModelBuilder:
+    """Builds and compiles the MNIST CNN from the data and model config"""
+
+    def __init__(self):
+        self.model = None
+
+    def create_cnn_model(self):
+        """Two conv/pool blocks followed by a dropout-regularized dense classifier"""
+        data_config = config.base.get('data', {})
+        input_shape = tuple(data_config.get('input_shape', [28, 28, 1]))
+        num_classes = data_config.get('num_classes', 10)
+
+        self.model = tf.keras.Sequential([
+            tf.keras.Input(shape=input_shape),
+            tf.keras.layers.Conv2D(32, (3, 3), activation='relu'),
+            tf.keras.layers.MaxPooling2D((2, 2)),
+            tf.keras.layers.Conv2D(64, (3, 3), activation='relu'),
+            tf.keras.layers.MaxPooling2D((2, 2)),
+            tf.keras.layers.Flatten(),
+            tf.keras.layers.Dropout(0.3),
+            tf.keras.layers.Dense(128, activation='relu'),
+            # Probabilities stay float32 under a mixed precision policy
+            tf.keras.layers.Dense(num_classes, activation='softmax', dtype='float32')
+        ])
+        print("✓ CNN model created")
+        return self.model
+
+    def compile_model(self, learning_rate=None):
+        """Compile with Adam on integer labels; the learning rate defaults to model.learning_rate"""
+        if self.model is None:
+            raise ValueError("Create the model before compiling it")
+        learning_rate = learning_rate or config.base.get('model', {}).get('learning_rate', 0.001)
+        self.model.compile(
+            optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        print(f"✓ Model compiled (learning_rate={learning_rate})")
+        return self.model
+
+    def get_model_summary(self):
+        if self.model is None:
+            raise ValueError("Create the model before summarizing it")
+        self.model.summary()
@@ -1,34 +1,76 @@
 import numpy as np
 import pandas as pd
-from evidently.report import Report
-from evidently.metrics import DataDriftPreset
+from .drift_engine import DriftEngine, ReferenceStatistics
+from ..utils.config import config
 
 class DataDriftMonitor:
     def __init__(self):
         self.reference_data = None
-    
-    def set_reference_data(self, x_data, y_data):
+        self.reference_x = None
+        self.reference_y = None
+        self.reference_stats = None
+        drift_config = config.base.get('monitoring', {}).get('drift', {})
+        self.engine = drift_config.get('engine', 'numpy')
+        self.n_bins = drift_config.get('n_bins', 20)
+        self.psi_threshold = drift_config.get('psi_threshold', 0.2)
+        self.ks_threshold = drift_config.get('ks_threshold', 0.1)
+        self.drift_share = drift_config.get('drift_share', 0.5)
+
+    def set_reference_data(self, x_data, y_data, embeddings=None):
         """Set reference dataset for drift comparison"""
-        x_flat = x_data.reshape(x_data.shape[0], -1)
-        feature_cols = [f'pixel_{i}' for i in range(x_flat.shape[1])]
-        
-        self.reference_data = pd.DataFrame(x_flat, columns=feature_cols)
-        self.reference_data['target'] = y_data
-        print(f"✓ Reference data set: {self.reference_data.shape}")
-    
-    def check_drift(self, current_x, current_y):
-        """Check data drift against reference data"""
-        current_flat = current_x.reshape(current_x.shape[0], -1)
-        feature_cols = [f'pixel_{i}' for i in range(current_flat.shape[1])]
-        
-        current_data = pd.DataFrame(current_flat, columns=feature_cols)
-        current_data['target'] = current_y
-        
+        self.reference_x = x_data
+        self.reference_y = y_data
+        # The DataFrame for the Evidently path is only built if that path is used
+        self.reference_data = None
+        self.reference_stats = ReferenceStatistics(n_bins=self.n_bins).fit(x_data, y_data, embeddings)
+        print(f"✓ Reference data set: {x_data.shape[0]} samples")
+
+    def save_reference(self, path):
+        """Persist the reference statistics for the streaming monitor"""
+        path = self.reference_stats.save(path)
+        print(f"✓ Reference statistics saved to: {path}")
+        return path
+
+    def check_drift(self, current_x, current_y, engine=None, embeddings=None):
+        """Check data drift against reference data
+
+        The default 'numpy' engine returns a dict of vectorized PSI/KS/Wasserstein
+        scores; engine='evidently' builds the full Evidently DataDriftPreset report.
+        """
+        if (engine or self.engine) == 'evidently':
+            return self._evidently_report(current_x, current_y)
+
+        drift_engine = DriftEngine(
+            self.reference_stats,
+            psi_threshold=self.psi_threshold,
+            ks_threshold=self.ks_threshold,
+            drift_share=self.drift_share
+        )
+        return drift_engine.score(current_x, current_y, embeddings=embeddings)
+
+    def _evidently_report(self, current_x, current_y):
+        """Slow path: per-column Evidently drift report over flattened DataFrames"""
+        from evidently.report import Report
+        from evidently.metrics import DataDriftPreset
+
+        if self.reference_data is None:
+            self.reference_data = self._to_dataframe(self.reference_x, self.reference_y)
+        current_data = self._to_dataframe(current_x, current_y)
+
         # Generate drift report
         drift_report = Report(metrics=[DataDriftPreset()])
         drift_report.run(
             reference_data=self.reference_data,
             current_data=current_data
         )
-        
-        return drift_report
\ No newline at end of file
+
+        return drift_report
+
+    def _to_dataframe(self, x_data, y_data):
+        """Flatten images into a pixel-per-column DataFrame"""
+        x_flat = x_data.reshape(x_data.shape[0], -1)
+        feature_cols = [f'pixel_{i}' for i in range(x_flat.shape[1])]
+
+        df = pd.DataFrame(x_flat, columns=feature_cols)
+        df['target'] = y_data
+        return df
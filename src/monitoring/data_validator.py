@@ -1,36 +1,129 @@
+import hashlib
+import json
 import numpy as np
-import pandas as pd
-from evidently.report import Report
-from evidently.metrics import DatasetSummaryMetric, DataQualityMetrics
+from pathlib import Path
+from ..utils.config import config
 
 class DataValidator:
-    """Data validation using Evidently AI"""
-    
-    def validate_mnist_data(self, x_data, y_data):
-        """Validate MNIST dataset quality"""
-        # Convert to DataFrame
+    """Data validation with single-pass NumPy checks and an optional Evidently report"""
+
+    def __init__(self, chunk_size=None, cache_dir=None, use_cache=None):
+        validation_config = config.base.get('validation', {})
+        self.chunk_size = chunk_size or validation_config.get('chunk_size', 8192)
+        self.cache_dir = Path(cache_dir or validation_config.get('cache_dir') or config.DATA_DIR / 'validation')
+        self.use_cache = use_cache if use_cache is not None else validation_config.get('cache', True)
+
+    def validate_mnist_data(self, x_data, y_data, report=False):
+        """Validate MNIST dataset quality
+
+        Returns (passed, report); the Evidently report is only built when report=True.
+        """
+        results = self.validate(x_data, y_data)
+
+        print("Data Quality Checks:")
+        for check, result in results['checks'].items():
+            status = "✅" if result else "❌"
+            print(f"{status} {check}: {result}")
+        print(f"Duplicates: {results['duplicate_count']}, class counts: {results['class_counts']}")
+
+        quality_report = self.build_report(x_data, y_data) if report else None
+        return all(results['checks'].values()), quality_report
+
+    def validate(self, x_data, y_data):
+        """Run every check in one chunked pass, reusing cached results for a known dataset"""
+        dataset_hash = self.dataset_hash(x_data, y_data)
+        cache_path = self.cache_dir / f'{dataset_hash}.json'
+        if self.use_cache and cache_path.exists():
+            return json.loads(cache_path.read_text())
+
+        results = self._compute(x_data, y_data)
+        results['dataset_hash'] = dataset_hash
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(results, indent=2))
+        return results
+
+    def dataset_hash(self, x_data, y_data):
+        """Content hash of images, labels, shapes and dtypes"""
+        digest = hashlib.blake2b(digest_size=16)
+        for array in (x_data, y_data):
+            digest.update(f'{array.shape}{array.dtype}'.encode())
+            for start in range(0, len(array), self.chunk_size):
+                digest.update(np.ascontiguousarray(array[start:start + self.chunk_size]).data)
+        return digest.hexdigest()
+
+    def _compute(self, x_data, y_data):
+        """Range, NaN, label, duplicate and pixel statistics in a single pass over the data"""
+        x_min, x_max = np.inf, -np.inf
+        has_nan = False
+        total = 0.0
+        total_sq = 0.0
+        y_min, y_max = np.inf, -np.inf
+        class_counts = np.zeros(10, dtype=np.int64)
+        row_hashes = []
+
+        for start in range(0, len(x_data), self.chunk_size):
+            chunk = np.asarray(x_data[start:start + self.chunk_size])
+            labels = np.asarray(y_data[start:start + self.chunk_size])
+
+            # NaNs only exist in float data; nanmin/nanmax keep the range check meaningful
+            if chunk.dtype.kind == 'f':
+                has_nan = has_nan or bool(np.isnan(chunk).any())
+                x_min = min(x_min, float(np.nanmin(chunk)))
+                x_max = max(x_max, float(np.nanmax(chunk)))
+            else:
+                x_min = min(x_min, float(chunk.min()))
+                x_max = max(x_max, float(chunk.max()))
+            # One float64 copy per chunk serves both moments; the dot product runs in BLAS
+            values = chunk.astype(np.float64).ravel()
+            total += float(values.sum())
+            total_sq += float(values @ values)
+
+            y_min = min(y_min, float(labels.min()))
+            y_max = max(y_max, float(labels.max()))
+            in_range = labels[(labels >= 0) & (labels <= 9)].astype(np.int64)
+            class_counts += np.bincount(in_range, minlength=10)
+
+            rows = np.ascontiguousarray(chunk.reshape(len(chunk), -1))
+            row_hashes.extend(hashlib.blake2b(row.data, digest_size=8).digest() for row in rows)
+
+        num_samples = len(x_data)
+        num_values = max(x_data.size, 1)
+        mean = total / num_values
+        duplicate_count = num_samples - len(set(row_hashes))
+
+        checks = {
+            "shape_correct": tuple(x_data.shape[1:]) == (28, 28),
+            "pixel_range": (x_min >= 0) and (x_max <= 255),
+            "no_nulls": not has_nan,
+            "labels_range": (y_min >= 0) and (y_max <= 9),
+            "num_classes": int((class_counts > 0).sum()) == 10
+        }
+        return {
+            'checks': {name: bool(value) for name, value in checks.items()},
+            'num_samples': num_samples,
+            'class_counts': class_counts.tolist(),
+            'duplicate_count': duplicate_count,
+            'pixel_stats': {
+                'min': x_min,
+                'max': x_max,
+                'mean': mean,
+                'std': float(np.sqrt(max(total_sq / num_values - mean ** 2, 0.0)))
+            }
+        }
+
+    def build_report(self, x_data, y_data):
+        """Slow path: full Evidently DataQualityMetrics report over a pixel-per-column DataFrame"""
+        import pandas as pd
+        from evidently.report import Report
+        from evidently.metrics import DataQualityMetrics
+
         x_flat = x_data.reshape(x_data.shape[0], -1)
         feature_columns = [f'pixel_{i}' for i in range(x_flat.shape[1])]
-        
+
         df = pd.DataFrame(x_flat, columns=feature_columns)
         df['target'] = y_data
-        
-        # Create validation report
+
         report = Report(metrics=[DataQualityMetrics()])
         report.run(current_data=df, reference_data=None)
-        
-        # Basic quality checks
-        checks = {
-            "shape_correct": x_data.shape[1:] == (28, 28),
-            "pixel_range": (x_data.min() >= 0) and (x_data.max() <= 255),
-            "no_nulls": not np.isnan(x_data).any(),
-            "labels_range": (y_data.min() >= 0) and (y_data.max() <= 9),
-            "num_classes": len(np.unique(y_data)) == 10
-        }
-        
-        print("Data Quality Checks:")
-        for check, result in checks.items():
-            status = "✅" if result else "❌"
-            print(f"{status} {check}: {result}")
-        
-        return all(checks.values()), report
\ No newline at end of file
+        return report
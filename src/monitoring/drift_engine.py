@@ -0,0 +1,175 @@
+import numpy as np
+from pathlib import Path
+
+EPSILON = 1e-6
+
+# Written next to the deployed model so the API can score live traffic against it
+REFERENCE_STATS_NAME = 'reference_stats.npz'
+
+
+def flatten_images(x):
+    """View images as an (N, features) array and return it with its pixel scale"""
+    flat = np.asarray(x).reshape(len(x), -1)
+    scale = 255.0 if flat.dtype == np.uint8 or (flat.size and flat.max() > 1.0) else 1.0
+    return flat, scale
+
+
+def feature_histograms(values, n_bins, scale=1.0, chunk_size=1024):
+    """Per-feature histograms of an (N, F) array over [0, scale] as an (F, n_bins) count matrix"""
+    n_features = values.shape[1]
+    counts = np.zeros(n_features * n_bins, dtype=np.int64)
+    offsets = np.arange(n_features, dtype=np.int32) * n_bins
+
+    if values.dtype == np.uint8:
+        # One table lookup per pixel instead of float conversion and scaling
+        lut = np.clip((np.arange(256) / scale * n_bins).astype(np.int32), 0, n_bins - 1)
+
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        if values.dtype == np.uint8:
+            bins = lut[chunk]
+        else:
+            bins = np.clip((chunk * (n_bins / scale)).astype(np.int32), 0, n_bins - 1)
+        counts += np.bincount((bins + offsets).ravel(), minlength=n_features * n_bins)
+    return counts.reshape(n_features, n_bins)
+
+
+def psi(reference_counts, current_counts):
+    """Population stability index per feature from binned counts"""
+    ref = reference_counts / reference_counts.sum(axis=-1, keepdims=True) + EPSILON
+    cur = current_counts / current_counts.sum(axis=-1, keepdims=True) + EPSILON
+    return np.sum((cur - ref) * np.log(cur / ref), axis=-1)
+
+
+def ks_statistic(reference_counts, current_counts):
+    """Kolmogorov-Smirnov distance per feature between binned distributions"""
+    ref_cdf = np.cumsum(reference_counts, axis=-1) / reference_counts.sum(axis=-1, keepdims=True)
+    cur_cdf = np.cumsum(current_counts, axis=-1) / current_counts.sum(axis=-1, keepdims=True)
+    return np.max(np.abs(cur_cdf - ref_cdf), axis=-1)
+
+
+def wasserstein(reference_counts, current_counts, bin_width):
+    """Earth mover's distance per feature between binned distributions"""
+    ref_cdf = np.cumsum(reference_counts, axis=-1) / reference_counts.sum(axis=-1, keepdims=True)
+    cur_cdf = np.cumsum(current_counts, axis=-1) / current_counts.sum(axis=-1, keepdims=True)
+    return np.sum(np.abs(cur_cdf - ref_cdf), axis=-1) * bin_width
+
+
+class ReferenceStatistics:
+    """Summary statistics of the reference set, computed once and reused for every check"""
+
+    def __init__(self, n_bins=20, num_classes=10):
+        self.n_bins = n_bins
+        self.num_classes = num_classes
+        self.count = 0
+        self.pixel_histograms = None
+        self.pixel_mean = None
+        self.pixel_var = None
+        self.label_counts = None
+        self.embedding_low = None
+        self.embedding_high = None
+        self.embedding_histograms = None
+        self.embedding_mean = None
+        self.embedding_var = None
+
+    def fit(self, x, y=None, embeddings=None):
+        """Compute histograms, moments and label distribution of the reference data"""
+        pixels, scale = flatten_images(x)
+        self.count = len(pixels)
+        self.pixel_histograms = feature_histograms(pixels, self.n_bins, scale)
+        self.pixel_mean = pixels.mean(axis=0, dtype=np.float64) / scale
+        self.pixel_var = pixels.var(axis=0, dtype=np.float64) / scale ** 2
+
+        if y is not None:
+            self.label_counts = np.bincount(np.asarray(y, dtype=np.int64), minlength=self.num_classes)
+
+        if embeddings is not None:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            self.embedding_low = embeddings.min(axis=0)
+            self.embedding_high = embeddings.max(axis=0)
+            self.embedding_histograms = self._embedding_histograms(embeddings)
+            self.embedding_mean = embeddings.mean(axis=0, dtype=np.float64)
+            self.embedding_var = embeddings.var(axis=0, dtype=np.float64)
+        return self
+
+    def _embedding_histograms(self, embeddings):
+        """Histogram each embedding dimension over its reference range"""
+        span = np.maximum(self.embedding_high - self.embedding_low, EPSILON)
+        scaled = (embeddings - self.embedding_low) / span
+        return feature_histograms(scaled.astype(np.float32), self.n_bins)
+
+    def save(self, path):
+        """Persist the statistics as a .npz file"""
+        arrays = {k: v for k, v in vars(self).items() if isinstance(v, np.ndarray)}
+        np.savez(path, n_bins=self.n_bins, num_classes=self.num_classes, count=self.count, **arrays)
+        return Path(path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            stats = cls(n_bins=int(data['n_bins']), num_classes=int(data['num_classes']))
+            stats.count = int(data['count'])
+            for name in data.files:
+                if name not in ('n_bins', 'num_classes', 'count'):
+                    setattr(stats, name, data[name])
+        return stats
+
+
+class DriftEngine:
+    """Vectorized PSI/KS/Wasserstein drift scoring against ReferenceStatistics"""
+
+    def __init__(self, reference: ReferenceStatistics, psi_threshold=0.2, ks_threshold=0.1, drift_share=0.5):
+        self.reference = reference
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.drift_share = drift_share
+
+    def score(self, x, y=None, embeddings=None) -> dict:
+        """Score a batch against the reference and return a summary of drift metrics"""
+        pixels, scale = flatten_images(x)
+        current_histograms = feature_histograms(pixels, self.reference.n_bins, scale)
+        return self.score_histograms(
+            current_histograms,
+            pixel_mean=pixels.mean(axis=0, dtype=np.float64) / scale,
+            label_counts=None if y is None else np.bincount(
+                np.asarray(y, dtype=np.int64), minlength=self.reference.num_classes),
+            embeddings=embeddings
+        )
+
+    def score_histograms(self, current_histograms, pixel_mean=None, label_counts=None, embeddings=None) -> dict:
+        """Score precomputed per-pixel histograms, e.g. from a streaming sketch"""
+        reference = self.reference
+        pixel_psi = psi(reference.pixel_histograms, current_histograms)
+        pixel_ks = ks_statistic(reference.pixel_histograms, current_histograms)
+        pixel_wasserstein = wasserstein(reference.pixel_histograms, current_histograms, 1.0 / reference.n_bins)
+        drifted = (pixel_psi > self.psi_threshold) | (pixel_ks > self.ks_threshold)
+
+        result = {
+            'num_samples': int(current_histograms[0].sum()),
+            'pixel_psi_mean': float(pixel_psi.mean()),
+            'pixel_psi_max': float(pixel_psi.max()),
+            'pixel_ks_max': float(pixel_ks.max()),
+            'pixel_wasserstein_mean': float(pixel_wasserstein.mean()),
+            'drifted_pixel_share': float(drifted.mean()),
+            'dataset_drift': bool(drifted.mean() >= self.drift_share)
+        }
+
+        if pixel_mean is not None:
+            # Mean shift in units of the reference standard deviation, over non-constant pixels
+            std = np.sqrt(reference.pixel_var)
+            informative = std > EPSILON
+            z = np.abs(pixel_mean[informative] - reference.pixel_mean[informative]) / std[informative]
+            result['pixel_mean_shift_z'] = float(z.mean()) if z.size else 0.0
+
+        if label_counts is not None and reference.label_counts is not None:
+            result['label_psi'] = float(psi(reference.label_counts, label_counts))
+            result['label_drift'] = result['label_psi'] > self.psi_threshold
+
+        if embeddings is not None and reference.embedding_histograms is not None:
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            embedding_psi = psi(reference.embedding_histograms, reference._embedding_histograms(embeddings))
+            result['embedding_psi_mean'] = float(embedding_psi.mean())
+            result['embedding_psi_max'] = float(embedding_psi.max())
+
+        result['psi_per_pixel'] = pixel_psi
+        return result
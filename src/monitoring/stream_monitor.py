@@ -0,0 +1,254 @@
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+import numpy as np
+from .drift_engine import DriftEngine, ReferenceStatistics, feature_histograms
+
+NUM_FEATURES = 28 * 28
+CONFIDENCE_BINS = 10
+
+
+class RingBuffer:
+    """Fixed-size single-producer/single-consumer buffer of images and probabilities
+
+    The request path writes a slot and then advances head; the monitor thread
+    reads up to head and advances tail. Each index has one writer, so no lock
+    is needed. When the consumer falls behind, new records are dropped.
+    """
+
+    def __init__(self, capacity=4096, num_classes=10):
+        self.capacity = capacity
+        self.images = np.zeros((capacity, NUM_FEATURES), dtype=np.uint8)
+        self.probabilities = np.zeros((capacity, num_classes), dtype=np.float32)
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def push(self, images, probabilities):
+        """Write as many rows as fit and return how many were accepted"""
+        accepted = min(len(images), self.capacity - (self.head - self.tail))
+        self.dropped += len(images) - accepted
+        if accepted <= 0:
+            return 0
+        slots = np.arange(self.head, self.head + accepted) % self.capacity
+        self.images[slots] = images[:accepted]
+        self.probabilities[slots] = probabilities[:accepted]
+        self.head += accepted
+        return accepted
+
+    def drain(self):
+        """Copy out everything written since the last drain"""
+        head, tail = self.head, self.tail
+        if head == tail:
+            return None, None
+        slots = np.arange(tail, head) % self.capacity
+        images, probabilities = self.images[slots], self.probabilities[slots]
+        self.tail = head
+        return images, probabilities
+
+    def __len__(self):
+        return self.head - self.tail
+
+
+class WindowBlock:
+    """Sketch of one block of the sliding window"""
+
+    def __init__(self, n_bins, num_classes):
+        self.count = 0
+        self.pixel_histograms = np.zeros((NUM_FEATURES, n_bins), dtype=np.int64)
+        self.pixel_sums = np.zeros(NUM_FEATURES, dtype=np.float64)
+        self.prediction_counts = np.zeros(num_classes, dtype=np.int64)
+        self.confidence_counts = np.zeros(CONFIDENCE_BINS, dtype=np.int64)
+
+    def add(self, images, probabilities, n_bins):
+        self.count += len(images)
+        self.pixel_histograms += feature_histograms(images, n_bins, 255.0)
+        self.pixel_sums += images.sum(axis=0, dtype=np.float64) / 255.0
+        self.prediction_counts += np.bincount(np.argmax(probabilities, axis=1), minlength=len(self.prediction_counts))
+        confidence_bins = np.minimum((np.max(probabilities, axis=1) * CONFIDENCE_BINS).astype(np.int64), CONFIDENCE_BINS - 1)
+        self.confidence_counts += np.bincount(confidence_bins, minlength=CONFIDENCE_BINS)
+
+    def merge(self, other, sign=1):
+        self.count += sign * other.count
+        self.pixel_histograms += sign * other.pixel_histograms
+        self.pixel_sums += sign * other.pixel_sums
+        self.prediction_counts += sign * other.prediction_counts
+        self.confidence_counts += sign * other.confidence_counts
+
+
+class StreamingDriftMonitor:
+    """Constant-memory drift monitoring over live prediction traffic
+
+    Inputs and predictions are pushed onto a ring buffer from the request
+    path; a background thread folds them into a sliding window of block
+    sketches, keeps a reservoir sample of recent images, and periodically
+    scores the window against the reference statistics.
+    """
+
+    def __init__(self, reference=None, window_size=5000, num_blocks=10, buffer_size=4096,
+                 reservoir_size=500, score_interval_s=30.0, output_dir=None, n_bins=20, num_classes=10,
+                 psi_threshold=0.2, ks_threshold=0.1, drift_share=0.5):
+        self.reference = reference
+        self.n_bins = reference.n_bins if reference is not None else n_bins
+        self.num_classes = num_classes
+        self.block_size = max(1, window_size // num_blocks)
+        self.num_blocks = num_blocks
+        self.score_interval_s = score_interval_s
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.drift_engine = DriftEngine(
+            reference, psi_threshold=psi_threshold, ks_threshold=ks_threshold, drift_share=drift_share
+        ) if reference is not None else None
+
+        self.buffer = RingBuffer(buffer_size, num_classes)
+        self._blocks = deque()
+        self._window = WindowBlock(self.n_bins, num_classes)
+        self._current = WindowBlock(self.n_bins, num_classes)
+
+        self.reservoir = np.zeros((reservoir_size, NUM_FEATURES), dtype=np.uint8)
+        self._reservoir_filled = 0
+        self._seen = 0
+        self._rng = np.random.RandomState(0)
+
+        self.latest_scores = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, images, probabilities):
+        """Queue a batch of normalized images and their probabilities; never blocks"""
+        pixels = np.asarray(images, dtype=np.float32).reshape(len(images), -1)
+        # Out-of-range inputs saturate instead of wrapping around in the uint8 cast
+        self.buffer.push(np.clip(np.rint(pixels * 255.0), 0, 255).astype(np.uint8), np.asarray(probabilities))
+
+    def replay(self, records):
+        """Fold prediction log records (see serving.prediction_log) into the window, oldest first"""
+        for start in range(0, len(records), self.buffer.capacity):
+            chunk = records[start:start + self.buffer.capacity]
+            self.buffer.push(chunk['pixels'], chunk['probabilities'].astype(np.float32))
+            self.update()
+        return len(records)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+            print(f"✓ Streaming drift monitor started (window={self.block_size * self.num_blocks})")
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.update()
+
+    def _run(self):
+        last_score = time.monotonic()
+        while not self._stop.wait(0.5):
+            self.update()
+            if time.monotonic() - last_score >= self.score_interval_s:
+                self.score()
+                last_score = time.monotonic()
+
+    def update(self):
+        """Fold everything queued so far into the window sketches"""
+        images, probabilities = self.buffer.drain()
+        if images is None:
+            return 0
+
+        start = 0
+        while start < len(images):
+            take = min(self.block_size - self._current.count, len(images) - start)
+            self._current.add(images[start:start + take], probabilities[start:start + take], self.n_bins)
+            start += take
+            if self._current.count >= self.block_size:
+                self._rotate_block()
+
+        self._update_reservoir(images)
+        return len(images)
+
+    def _rotate_block(self):
+        """Move the full current block into the window, evicting the oldest"""
+        self._blocks.append(self._current)
+        self._window.merge(self._current)
+        if len(self._blocks) > self.num_blocks:
+            self._window.merge(self._blocks.popleft(), sign=-1)
+        self._current = WindowBlock(self.n_bins, self.num_classes)
+
+    def _update_reservoir(self, images):
+        """Reservoir sampling (Algorithm R) over every image seen, vectorized per drain"""
+        capacity = len(self.reservoir)
+        fill = min(capacity - self._reservoir_filled, len(images))
+        if fill > 0:
+            self.reservoir[self._reservoir_filled:self._reservoir_filled + fill] = images[:fill]
+            self._reservoir_filled += fill
+
+        # Image number k (1-based) replaces a random slot with probability capacity / k
+        seen = self._seen + np.arange(fill + 1, len(images) + 1)
+        slots = (self._rng.random_sample(len(seen)) * seen).astype(np.int64)
+        keep = slots < capacity
+        self.reservoir[slots[keep]] = images[fill:][keep]
+        self._seen += len(images)
+
+    def window_sketch(self):
+        """Current window (full blocks plus the partial block) as one sketch"""
+        sketch = WindowBlock(self.n_bins, self.num_classes)
+        sketch.merge(self._window)
+        sketch.merge(self._current)
+        return sketch
+
+    def score(self):
+        """Score the current window and persist the result"""
+        sketch = self.window_sketch()
+        if sketch.count == 0:
+            return None
+
+        confidence = sketch.confidence_counts / sketch.count
+        scores = {
+            'timestamp': time.time(),
+            'window_count': int(sketch.count),
+            'images_seen': int(self._seen),
+            'dropped': int(self.buffer.dropped),
+            'prediction_distribution': (sketch.prediction_counts / sketch.count).tolist(),
+            'confidence_histogram': confidence.tolist(),
+            'low_confidence_share': float(confidence[:CONFIDENCE_BINS // 2].sum())
+        }
+        if self.drift_engine is not None:
+            drift = self.drift_engine.score_histograms(
+                sketch.pixel_histograms,
+                pixel_mean=sketch.pixel_sums / sketch.count,
+                label_counts=sketch.prediction_counts
+            )
+            drift.pop('psi_per_pixel')
+            scores.update(drift)
+
+        self.latest_scores = scores
+        if self.output_dir is not None:
+            self._persist(scores, sketch)
+        return scores
+
+    def _persist(self, scores, sketch):
+        """Append scores to a JSONL history and snapshot the window as ReferenceStatistics"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.output_dir / 'drift_scores.jsonl', 'a') as f:
+            f.write(json.dumps(scores) + '\n')
+
+        snapshot = ReferenceStatistics(n_bins=self.n_bins, num_classes=self.num_classes)
+        snapshot.count = sketch.count
+        snapshot.pixel_histograms = sketch.pixel_histograms
+        snapshot.pixel_mean = sketch.pixel_sums / sketch.count
+        snapshot.label_counts = sketch.prediction_counts
+        snapshot.save(self.output_dir / 'live_window.npz')
+        np.save(self.output_dir / 'reservoir.npy', self.reservoir[:self._reservoir_filled])
+
+    def get_stats(self) -> dict:
+        return {
+            'images_seen': self._seen,
+            'buffered': len(self.buffer),
+            'dropped': self.buffer.dropped,
+            'window_count': int(self._window.count + self._current.count),
+            'reservoir_size': self._reservoir_filled,
+            'has_reference': self.reference is not None
+        }
@@ -1,19 +1,77 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import time
+
+# Measured from the first import so startup stats include the framework imports below
+IMPORT_START = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, ValidationError
 import numpy as np
-import tensorflow as tf
 from pathlib import Path
+import asyncio
 import sys
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from ...monitoring.drift_engine import REFERENCE_STATS_NAME, ReferenceStatistics
+from ...monitoring.stream_monitor import StreamingDriftMonitor
 from ...utils.config import config
+from ..batcher import MicroBatcher, QueueFullError
+from ..cache import PredictionCache, create_cache_backend
+from ..cascade import CascadeEngine, load_cascade
+from ..engines import load_engine
+from ..executor import ExecutorSaturatedError, InferenceExecutor, InferenceTimeoutError
+from ..metrics import BATCH_SIZE_BUCKETS, METRICS_CONTENT_TYPE, MetricsMiddleware, MetricsRegistry
+from ..model_watcher import DirectoryModelSource, ModelWatcher, RegistryModelSource
+from ..prediction_log import PredictionLog
+from ..versions import VersionRouter, current_rss_mb, load_version
+from ..payload import (
+    NPY_CONTENT_TYPE, PayloadError, decode_images, decode_json, encode_npy, preprocess_images
+)
 
 app = FastAPI(title="MNIST Classification API", version="1.0.0")
 
 # Load model
-model = None
+engine = None
+batcher = None
+executor = None
+cache = None
+watcher = None
+drift_monitor = None
+prediction_log = None
+router = None
+startup_task = None
+# Set once the model is loaded and warmed up; /ready reports it to the orchestrator
+ready = False
+startup_stats = {}
+
+# Metrics are updated from the event loop and rendered on /metrics
+metrics = MetricsRegistry()
+http_requests_total = metrics.counter('mnist_http_requests_total', 'HTTP requests by route and status', ['path', 'status'])
+http_request_seconds = metrics.histogram('mnist_http_request_seconds', 'HTTP request latency by route', ['path'])
+stage_seconds = metrics.histogram('mnist_stage_seconds', 'Time spent in each prediction stage', ['endpoint', 'stage'])
+model_batch_size = metrics.histogram('mnist_model_batch_size', 'Images per model call', buckets=BATCH_SIZE_BUCKETS)
+model_seconds = metrics.histogram('mnist_model_seconds', 'Model call latency including executor wait')
+errors_total = metrics.counter('mnist_errors_total', 'Prediction errors by type', ['type'])
+queue_depth = metrics.gauge('mnist_batcher_queue_depth', 'Requests waiting in the micro-batcher')
+batches_in_flight = metrics.gauge('mnist_batcher_batches_in_flight', 'Batches currently being predicted')
+executor_pending = metrics.gauge('mnist_executor_pending', 'Inference calls pending on the executor')
+cache_hits_total = metrics.counter('mnist_cache_hits_total', 'Prediction cache hits')
+cache_misses_total = metrics.counter('mnist_cache_misses_total', 'Prediction cache misses')
+model_reloads_total = metrics.counter('mnist_model_reloads_total', 'Successful model hot reloads')
+prediction_log_dropped_total = metrics.counter('mnist_prediction_log_dropped_total', 'Predictions not logged because the queue was full')
+model_info = metrics.gauge('mnist_model_info', 'Currently served model', ['engine', 'version'])
+version_requests_total = metrics.counter('mnist_version_requests_total', 'Requests answered or shadowed per model version', ['name', 'mode'])
+version_agreement = metrics.gauge('mnist_version_agreement_ratio', 'Share of images where a candidate agrees with the primary', ['name'])
+cascade_escalated_ratio = metrics.gauge('mnist_cascade_escalated_ratio', 'Share of images the cascade sent to the full model')
+version_memory_mb = metrics.gauge('mnist_version_memory_mb', 'Resident memory added by loading each model version', ['name'])
+ready_gauge = metrics.gauge('mnist_ready', '1 once the model is loaded and warmed up')
+startup_seconds = metrics.gauge('mnist_startup_seconds', 'Time spent in each startup phase', ['phase'])
+
+# Resolved once so the hot path is a dict lookup and a list increment
+STAGES = ('decode', 'preprocess', 'inference', 'serialize')
+predict_stages = {stage: stage_seconds.labels('/predict', stage) for stage in STAGES}
+batch_stages = {stage: stage_seconds.labels('/predict/batch', stage) for stage in STAGES}
 
 class PredictionRequest(BaseModel):
     image: list
@@ -23,20 +81,315 @@ class PredictionResponse(BaseModel):
     confidence: float
     probabilities: list
 
+class BatchPredictionRequest(BaseModel):
+    images: list
+
+class BatchPredictionResponse(BaseModel):
+    predictions: list
+    confidences: list
+    probabilities: list
+
 def load_model():
-    """Load the trained model"""
-    global model
-    model_path = config.model_paths['deployed'] / 'mnist_cnn_model.keras'
+    """Load the trained model into the configured inference engine and warm it up"""
+    serving_config = config.base.get('serving', {})
+    start = time.perf_counter()
+    rss_before = current_rss_mb()
+    new_engine = load_engine(
+        serving_config.get('engine', 'keras'),
+        config.model_paths['deployed'],
+        num_threads=serving_config.get('num_threads'),
+        quantization=serving_config.get('quantization')
+    )
+    cascade_config = serving_config.get('cascade', {})
+    if cascade_config.get('enabled', False):
+        new_engine = load_cascade(new_engine, config.model_paths['deployed'], threshold=cascade_config.get('threshold'))
+    startup_stats['model_load_s'] = time.perf_counter() - start
+    
+    # Pay tracing and tensor allocation for the batch sizes the batcher produces before any request does
+    warmup_batch_sizes = serving_config.get('startup', {}).get('warmup_batch_sizes', [1])
+    startup_stats['warmup_s'] = sum(new_engine.warmup(batch_size) for batch_size in warmup_batch_sizes)
+    startup_stats['model_memory_mb'] = current_rss_mb() - rss_before
+    activate_engine(new_engine)
+    print(f"✓ Model loaded successfully ({engine.name} engine, version {engine.version}, "
+          f"load {startup_stats['model_load_s']:.2f}s, warm-up {startup_stats['warmup_s']:.2f}s)")
+
+def activate_engine(new_engine):
+    """Make new_engine serve all subsequent requests"""
+    global engine
+    engine = new_engine
+    if cache is not None:
+        cache.set_model_version(engine.version)
+
+async def infer(images, version=None):
+    """Run inference on the bounded executor, or inline when it is disabled
+
+    version is the canary ServedVersion serving these images, or None for the
+    primary. Its time is recorded around the engine call alone, once per model
+    batch, and primary batches are copied to the shadow versions as they were run.
+    """
+    # Bind the engine now so a hot swap does not move in-flight work to the new model
+    active_engine = version.engine if version is not None else engine
+    model_batch_size.observe(len(images))
+    
+    def timed_predict(batch):
+        predict_start = time.perf_counter()
+        return active_engine.predict(batch), time.perf_counter() - predict_start
+    
+    start = time.perf_counter()
+    try:
+        if executor is None:
+            probabilities, latency_s = timed_predict(images)
+        else:
+            probabilities, latency_s = await executor.run(timed_predict, images)
+    finally:
+        model_seconds.time(start)
+    
+    if version is not None:
+        version.record(len(images), latency_s)
+    elif router is not None:
+        router.record_primary(active_engine, len(images), latency_s)
+        router.shadow(images, probabilities)
+    return probabilities
+
+def create_executor():
+    """Create the inference thread pool from serving config"""
+    executor_config = config.base.get('serving', {}).get('executor', {})
+    if not executor_config.get('enabled', False):
+        return None
+    
+    return InferenceExecutor(
+        max_workers=executor_config.get('max_workers', 1),
+        max_pending=executor_config.get('max_pending', 64),
+        timeout_s=executor_config.get('timeout_s', 5.0)
+    )
+
+def create_cache():
+    """Create the prediction cache from serving config"""
+    cache_config = config.base.get('serving', {}).get('cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    
+    backend = create_cache_backend(
+        cache_config.get('backend', 'memory'),
+        max_entries=cache_config.get('max_entries', 10000),
+        ttl_s=cache_config.get('ttl_s', 3600.0),
+        path=cache_config.get('path') or config.DATA_DIR / 'cache' / 'predictions.sqlite'
+    )
+    return PredictionCache(backend)
+
+async def predict_cached(images):
+    """Predict a batch, only running the model on images missing from the cache"""
+    if cache is None:
+        return await infer(images)
     
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model not found at {model_path}")
+    model_version = engine.version
+    probabilities = np.empty((len(images), 10), dtype='float32')
+    misses = []
+    for i, cached in enumerate(await cache.run(cache.get_many, images, model_version)):
+        if cached is None:
+            misses.append(i)
+        else:
+            probabilities[i] = cached
     
-    model = tf.keras.models.load_model(model_path)
-    print("✓ Model loaded successfully")
+    if misses:
+        computed = await infer(images[misses])
+        probabilities[misses] = computed
+        await cache.run(cache.put_many, images[misses], computed, model_version)
+    return probabilities
+
+def create_watcher():
+    """Create the hot-reload model watcher from serving config"""
+    serving_config = config.base.get('serving', {})
+    reload_config = serving_config.get('reload', {})
+    if not reload_config.get('enabled', False):
+        return None
+    
+    engine_name = serving_config.get('engine', 'keras')
+    cascade_config = serving_config.get('cascade', {})
+    if reload_config.get('source', 'directory') == 'registry':
+        if cascade_config.get('enabled', False):
+            # The first stage is calibrated against the deployed CNN, not against registry versions
+            print("❌ The cascade is only rebuilt on reload from the directory source; registry reloads serve the full model alone")
+        source = RegistryModelSource(
+            model_name=reload_config.get('model_name', 'mnist-cnn'),
+            stage=reload_config.get('stage', 'Production'),
+            engine_name=engine_name
+        )
+    else:
+        source = DirectoryModelSource(
+            config.model_paths['deployed'],
+            engine_name=engine_name,
+            num_threads=serving_config.get('num_threads'),
+            quantization=serving_config.get('quantization'),
+            cascade=cascade_config.get('enabled', False),
+            cascade_threshold=cascade_config.get('threshold')
+        )
+    return ModelWatcher(
+        source,
+        activate_engine,
+        interval_s=reload_config.get('interval_s', 10.0),
+        warmup_batch_sizes=serving_config.get('startup', {}).get('warmup_batch_sizes', [1])
+    )
+
+def create_router():
+    """Load canary and shadow model versions from serving config
+    
+    Each candidate names its source like the hot-reload watcher does, e.g.
+    {name: staging, source: registry, stage: Staging, mode: shadow} or
+    {name: next, source: directory, model_dir: models/next, mode: canary, weight: 0.05}.
+    """
+    serving_config = config.base.get('serving', {})
+    versions_config = serving_config.get('versions', {})
+    candidates = versions_config.get('candidates') or []
+    if not candidates:
+        return None
+    
+    engine_name = serving_config.get('engine', 'keras')
+    warmup_batch_sizes = serving_config.get('startup', {}).get('warmup_batch_sizes', [1])
+    versions = []
+    failed = {}
+    for candidate in candidates:
+        name = candidate.get('name', f"candidate-{len(versions) + len(failed)}")
+        try:
+            if candidate.get('source', 'directory') == 'registry':
+                source = RegistryModelSource(
+                    model_name=candidate.get('model_name', 'mnist-cnn'),
+                    stage=candidate.get('stage', 'Staging'),
+                    engine_name=engine_name
+                )
+            else:
+                source = DirectoryModelSource(
+                    candidate['model_dir'],
+                    engine_name=engine_name,
+                    num_threads=serving_config.get('num_threads'),
+                    quantization=serving_config.get('quantization')
+                )
+            versions.append(load_version(
+                name, source,
+                mode=candidate.get('mode', 'shadow'),
+                weight=candidate.get('weight', 0.0),
+                warmup_batch_sizes=warmup_batch_sizes
+            ))
+        except Exception as e:
+            # A broken candidate is skipped; the primary model serves regardless
+            failed[name] = str(e)
+            print(f"❌ Skipping model version '{name}': {e}")
+    new_router = VersionRouter(versions, max_pending=versions_config.get('shadow_max_pending', 8), failed=failed)
+    new_router.primary.memory_mb = startup_stats.get('model_memory_mb')
+    return new_router
+
+def create_batcher():
+    """Create the request micro-batcher from serving config"""
+    batching_config = config.base.get('serving', {}).get('batching', {})
+    if not batching_config.get('enabled', False):
+        return None
+    
+    return MicroBatcher(
+        infer,
+        max_batch_size=batching_config.get('max_batch_size', 32),
+        max_wait_ms=batching_config.get('max_wait_ms', 5.0),
+        max_queue_size=batching_config.get('max_queue_size', 1024)
+    )
+
+def create_drift_monitor():
+    """Create the streaming drift monitor from monitoring config"""
+    monitoring_config = config.base.get('monitoring', {})
+    stream_config = monitoring_config.get('stream', {})
+    if not stream_config.get('enabled', False):
+        return None
+    
+    # Without reference statistics the monitor still tracks traffic, it just cannot score drift
+    reference_path = config.model_paths['deployed'] / REFERENCE_STATS_NAME
+    reference = ReferenceStatistics.load(reference_path) if reference_path.exists() else None
+    drift_config = monitoring_config.get('drift', {})
+    return StreamingDriftMonitor(
+        reference,
+        window_size=stream_config.get('window_size', 5000),
+        num_blocks=stream_config.get('num_blocks', 10),
+        buffer_size=stream_config.get('buffer_size', 4096),
+        reservoir_size=stream_config.get('reservoir_size', 500),
+        score_interval_s=stream_config.get('score_interval_s', 30.0),
+        output_dir=stream_config.get('output_dir') or config.DATA_DIR / 'monitoring',
+        n_bins=drift_config.get('n_bins', 20),
+        psi_threshold=drift_config.get('psi_threshold', 0.2),
+        ks_threshold=drift_config.get('ks_threshold', 0.1),
+        drift_share=drift_config.get('drift_share', 0.5)
+    )
+
+async def prepare_model():
+    """Load and warm up the models off the event loop, start hot reload, then report ready"""
+    global watcher, router, ready
+    await asyncio.to_thread(load_model)
+    router = await asyncio.to_thread(create_router)
+    watcher = create_watcher()
+    if watcher is not None:
+        await watcher.start(active_version=engine.version)
+    ready = True
+    startup_stats['time_to_ready_s'] = time.perf_counter() - IMPORT_START
+    print(f"✓ Ready {startup_stats['time_to_ready_s']:.2f}s after import")
+
+def report_startup_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        startup_stats['error'] = str(task.exception())
+        print(f"❌ Model failed to load, worker will not become ready: {task.exception()}")
+
+def create_prediction_log():
+    """Create the background prediction log writer from serving config"""
+    log_config = config.base.get('serving', {}).get('prediction_log', {})
+    if not log_config.get('enabled', False):
+        return None
+    
+    max_file_mb = log_config.get('max_file_mb', 64)
+    return PredictionLog(
+        log_config.get('log_dir') or config.DATA_DIR / 'prediction_log',
+        sample_rate=log_config.get('sample_rate', 1.0),
+        max_queue_size=log_config.get('max_queue_size', 10000),
+        batch_size=log_config.get('batch_size', 256),
+        flush_interval_s=log_config.get('flush_interval_s', 1.0),
+        max_file_bytes=int(max_file_mb * 2 ** 20),
+        max_files=log_config.get('max_files', 16)
+    )
 
 @app.on_event("startup")
 async def startup_event():
-    load_model()
+    global batcher, executor, cache, drift_monitor, prediction_log, startup_task
+    cache = create_cache()
+    executor = create_executor()
+    batcher = create_batcher()
+    if batcher is not None:
+        await batcher.start()
+    drift_monitor = create_drift_monitor()
+    if drift_monitor is not None:
+        drift_monitor.start()
+    prediction_log = create_prediction_log()
+    if prediction_log is not None:
+        prediction_log.start()
+    
+    if config.base.get('serving', {}).get('startup', {}).get('background_load', False):
+        # Accept connections right away: /health answers, /ready and predictions return 503 until warm
+        startup_task = asyncio.create_task(prepare_model())
+        startup_task.add_done_callback(report_startup_failure)
+    else:
+        await prepare_model()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global ready
+    ready = False
+    if startup_task is not None and not startup_task.done():
+        startup_task.cancel()
+    if watcher is not None:
+        await watcher.stop()
+    if batcher is not None:
+        await batcher.stop()
+    if executor is not None:
+        executor.shutdown()
+    if drift_monitor is not None:
+        drift_monitor.stop()
+    if prediction_log is not None:
+        prediction_log.stop()
+    if router is not None:
+        router.shutdown()
 
 @app.get("/")
 async def root():
@@ -44,29 +397,235 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "model_version": engine.version if engine is not None else None,
+        "engine": engine.name if engine is not None else None
+    }
+
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness, unlike /health: 200 only once the model is loaded and warmed up"""
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "loading",
+        "model_version": engine.version if ready else None,
+        "startup": {**startup_stats, 'import_s': IMPORT_S}
+    }
+
+def require_ready():
+    if not ready:
+        errors_total.labels('not_ready').inc()
+        raise HTTPException(status_code=503, detail="Model is still loading")
+
+@app.get("/stats")
+async def stats():
+    return {
+        "batching": batcher.get_stats() if batcher is not None else None,
+        "executor": executor.get_stats() if executor is not None else None,
+        "cache": cache.get_stats() if cache is not None else None,
+        "reload": watcher.get_stats() if watcher is not None else None,
+        "drift": drift_monitor.get_stats() if drift_monitor is not None else None,
+        "prediction_log": prediction_log.get_stats() if prediction_log is not None else None,
+        "versions": router.get_stats() if router is not None else None,
+        "cascade": engine.get_stats() if isinstance(engine, CascadeEngine) else None
+    }
+
+@app.get("/versions")
+async def model_versions():
+    """Traffic, latency, agreement and memory of the primary and candidate model versions"""
+    if router is None:
+        raise HTTPException(status_code=404, detail="No canary or shadow versions are configured")
+    return router.get_stats()
+
+@app.get("/drift")
+async def drift():
+    """Latest drift scores of live traffic against the training reference"""
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="Streaming drift monitoring is disabled")
+    return {
+        "scores": drift_monitor.latest_scores,
+        "monitor": drift_monitor.get_stats()
+    }
+
+def refresh_metrics():
+    """Copy point-in-time component stats into their gauges and counters"""
+    if batcher is not None:
+        batcher_stats = batcher.get_stats()
+        queue_depth.set(batcher_stats['queue_depth'])
+        batches_in_flight.set(batcher_stats['batches_in_flight'])
+    if executor is not None:
+        executor_pending.set(executor.get_stats()['pending'])
+    if cache is not None:
+        cache_stats = cache.get_stats()
+        cache_hits_total.labels().set(cache_stats['hits_total'])
+        cache_misses_total.labels().set(cache_stats['misses_total'])
+    if watcher is not None:
+        model_reloads_total.labels().set(watcher.get_stats()['reloads_total'])
+    if prediction_log is not None:
+        prediction_log_dropped_total.labels().set(prediction_log.stats['dropped_total'])
+    if isinstance(engine, CascadeEngine) and engine.stats['images_total']:
+        cascade_escalated_ratio.set(engine.get_stats()['escalated_fraction'])
+    model_info.clear()
+    if engine is not None:
+        model_info.labels(engine.name, engine.version).set(1)
+    if router is not None:
+        for name, version_stats in router.get_stats()['versions'].items():
+            version_requests_total.labels(name, version_stats['mode']).set(version_stats['requests_total'])
+            if version_stats['agreement_rate'] is not None:
+                version_agreement.labels(name).set(version_stats['agreement_rate'])
+            version_memory_mb.labels(name).set(version_stats['memory_mb'])
+    ready_gauge.set(int(ready))
+    startup_seconds.labels('import').set(IMPORT_S)
+    for phase in ('model_load', 'warmup', 'time_to_ready'):
+        if f'{phase}_s' in startup_stats:
+            startup_seconds.labels(phase).set(startup_stats[f'{phase}_s'])
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of serving metrics"""
+    refresh_metrics()
+    return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
 
 @app.post("/predict", response_model=PredictionResponse)
 async def predict(request: PredictionRequest):
+    require_ready()
     try:
         # Convert to numpy array and preprocess
-        image_array = np.array(request.image).reshape(1, 28, 28, 1)
-        image_array = image_array.astype('float32') / 255.0
+        request_start = start = time.perf_counter()
+        pixels = np.array(request.image).reshape(28, 28, 1)
+        predict_stages['decode'].time(start)
+        
+        start = time.perf_counter()
+        image_array = pixels.astype('float32') / 255.0
+        predict_stages['preprocess'].time(start)
         
-        # Make prediction
-        predictions = model.predict(image_array)
-        predicted_class = int(np.argmax(predictions[0]))
-        confidence = float(np.max(predictions[0]))
-        probabilities = predictions[0].tolist()
+        # Make prediction, coalesced with concurrent requests when batching is on
+        start = time.perf_counter()
+        canary = router.choose() if router is not None else None
+        if canary is not None:
+            # Canary requests skip the batcher and cache so their results stay attributed to the candidate
+            model_version = canary.engine.version
+            probabilities = (await infer(image_array[np.newaxis], canary))[0]
+        else:
+            model_version = engine.version
+            probabilities = await cache.run(cache.get, image_array, model_version) if cache is not None else None
+            if probabilities is None:
+                if batcher is not None:
+                    probabilities = await batcher.submit(image_array)
+                else:
+                    probabilities = (await infer(image_array[np.newaxis]))[0]
+                if cache is not None:
+                    await cache.run(cache.put, image_array, probabilities, model_version)
+        predict_stages['inference'].time(start)
+        if drift_monitor is not None:
+            drift_monitor.record(image_array[np.newaxis], probabilities[np.newaxis])
+        if prediction_log is not None:
+            prediction_log.log(pixels[np.newaxis], probabilities[np.newaxis], model_version,
+                               time.perf_counter() - request_start)
         
-        return PredictionResponse(
+        start = time.perf_counter()
+        predicted_class = int(np.argmax(probabilities))
+        confidence = float(np.max(probabilities))
+        
+        response = PredictionResponse(
             prediction=predicted_class,
             confidence=confidence,
-            probabilities=probabilities
+            probabilities=probabilities.tolist()
         )
+        predict_stages['serialize'].time(start)
+        return response
+    
+    except QueueFullError as e:
+        errors_total.labels('queue_full').inc()
+        raise HTTPException(status_code=429, detail=str(e))
+    except ExecutorSaturatedError as e:
+        errors_total.labels('executor_saturated').inc()
+        raise HTTPException(status_code=429, detail=str(e))
+    except InferenceTimeoutError as e:
+        errors_total.labels('timeout').inc()
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        errors_total.labels('internal').inc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_batch(request: Request):
+    """Predict N images sent as JSON, raw uint8 bytes or a .npy array"""
+    require_ready()
+    request_start = time.perf_counter()
+    try:
+        content_type = request.headers.get('content-type', '')
+        body = await request.body()
+        start = time.perf_counter()
+        if content_type.startswith('application/json'):
+            # Malformed JSON, a missing 'images' field and non-object bodies all raise ValidationError
+            images = decode_json(BatchPredictionRequest.model_validate_json(body).images)
+        else:
+            images = decode_images(body, content_type)
+        batch_stages['decode'].time(start)
+    except (PayloadError, ValidationError) as e:
+        errors_total.labels('payload').inc()
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    max_images = config.base.get('serving', {}).get('max_batch_images', 4096)
+    if len(images) > max_images:
+        errors_total.labels('too_large').inc()
+        raise HTTPException(status_code=413, detail=f"Batch of {len(images)} exceeds limit of {max_images} images")
     
+    try:
+        start = time.perf_counter()
+        pixels = images
+        images = preprocess_images(images)
+        batch_stages['preprocess'].time(start)
+        
+        start = time.perf_counter()
+        canary = router.choose() if router is not None else None
+        if canary is not None:
+            model_version = canary.engine.version
+            probabilities = (await infer(images, canary)).astype('float32')
+        else:
+            model_version = engine.version
+            probabilities = (await predict_cached(images)).astype('float32')
+        batch_stages['inference'].time(start)
+    except ExecutorSaturatedError as e:
+        errors_total.labels('executor_saturated').inc()
+        raise HTTPException(status_code=429, detail=str(e))
+    except InferenceTimeoutError as e:
+        errors_total.labels('timeout').inc()
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
+        errors_total.labels('internal').inc()
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if drift_monitor is not None:
+        drift_monitor.record(images, probabilities)
+    if prediction_log is not None:
+        prediction_log.log(pixels, probabilities, model_version, time.perf_counter() - request_start)
+    
+    # Binary clients get the probability matrix back as .npy; argmax gives the predictions
+    start = time.perf_counter()
+    if NPY_CONTENT_TYPE in request.headers.get('accept', ''):
+        response = Response(content=encode_npy(probabilities), media_type=NPY_CONTENT_TYPE)
+    else:
+        response = BatchPredictionResponse(
+            predictions=np.argmax(probabilities, axis=1).tolist(),
+            confidences=np.max(probabilities, axis=1).tolist(),
+            probabilities=probabilities.tolist()
+        )
+    batch_stages['serialize'].time(start)
+    return response
+
+# Added last so the route list is complete; unknown paths are grouped as "other"
+app.add_middleware(
+    MetricsMiddleware,
+    requests_total=http_requests_total,
+    request_seconds=http_request_seconds,
+    paths=[route.path for route in app.routes]
+)
+
+IMPORT_S = time.perf_counter() - IMPORT_START
 
 if __name__ == "__main__":
     import uvicorn
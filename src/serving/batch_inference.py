@@ -0,0 +1,340 @@
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import struct
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+from ..utils.config import config
+from .engines import INPUT_SHAPE
+
+CHECKPOINT_NAME = 'checkpoint.json'
+PROBABILITIES_NAME = 'probabilities.npy'
+PREDICTIONS_NAME = 'predictions.npy'
+FILES_NAME = 'files.txt'
+SUMMARY_NAME = 'summary.json'
+
+# Local file header: 30 fixed bytes, then the file name and extra field
+ZIP_LOCAL_HEADER = struct.Struct('<4s22xHH')
+# PNG paths sorted in memory at once while listing a directory
+LISTING_CHUNK_SIZE = 100000
+
+
+def _read_array_header(f):
+    """(shape, dtype) of the .npy stream at f, leaving f at the start of the data"""
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    if dtype.hasobject or fortran_order:
+        raise ValueError("Only C-ordered numeric arrays can be streamed")
+    return shape, dtype
+
+
+def _npy_layout(path):
+    """Byte offset, shape and dtype of the array in a .npy file"""
+    with open(path, 'rb') as f:
+        shape, dtype = _read_array_header(f)
+        return f.tell(), shape, dtype
+
+
+def _npz_member(path, key=None):
+    """Name of the images array in an .npz: key, or the first array of 28x28 images"""
+    with zipfile.ZipFile(path) as archive:
+        names = [name[:-len('.npy')] for name in archive.namelist() if name.endswith('.npy')]
+    if key is not None:
+        if key not in names:
+            raise KeyError(f"Array '{key}' not found in {path}; available: {names}")
+        return key
+    with zipfile.ZipFile(path) as archive:
+        for name in names:
+            with archive.open(f'{name}.npy') as f:
+                shape, _ = _read_array_header(f)
+            if tuple(shape[1:3]) == INPUT_SHAPE[:2]:
+                return name
+    raise ValueError(f"No array of 28x28 images in {path}; pass its key")
+
+
+def _npz_stored_layout(path, name):
+    """Byte offset, shape and dtype of an uncompressed .npz member, or None if it is compressed"""
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(f'{name}.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        signature, name_length, extra_length = ZIP_LOCAL_HEADER.unpack(f.read(ZIP_LOCAL_HEADER.size))
+        if signature != b'PK\x03\x04':
+            raise ValueError(f"Corrupt zip member {name} in {path}")
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        shape, dtype = _read_array_header(f)
+        return f.tell(), shape, dtype
+
+
+def _iter_png_paths(path):
+    """Paths of the .png files under path, in directory order, without listing a directory at once"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield from _iter_png_paths(entry.path)
+            elif entry.name.endswith('.png'):
+                yield entry.path
+
+
+def write_png_listing(path, listing_path, chunk_size=LISTING_CHUNK_SIZE):
+    """Write the sorted .png paths under path to listing_path, one per line; returns the count
+
+    Paths are sorted chunk_size at a time into temporary runs that are then
+    merged, so memory stays flat however many files the directory holds.
+    """
+    listing_path = Path(listing_path)
+    listing_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=listing_path.parent) as spill_dir:
+        runs = []
+        paths = iter(_iter_png_paths(path))
+        while True:
+            chunk = sorted(f'{png}\n' for png in itertools.islice(paths, chunk_size))
+            if not chunk:
+                break
+            runs.append(Path(spill_dir) / f'{len(runs)}.txt')
+            runs[-1].write_text(''.join(chunk))
+
+        count = 0
+        run_files = [open(run) for run in runs]
+        try:
+            with open(listing_path, 'w') as listing:
+                for line in heapq.merge(*run_files):
+                    listing.write(line)
+                    count += 1
+        finally:
+            for run_file in run_files:
+                run_file.close()
+    return count
+
+
+def plan_input(path, key=None, listing_path=None):
+    """Describe an input as (num_images, task_fn, listing_path)
+
+    task_fn(start, batch_size) yields one decode task per batch from image
+    index start. Tasks only describe where the images are, so planning costs
+    no memory whatever the input size. A directory of PNGs is listed to
+    listing_path first, and tasks read their file names back from it.
+    """
+    path = Path(path)
+    if path.is_dir():
+        if listing_path is None:
+            raise ValueError(f"Scoring the PNG directory {path} needs a listing_path for its file names")
+        num_images = write_png_listing(path, listing_path)
+        if not num_images:
+            raise FileNotFoundError(f"No .png files under {path}")
+
+        def png_tasks(start, batch_size):
+            with open(listing_path) as listing:
+                names = (line.rstrip('\n') for line in itertools.islice(listing, start, None))
+                while True:
+                    files = list(itertools.islice(names, batch_size))
+                    if not files:
+                        return
+                    yield ('png', files)
+        return num_images, png_tasks, listing_path
+
+    if path.suffix == '.npy':
+        layout = _npy_layout(path)
+    elif path.suffix == '.npz':
+        name = _npz_member(path, key)
+        layout = _npz_stored_layout(path, name)
+        if layout is None:
+            return _plan_compressed_npz(path, name)
+    else:
+        raise ValueError(f"Unsupported input {path}: expected .npy, .npz or a directory of .png files")
+
+    offset, shape, dtype = layout
+    num_images = shape[0]
+
+    def array_tasks(start, batch_size):
+        for i in range(start, num_images, batch_size):
+            yield ('array', str(path), offset, dtype.str, tuple(shape[1:]), i, min(i + batch_size, num_images))
+    return num_images, array_tasks, None
+
+
+def _plan_compressed_npz(path, name):
+    """Compressed members cannot be memory-mapped, so they are streamed batch by batch here"""
+    with zipfile.ZipFile(path) as archive, archive.open(f'{name}.npy') as f:
+        shape, dtype = _read_array_header(f)
+    row_bytes = int(np.prod(shape[1:])) * dtype.itemsize
+
+    def stream_tasks(start, batch_size):
+        with zipfile.ZipFile(path) as archive, archive.open(f'{name}.npy') as f:
+            _read_array_header(f)
+            f.seek(start * row_bytes, os.SEEK_CUR)
+            for i in range(start, shape[0], batch_size):
+                count = min(batch_size, shape[0] - i)
+                yield ('data', np.frombuffer(f.read(count * row_bytes), dtype=dtype).reshape(count, *shape[1:]))
+    return shape[0], stream_tasks, None
+
+
+def _read_png(path):
+    from PIL import Image
+    with Image.open(path) as image:
+        image = image.convert('L')
+        if image.size != INPUT_SHAPE[:2]:
+            image = image.resize(INPUT_SHAPE[:2])
+        return np.asarray(image, dtype=np.uint8)
+
+
+def decode_batch(task):
+    """Load and normalize one batch to float32 (N, 28, 28, 1); runs in a worker process"""
+    kind = task[0]
+    if kind == 'array':
+        _, path, offset, dtype, row_shape, start, stop = task
+        dtype = np.dtype(dtype)
+        row_bytes = int(np.prod(row_shape)) * dtype.itemsize
+        images = np.memmap(path, dtype=dtype, mode='r', offset=offset + start * row_bytes,
+                           shape=(stop - start, *row_shape))
+    elif kind == 'png':
+        images = np.stack([_read_png(path) for path in task[1]])
+    else:
+        images = task[1]
+
+    batch = np.asarray(images, dtype=np.float32).reshape(-1, *INPUT_SHAPE)
+    # uint8 inputs are scaled; already-normalized floats pass through, as in training
+    if np.dtype(images.dtype) == np.uint8:
+        batch /= 255.0
+    return batch
+
+
+class BulkScorer:
+    """Scores .npy/.npz arrays or PNG directories in fixed-size batches with flat memory
+
+    Decoding runs in a process pool a bounded number of batches ahead of the
+    model. Probabilities and predictions go to memory-mapped .npy files in the
+    output directory, and a checkpoint records how many images are done so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, engine=None, batch_size=None, num_workers=None, prefetch_batches=None,
+                 checkpoint_every=None):
+        scoring_config = config.base.get('batch_scoring', {})
+        self.engine = engine
+        self.batch_size = batch_size or scoring_config.get('batch_size', 1024)
+        self.num_workers = num_workers or scoring_config.get('num_workers') or max(1, (os.cpu_count() or 2) - 1)
+        self.prefetch_batches = prefetch_batches or scoring_config.get('prefetch_batches', 4)
+        self.checkpoint_every = checkpoint_every or scoring_config.get('checkpoint_every', 10)
+
+    def load_engine(self):
+        """The deployed model in the configured serving engine, warmed up at the batch size"""
+        if self.engine is None:
+            from .engines import load_engine
+            serving_config = config.base.get('serving', {})
+            self.engine = load_engine(
+                serving_config.get('engine', 'tf_function'),
+                config.model_paths['deployed'],
+                num_threads=serving_config.get('num_threads'),
+                quantization=serving_config.get('quantization')
+            )
+            self.engine.warmup(self.batch_size)
+        return self.engine
+
+    def _resume_point(self, output_dir, run_info, resume):
+        checkpoint_path = output_dir / CHECKPOINT_NAME
+        if not resume or not checkpoint_path.exists():
+            return 0
+        checkpoint = json.loads(checkpoint_path.read_text())
+        if {k: checkpoint.get(k) for k in run_info} != run_info:
+            print("❌ Checkpoint is for a different input or model, scoring from the start")
+            return 0
+        print(f"✓ Resuming after {checkpoint['images_done']} of {run_info['num_images']} images")
+        return checkpoint['images_done']
+
+    def _write_checkpoint(self, output_dir, run_info, images_done, outputs):
+        for output in outputs:
+            output.flush()
+        # Written to a temporary file and renamed, so a crash never leaves a torn checkpoint
+        staging = output_dir / f'.{CHECKPOINT_NAME}.tmp'
+        staging.write_text(json.dumps({**run_info, 'images_done': images_done}))
+        os.replace(staging, output_dir / CHECKPOINT_NAME)
+
+    def score(self, input_path, output_dir, key=None, resume=True):
+        """Score every image of input_path into output_dir and return throughput stats"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        # Directory inputs record which file each output row came from
+        num_images, task_fn, _ = plan_input(input_path, key, listing_path=output_dir / FILES_NAME)
+        engine = self.load_engine()
+        run_info = {'input': str(Path(input_path).resolve()), 'key': key,
+                    'num_images': num_images, 'model_version': engine.version}
+
+        start_index = self._resume_point(output_dir, run_info, resume)
+        mode = 'r+' if start_index else 'w+'
+        probabilities = np.lib.format.open_memmap(
+            output_dir / PROBABILITIES_NAME, mode=mode, dtype=np.float32, shape=(num_images, 10)
+        )
+        predictions = np.lib.format.open_memmap(
+            output_dir / PREDICTIONS_NAME, mode=mode, dtype=np.int32, shape=(num_images,)
+        )
+
+        stats = {'images': 0, 'decode_wait_s': 0.0, 'model_s': 0.0}
+        index = start_index
+        start = time.perf_counter()
+        # Spawned workers do not inherit the parent's TensorFlow runtime
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(self.num_workers, mp_context=context) as pool:
+            tasks = task_fn(start_index, self.batch_size)
+            pending = deque()
+            for batch_number, task in enumerate(tasks):
+                # Bounded read-ahead: at most prefetch_batches decoded batches exist at once
+                pending.append(pool.submit(decode_batch, task))
+                if len(pending) < self.prefetch_batches:
+                    continue
+                index = self._score_next(pending, engine, index, probabilities, predictions, stats)
+                if batch_number % self.checkpoint_every == 0:
+                    self._write_checkpoint(output_dir, run_info, index, (probabilities, predictions))
+                    self._report_progress(index, num_images, stats, start)
+            while pending:
+                index = self._score_next(pending, engine, index, probabilities, predictions, stats)
+
+        self._write_checkpoint(output_dir, run_info, index, (probabilities, predictions))
+        elapsed = time.perf_counter() - start
+        summary = {
+            **run_info,
+            'images_scored': stats['images'],
+            'seconds': elapsed,
+            'images_per_sec': stats['images'] / elapsed if elapsed else 0.0,
+            'decode_wait_s': stats['decode_wait_s'],
+            'model_s': stats['model_s'],
+            'batch_size': self.batch_size,
+            'num_workers': self.num_workers
+        }
+        (output_dir / SUMMARY_NAME).write_text(json.dumps(summary, indent=2))
+        print(f"✓ Scored {stats['images']} images in {elapsed:.1f}s ({summary['images_per_sec']:.0f} images/sec, "
+              f"waited {stats['decode_wait_s']:.1f}s on decoding, {stats['model_s']:.1f}s in the model)")
+        return summary
+
+    def _score_next(self, pending, engine, index, probabilities, predictions, stats):
+        """Predict the oldest decoded batch and write it at index; returns the next index"""
+        wait_start = time.perf_counter()
+        batch = pending.popleft().result()
+        model_start = time.perf_counter()
+        count = len(batch)
+        if count < self.batch_size:
+            # Pad the final batch so every model call has the same shape
+            batch = np.concatenate([batch, np.zeros((self.batch_size - count, *INPUT_SHAPE), dtype=np.float32)])
+        batch_probabilities = engine.predict(batch)[:count]
+        probabilities[index:index + count] = batch_probabilities
+        predictions[index:index + count] = batch_probabilities.argmax(axis=1)
+        stats['decode_wait_s'] += model_start - wait_start
+        stats['model_s'] += time.perf_counter() - model_start
+        stats['images'] += count
+        return index + count
+
+    @staticmethod
+    def _report_progress(index, num_images, stats, start):
+        elapsed = time.perf_counter() - start
+        print(f"  {index}/{num_images} images, {stats['images'] / elapsed:.0f} images/sec")
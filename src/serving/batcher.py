@@ -0,0 +1,141 @@
+import asyncio
+import inspect
+import numpy as np
+
+
+class QueueFullError(Exception):
+    """Raised when the batcher queue has reached its configured depth"""
+
+
+class MicroBatcher:
+    """Coalesce concurrent prediction requests into batched model calls"""
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=5.0, max_queue_size=1024):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self._queue = None
+        self._worker = None
+        self._in_flight = set()
+        self.stats = {
+            'requests_total': 0,
+            'batches_total': 0,
+            'batched_requests_total': 0,
+            'rejected_total': 0,
+            'errors_total': 0
+        }
+
+    async def start(self):
+        """Start the background batching loop"""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+        print(f"✓ Micro-batcher started (batch={self.max_batch_size}, wait={self.max_wait * 1000:.1f}ms)")
+
+    async def stop(self):
+        """Stop the batching loop and fail any requests still queued"""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    async def submit(self, image):
+        """Queue a single preprocessed image and wait for its probabilities"""
+        if self._worker is None:
+            raise RuntimeError("Batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((image, future))
+        except asyncio.QueueFull:
+            self.stats['rejected_total'] += 1
+            raise QueueFullError(f"Prediction queue is full ({self.max_queue_size} pending)")
+
+        self.stats['requests_total'] += 1
+        return await future
+
+    async def _run(self):
+        """Collect requests until the batch is full or the wait budget expires"""
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+
+                while len(batch) < self.max_batch_size:
+                    # Take whatever is already queued before waiting on the clock
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                self._dispatch(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Requests already taken off the queue would otherwise never be answered;
+            # stop() waits for this last batch with the others in flight
+            if batch:
+                self._dispatch(batch)
+            raise
+
+    def _dispatch(self, batch):
+        # Run without waiting so the next batch can form while this one runs
+        task = asyncio.create_task(self._process_batch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _process_batch(self, batch):
+        """Run one batch through the model and fan results back out"""
+        images = np.stack([image for image, _ in batch])
+        self.stats['batches_total'] += 1
+        self.stats['batched_requests_total'] += len(batch)
+
+        try:
+            predictions = self.predict_fn(images)
+            if inspect.isawaitable(predictions):
+                predictions = await predictions
+        except Exception as e:
+            self.stats['errors_total'] += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), probabilities in zip(batch, predictions):
+            # The client may have disconnected while the batch was running
+            if not future.done():
+                future.set_result(probabilities)
+
+    def get_stats(self) -> dict:
+        """Get batching counters and current configuration"""
+        batches = self.stats['batches_total']
+        return {
+            **self.stats,
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'batches_in_flight': len(self._in_flight),
+            'avg_batch_size': self.stats['batched_requests_total'] / batches if batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'max_queue_size': self.max_queue_size
+        }
@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+
+class CacheBackend:
+    """Storage interface for cached prediction probabilities"""
+
+    # Backends doing file or network I/O are called from a worker thread, not the event loop
+    blocking = False
+    # Backends other processes read and write are never cleared by one of them
+    shared = False
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Store a value, returning the number of entries evicted to make room"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class InMemoryBackend(CacheBackend):
+    """Per-process LRU cache with a TTL and a bounded number of entries"""
+
+    def __init__(self, max_entries=10000, ttl_s=3600.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    """File-backed cache shared by every worker process on the host
+
+    A local stand-in for a shared cache service: uvicorn workers pointing
+    at the same file see each other's entries.
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(self, path, max_entries=10000, ttl_s=3600.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)"
+        )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM predictions WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE predictions SET accessed_at = ? WHERE key = ?", (now, key))
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                (key, np.asarray(value, dtype=np.float32).tobytes(), now + self.ttl_s, now)
+            )
+            overflow = self._connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_entries
+            if overflow <= 0:
+                return 0
+            self._connection.execute(
+                "DELETE FROM predictions WHERE key IN "
+                "(SELECT key FROM predictions ORDER BY accessed_at LIMIT ?)", (overflow,)
+            )
+            return overflow
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM predictions")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+
+class PredictionCache:
+    """Cache of prediction probabilities keyed by image content and model version"""
+
+    def __init__(self, backend, model_version=None):
+        self.backend = backend
+        self.model_version = model_version
+        self.stats = {
+            'hits_total': 0,
+            'misses_total': 0,
+            'evictions_total': 0,
+            'invalidations_total': 0
+        }
+
+    def key(self, image: np.ndarray, model_version=None) -> str:
+        """Hash the normalized float32 image together with the model version"""
+        digest = hashlib.blake2b(np.ascontiguousarray(image, dtype=np.float32).tobytes(), digest_size=16)
+        return f"{model_version or self.model_version}:{digest.hexdigest()}"
+
+    def get(self, image, model_version=None):
+        value = self.backend.get(self.key(image, model_version))
+        if value is None:
+            self.stats['misses_total'] += 1
+        else:
+            self.stats['hits_total'] += 1
+        return value
+
+    def put(self, image, probabilities, model_version=None):
+        """Store probabilities under the version of the model that produced them"""
+        # Copy so a cached row does not keep the whole batch output alive
+        value = np.array(probabilities, dtype=np.float32)
+        self.stats['evictions_total'] += self.backend.set(self.key(image, model_version), value)
+
+    def get_many(self, images, model_version=None):
+        """Cached probabilities for each image, None for misses"""
+        return [self.get(image, model_version) for image in images]
+
+    def put_many(self, images, probabilities, model_version=None):
+        for image, row in zip(images, probabilities):
+            self.put(image, row, model_version)
+
+    async def run(self, fn, *args):
+        """Call one of the methods above, in a worker thread if the backend blocks"""
+        if self.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def set_model_version(self, model_version):
+        """Drop cached results when a different model is loaded
+
+        Keys carry the version, so clearing only reclaims space held by the old
+        model. Shared backends are left alone: other workers may already have
+        written entries for the new version, and the old version's entries,
+        no longer read, are the first to expire or be evicted.
+        """
+        if model_version == self.model_version:
+            return
+        previous_version, self.model_version = self.model_version, model_version
+        if previous_version is not None:
+            self.stats['invalidations_total'] += 1
+            if not self.backend.shared:
+                self.backend.clear()
+
+    def get_stats(self) -> dict:
+        lookups = self.stats['hits_total'] + self.stats['misses_total']
+        return {
+            **self.stats,
+            'entries': len(self.backend),
+            'hit_rate': self.stats['hits_total'] / lookups if lookups else 0.0,
+            'model_version': self.model_version
+        }
+
+
+def create_cache_backend(name, max_entries=10000, ttl_s=3600.0, path=None):
+    """Build a cache backend by name"""
+    if name == 'memory':
+        return InMemoryBackend(max_entries=max_entries, ttl_s=ttl_s)
+    if name == 'sqlite':
+        if path is None:
+            raise ValueError("The sqlite cache backend requires a path")
+        return SQLiteBackend(path, max_entries=max_entries, ttl_s=ttl_s)
+    raise ValueError(f"Unknown cache backend '{name}'. Choose from: ['memory', 'sqlite']")
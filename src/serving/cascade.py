@@ -0,0 +1,127 @@
+import hashlib
+import json
+from pathlib import Path
+import numpy as np
+from .engines import InferenceEngine, model_version
+
+FIRST_STAGE_NAME = 'cascade_first_stage.npz'
+CASCADE_CONFIG_NAME = 'cascade.json'
+
+
+class DenseEngine(InferenceEngine):
+    """NumPy backend for a stack of dense layers: ReLU hidden layers and a softmax output
+
+    Small enough that a single matrix product per layer costs less than
+    dispatching one TensorFlow call, which is what makes it a useful first stage.
+    """
+
+    name = 'dense'
+
+    def __init__(self, weights, biases):
+        self.weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def from_keras(cls, model):
+        """Copy the kernels and biases of a model's Dense layers, in order"""
+        import tensorflow as tf
+        layers = [layer for layer in model.layers if isinstance(layer, tf.keras.layers.Dense)]
+        return cls([layer.kernel.numpy() for layer in layers], [layer.bias.numpy() for layer in layers])
+
+    @classmethod
+    def from_path(cls, model_path):
+        with np.load(model_path) as arrays:
+            num_layers = len([name for name in arrays.files if name.startswith('weights_')])
+            engine = cls([arrays[f'weights_{i}'] for i in range(num_layers)],
+                         [arrays[f'biases_{i}'] for i in range(num_layers)])
+        engine.version = model_version(model_path)
+        return engine
+
+    def save(self, model_path):
+        arrays = {}
+        for i, (weights, biases) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'weights_{i}'] = weights
+            arrays[f'biases_{i}'] = biases
+        np.savez(model_path, **arrays)
+        return Path(model_path)
+
+    def predict(self, images):
+        activations = np.asarray(images, dtype=np.float32).reshape(len(images), -1)
+        for weights, biases in zip(self.weights[:-1], self.biases[:-1]):
+            activations = np.maximum(activations @ weights + biases, 0.0)
+        logits = activations @ self.weights[-1] + self.biases[-1]
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+class CascadeEngine(InferenceEngine):
+    """Answer from a cheap first stage when it is confident, escalating the rest
+
+    Images whose top first-stage probability is below the threshold are sent
+    to the full model together in one call, so a batch costs at most one
+    first-stage pass and one smaller full-model pass.
+    """
+
+    name = 'cascade'
+
+    def __init__(self, first_stage, full_model, threshold):
+        self.first_stage = first_stage
+        self.full_model = full_model
+        self.threshold = threshold
+        self.version = cascade_version(full_model.version, first_stage.version, threshold)
+        self.stats = {'images_total': 0, 'escalated_total': 0}
+
+    def warmup(self, batch_size=1):
+        """Warm up both stages; zero images alone would never reach the full model"""
+        return self.full_model.warmup(batch_size) + self.first_stage.warmup(batch_size)
+
+    def predict(self, images):
+        probabilities = self.first_stage.predict(images)
+        escalate = np.flatnonzero(probabilities.max(axis=1) < self.threshold)
+        if len(escalate):
+            probabilities[escalate] = self.full_model.predict(images[escalate])
+        self.stats['images_total'] += len(images)
+        self.stats['escalated_total'] += len(escalate)
+        return probabilities
+
+    def get_stats(self) -> dict:
+        images = self.stats['images_total']
+        return {
+            **self.stats,
+            'full_model_version': self.full_model.version,
+            'first_stage_version': self.first_stage.version,
+            'threshold': self.threshold,
+            'escalated_fraction': self.stats['escalated_total'] / images if images else None
+        }
+
+
+def cascade_version(full_model_version, first_stage_version, threshold):
+    """Short hash identifying both stages and the threshold, so cached predictions change with any of them"""
+    digest = hashlib.sha256(f"{full_model_version}:{first_stage_version}:{threshold!r}".encode())
+    return digest.hexdigest()[:12]
+
+
+def calibrated_threshold(model_dir):
+    """Threshold the training pipeline calibrated for the models in model_dir
+
+    None when calibration found no threshold within the accuracy budget.
+    """
+    cascade_config = json.loads((Path(model_dir) / CASCADE_CONFIG_NAME).read_text())
+    return cascade_config['threshold'] if cascade_config.get('enabled', True) else None
+
+
+def load_cascade(full_model, model_dir, threshold=None):
+    """Wrap full_model in a cascade with the first stage and calibrated threshold in model_dir
+
+    Returns full_model itself when the saved cascade is disabled and no
+    threshold is given.
+    """
+    model_dir = Path(model_dir)
+    if threshold is None:
+        threshold = calibrated_threshold(model_dir)
+        if threshold is None:
+            print("❌ Cascade was disabled at calibration; serving the full model alone")
+            return full_model
+    first_stage = DenseEngine.from_path(model_dir / FIRST_STAGE_NAME)
+    return CascadeEngine(first_stage, full_model, threshold)
@@ -0,0 +1,225 @@
+import hashlib
+import threading
+import time
+from pathlib import Path
+import numpy as np
+
+KERAS_MODEL_NAME = 'mnist_cnn_model.keras'
+TFLITE_MODEL_NAME = 'mnist_cnn_model.tflite'
+
+QUANTIZATION_MODES = ('dynamic', 'int8')
+
+INPUT_SHAPE = (28, 28, 1)
+
+
+class InferenceEngine:
+    """Base class for serving backends that map image batches to probabilities"""
+
+    name = None
+    version = None
+
+    def predict(self, images: np.ndarray) -> np.ndarray:
+        """Predict class probabilities for a float32 (N, 28, 28, 1) batch"""
+        raise NotImplementedError
+
+    def warmup(self, batch_size=1):
+        """Run a dummy batch so the first request does not pay tracing costs"""
+        start = time.perf_counter()
+        self.predict(np.zeros((batch_size, *INPUT_SHAPE), dtype='float32'))
+        return time.perf_counter() - start
+
+
+class KerasEngine(InferenceEngine):
+    """Reference backend serving through tf.keras.Model.predict"""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        self.model = model
+
+    @classmethod
+    def from_path(cls, model_path):
+        import tensorflow as tf
+        return cls(tf.keras.models.load_model(model_path))
+
+    def predict(self, images):
+        return self.model.predict(images, verbose=0)
+
+
+class TFFunctionEngine(InferenceEngine):
+    """Backend calling a traced concrete function with a fixed input signature"""
+
+    name = 'tf_function'
+
+    def __init__(self, model):
+        import tensorflow as tf
+        self.model = model
+        self._tf = tf
+        # Fixed per-image shape with a dynamic batch dimension, so one trace serves every batch size
+        self._predict_fn = tf.function(
+            lambda images: model(images, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, *INPUT_SHAPE), dtype=tf.float32)]
+        ).get_concrete_function()
+
+    @classmethod
+    def from_path(cls, model_path):
+        import tensorflow as tf
+        return cls(tf.keras.models.load_model(model_path))
+
+    def predict(self, images):
+        images = np.ascontiguousarray(images, dtype=np.float32)
+        return self._predict_fn(self._tf.constant(images)).numpy()
+
+
+class TFLiteEngine(InferenceEngine):
+    """Backend running an exported TFLite flatbuffer on the CPU interpreter"""
+
+    name = 'tflite'
+
+    def __init__(self, model_content=None, model_path=None, num_threads=None):
+        interpreter_cls = _load_tflite_interpreter()
+        self.interpreter = interpreter_cls(
+            model_content=model_content,
+            model_path=str(model_path) if model_path else None,
+            num_threads=num_threads
+        )
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = None
+        # The interpreter owns its tensors, so concurrent executor threads must take turns
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_path(cls, model_path, num_threads=None):
+        return cls(model_path=model_path, num_threads=num_threads)
+
+    def _resize(self, batch_size):
+        """Reallocate tensors only when the batch size changes"""
+        if batch_size != self._batch_size:
+            self.interpreter.resize_tensor_input(self._input['index'], [batch_size, *INPUT_SHAPE])
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch_size
+
+    def predict(self, images):
+        images = _quantize(np.ascontiguousarray(images, dtype=np.float32), self._input)
+        with self._lock:
+            self._resize(len(images))
+            self.interpreter.set_tensor(self._input['index'], images)
+            self.interpreter.invoke()
+            return _dequantize(self.interpreter.get_tensor(self._output['index']), self._output)
+
+
+def _quantize(values, details):
+    """Map float inputs onto an integer input tensor's quantization grid"""
+    if details['dtype'] == np.float32:
+        return values
+    scale, zero_point = details['quantization']
+    info = np.iinfo(details['dtype'])
+    return np.clip(np.round(values / scale + zero_point), info.min, info.max).astype(details['dtype'])
+
+
+def _dequantize(values, details):
+    """Return float probabilities from a possibly integer output tensor"""
+    if details['dtype'] == np.float32:
+        return values.copy()
+    scale, zero_point = details['quantization']
+    return (values.astype(np.float32) - zero_point) * scale
+
+
+def _load_tflite_interpreter():
+    """Prefer the standalone LiteRT runtimes, falling back to full TensorFlow"""
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def model_version(model_path):
+    """Short content hash identifying a model artifact"""
+    digest = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def tflite_model_name(quantization=None):
+    """File name of the TFLite artifact for a quantization mode"""
+    if quantization is None:
+        return TFLITE_MODEL_NAME
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization '{quantization}'. Choose from: {QUANTIZATION_MODES}")
+    return f"{Path(TFLITE_MODEL_NAME).stem}_{quantization}.tflite"
+
+
+def export_tflite(model, output_path, quantization=None, representative_data=None):
+    """Convert a Keras model to a TFLite flatbuffer next to the deployed model
+
+    quantization=None keeps float32 weights, 'dynamic' stores int8 weights
+    with float activations, and 'int8' quantizes weights and activations
+    using representative_data (float32 images) for calibration.
+    """
+    import tensorflow as tf
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+
+    if quantization in QUANTIZATION_MODES:
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quantization is not None:
+        raise ValueError(f"Unknown quantization '{quantization}'. Choose from: {QUANTIZATION_MODES}")
+
+    if quantization == 'int8':
+        if representative_data is None:
+            raise ValueError("Full int8 quantization requires representative_data for calibration")
+
+        def representative_dataset():
+            for image in representative_data:
+                yield [image[np.newaxis].astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+    tflite_model = converter.convert()
+
+    output_path = Path(output_path)
+    output_path.write_bytes(tflite_model)
+    print(f"✓ TFLite model exported to: {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+    return output_path
+
+
+ENGINES = {
+    KerasEngine.name: KerasEngine,
+    TFFunctionEngine.name: TFFunctionEngine,
+    TFLiteEngine.name: TFLiteEngine
+}
+
+
+def load_engine(name, model_dir, num_threads=None, quantization=None):
+    """Load the named serving backend from a model directory"""
+    model_dir = Path(model_dir)
+    if name not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{name}'. Choose from: {sorted(ENGINES)}")
+    if quantization is not None and name != TFLiteEngine.name:
+        raise ValueError(f"Quantized models are only served by the '{TFLiteEngine.name}' engine")
+
+    if name == TFLiteEngine.name:
+        model_path = model_dir / tflite_model_name(quantization)
+    else:
+        model_path = model_dir / KERAS_MODEL_NAME
+
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model not found at {model_path}")
+
+    if name == TFLiteEngine.name:
+        engine = TFLiteEngine.from_path(model_path, num_threads=num_threads)
+    else:
+        engine = ENGINES[name].from_path(model_path)
+    engine.version = model_version(model_path)
+    return engine
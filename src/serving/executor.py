@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when too many inference calls are already pending"""
+
+
+class InferenceTimeoutError(Exception):
+    """Raised when an inference call exceeds its time budget"""
+
+
+class InferenceExecutor:
+    """Bounded thread pool that keeps CPU-bound inference off the event loop"""
+
+    def __init__(self, max_workers=1, max_pending=64, timeout_s=5.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_s = timeout_s
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._pending = 0
+        self.stats = {
+            'calls_total': 0,
+            'rejected_total': 0,
+            'timeouts_total': 0
+        }
+
+    async def run(self, fn, *args):
+        """Run fn(*args) in the pool, rejecting when saturated"""
+        if self._pending >= self.max_pending:
+            self.stats['rejected_total'] += 1
+            raise ExecutorSaturatedError(f"Inference executor saturated ({self.max_pending} pending)")
+
+        self._pending += 1
+        self.stats['calls_total'] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, fn, *args)
+            # A timed-out call keeps its worker thread until the model returns
+            return await asyncio.wait_for(future, self.timeout_s)
+        except asyncio.TimeoutError:
+            self.stats['timeouts_total'] += 1
+            raise InferenceTimeoutError(f"Inference exceeded {self.timeout_s:.2f}s")
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        """Stop accepting work and release the worker threads"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        """Get executor counters and current configuration"""
+        return {
+            **self.stats,
+            'pending': self._pending,
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'timeout_s': self.timeout_s
+        }
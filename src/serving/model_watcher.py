@@ -0,0 +1,163 @@
+import asyncio
+from pathlib import Path
+from .cascade import CASCADE_CONFIG_NAME, FIRST_STAGE_NAME, calibrated_threshold, cascade_version, load_cascade
+from .engines import ENGINES, KERAS_MODEL_NAME, TFLiteEngine, load_engine, model_version, tflite_model_name
+
+
+class DirectoryModelSource:
+    """Model source that follows the artifact in the deployed models directory
+
+    With cascade on, the loaded engine is the cascade built from the first
+    stage and threshold saved beside the model, and the version covers all
+    of them, so retraining either stage triggers a reload.
+    """
+
+    def __init__(self, model_dir, engine_name='keras', num_threads=None, quantization=None,
+                 cascade=False, cascade_threshold=None):
+        self.model_dir = Path(model_dir)
+        self.engine_name = engine_name
+        self.num_threads = num_threads
+        self.quantization = quantization
+        self.cascade = cascade
+        self.cascade_threshold = cascade_threshold
+        if engine_name == TFLiteEngine.name:
+            self.model_path = self.model_dir / tflite_model_name(quantization)
+        else:
+            self.model_path = self.model_dir / KERAS_MODEL_NAME
+        self._signature = None
+        self._version = None
+
+    def _artifacts(self):
+        artifacts = [self.model_path]
+        if self.cascade:
+            artifacts.append(self.model_dir / FIRST_STAGE_NAME)
+            if self.cascade_threshold is None:
+                artifacts.append(self.model_dir / CASCADE_CONFIG_NAME)
+        return artifacts
+
+    def current_version(self):
+        """Content hash of the artifacts, recomputed only when their mtime or size changes"""
+        artifacts = self._artifacts()
+        if not all(path.exists() for path in artifacts):
+            return None
+        signature = tuple((stat.st_mtime_ns, stat.st_size) for stat in (path.stat() for path in artifacts))
+        if signature != self._signature:
+            self._signature = signature
+            self._version = model_version(self.model_path)
+            threshold = self.cascade_threshold
+            if self.cascade and threshold is None:
+                threshold = calibrated_threshold(self.model_dir)
+            # A cascade disabled at calibration serves, and is versioned as, the full model
+            if self.cascade and threshold is not None:
+                self._version = cascade_version(
+                    self._version, model_version(self.model_dir / FIRST_STAGE_NAME), threshold
+                )
+        return self._version
+
+    def load(self):
+        engine = load_engine(
+            self.engine_name, self.model_dir,
+            num_threads=self.num_threads, quantization=self.quantization
+        )
+        if self.cascade:
+            engine = load_cascade(engine, self.model_dir, threshold=self.cascade_threshold)
+        return engine
+
+
+class RegistryModelSource:
+    """Model source that follows the latest version in an MLflow registry stage"""
+
+    def __init__(self, model_name='mnist-cnn', stage='Production', engine_name='keras', registry=None):
+        if engine_name == TFLiteEngine.name:
+            raise ValueError("Registry models are Keras models; use the 'keras' or 'tf_function' engine")
+        if registry is None:
+            from ..mlflow_pipeline.registry import ModelRegistry
+            registry = ModelRegistry()
+        self.registry = registry
+        self.model_name = model_name
+        self.stage = stage
+        self.engine_name = engine_name
+
+    def current_version(self):
+        latest = self.registry.get_latest_version(self.model_name, self.stage)
+        return f"{self.model_name}/{latest.version}" if latest else None
+
+    def load(self):
+        latest = self.registry.get_latest_version(self.model_name, self.stage)
+        if latest is None:
+            raise FileNotFoundError(f"No '{self.model_name}' version in stage {self.stage}")
+        engine = ENGINES[self.engine_name](self.registry.load_model_version(self.model_name, latest.version))
+        engine.version = f"{self.model_name}/{latest.version}"
+        return engine
+
+
+class ModelWatcher:
+    """Poll a model source and hot-swap new versions into the API"""
+
+    def __init__(self, source, activate_fn, interval_s=10.0, warmup_batch_sizes=(1,)):
+        self.source = source
+        self.activate_fn = activate_fn
+        self.interval_s = interval_s
+        # The same sizes startup warms, so batched requests after a swap skip tracing too
+        self.warmup_batch_sizes = list(warmup_batch_sizes)
+        self.active_version = None
+        # Not retried until the source reports a different version
+        self.failed_version = None
+        self._task = None
+        self.stats = {
+            'reloads_total': 0,
+            'reload_failures_total': 0,
+            'last_warmup_s': None
+        }
+
+    async def start(self, active_version=None):
+        """Start polling in the background"""
+        self.active_version = active_version
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"✓ Model watcher started (every {self.interval_s:.0f}s)")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_s)
+            await self.check()
+
+    async def check(self):
+        """Load, warm up and activate the source's model if its version changed"""
+        version = None
+        try:
+            version = await asyncio.to_thread(self.source.current_version)
+            if version is None or version in (self.active_version, self.failed_version):
+                return False
+
+            new_engine = await asyncio.to_thread(self.source.load)
+            # Pay first-call costs before any request can reach the new model
+            warmup_s = await asyncio.to_thread(self._warmup, new_engine)
+        except Exception as e:
+            self.stats['reload_failures_total'] += 1
+            self.failed_version = version
+            print(f"❌ Model reload failed, keeping version {self.active_version}: {e}")
+            return False
+
+        self.activate_fn(new_engine)
+        self.active_version = new_engine.version
+        self.stats['reloads_total'] += 1
+        self.stats['last_warmup_s'] = warmup_s
+        print(f"✓ Model hot-swapped to version {new_engine.version} (warm-up {warmup_s * 1000:.1f}ms)")
+        return True
+
+    def _warmup(self, new_engine):
+        return sum(new_engine.warmup(batch_size) for batch_size in self.warmup_batch_sizes)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, 'active_version': self.active_version, 'failed_version': self.failed_version}
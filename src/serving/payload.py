@@ -0,0 +1,85 @@
+import io
+import numpy as np
+
+IMAGE_SHAPE = (28, 28)
+IMAGE_SIZE = IMAGE_SHAPE[0] * IMAGE_SHAPE[1]
+
+RAW_CONTENT_TYPE = "application/octet-stream"
+NPY_CONTENT_TYPE = "application/x-npy"
+
+
+class PayloadError(ValueError):
+    """Raised when a request body cannot be decoded into images"""
+
+
+def decode_raw(body: bytes) -> np.ndarray:
+    """Decode a raw uint8 body of N*28*28 bytes without copying"""
+    if len(body) == 0 or len(body) % IMAGE_SIZE != 0:
+        raise PayloadError(f"Raw payload must be a multiple of {IMAGE_SIZE} bytes, got {len(body)}")
+    return np.frombuffer(body, dtype=np.uint8).reshape(-1, *IMAGE_SHAPE)
+
+
+def decode_npy(body: bytes) -> np.ndarray:
+    """Decode a .npy body, viewing the data section in place"""
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    except ValueError as e:
+        raise PayloadError(f"Invalid .npy payload: {e}")
+
+    if dtype.hasobject or fortran_order:
+        raise PayloadError("Only C-ordered numeric .npy arrays are supported")
+
+    count = int(np.prod(shape))
+    offset = stream.tell()
+    if len(body) - offset != count * dtype.itemsize:
+        raise PayloadError("Truncated .npy payload")
+
+    images = np.frombuffer(body, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return _check_shape(images)
+
+
+def decode_json(images: list) -> np.ndarray:
+    """Decode a JSON list of flattened or 28x28 images"""
+    try:
+        array = np.asarray(images, dtype=np.float32)
+    except (TypeError, ValueError) as e:
+        raise PayloadError(f"Invalid image list: {e}")
+    if array.ndim == 2 and array.shape[1] == IMAGE_SIZE:
+        array = array.reshape(-1, *IMAGE_SHAPE)
+    return _check_shape(array)
+
+
+def decode_images(body: bytes, content_type: str) -> np.ndarray:
+    """Decode a binary request body based on its content type"""
+    media_type = (content_type or RAW_CONTENT_TYPE).split(';')[0].strip().lower()
+    if media_type == NPY_CONTENT_TYPE:
+        return decode_npy(body)
+    if media_type == RAW_CONTENT_TYPE:
+        return decode_raw(body)
+    raise PayloadError(f"Unsupported content type: {media_type}")
+
+
+def preprocess_images(images: np.ndarray) -> np.ndarray:
+    """Scale pixel values to [0, 1] and add the channel axis for the CNN"""
+    return (images.astype('float32') / 255.0).reshape(-1, *IMAGE_SHAPE, 1)
+
+
+def encode_npy(array: np.ndarray) -> bytes:
+    """Serialize an array as .npy bytes"""
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _check_shape(images: np.ndarray) -> np.ndarray:
+    """Accept (N, 28, 28) or (N, 28, 28, 1) image batches"""
+    if images.ndim == 4 and images.shape[-1] == 1:
+        images = images[..., 0]
+    if images.ndim != 3 or images.shape[1:] != IMAGE_SHAPE or len(images) == 0:
+        raise PayloadError(f"Expected images of shape (N, 28, 28), got {images.shape}")
+    return images
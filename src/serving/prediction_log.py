@@ -0,0 +1,204 @@
+import os
+import random
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+import numpy as np
+
+LOG_SUFFIX = '.plog'
+LOG_MAGIC = b'MNISTPL'
+LOG_VERSION = 1
+# Magic, format version and record size, so readers can reject files they do not understand
+LOG_HEADER = struct.Struct('<7sBI')
+MODEL_VERSION_BYTES = 16
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('latency_ms', '<f4'),
+    ('prediction', 'u1'),
+    ('confidence', '<f4'),
+    ('probabilities', '<f2', (10,)),
+    ('model_version', f'S{MODEL_VERSION_BYTES}'),
+    ('pixels', 'u1', (784,))
+])
+
+
+class PredictionLog:
+    """Background writer appending served predictions to rotating binary log files
+
+    log() only samples and appends a reference to a bounded deque, so the
+    request path pays a few microseconds. A writer thread turns queued
+    entries into fixed-size records (837 bytes, pixels as uint8) and writes
+    them in batches. Files rotate once they reach max_file_bytes; when the
+    queue is full, new entries are dropped and counted.
+    """
+
+    def __init__(self, log_dir, sample_rate=1.0, max_queue_size=10000, batch_size=256,
+                 flush_interval_s=1.0, max_file_bytes=64 * 2 ** 20, max_files=None):
+        self.log_dir = Path(log_dir)
+        self.sample_rate = sample_rate
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+        self._file_bytes = 0
+        self._sequence = 0
+        self._prefix = f"predictions-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.stats = {
+            'logged_total': 0,
+            'sampled_out_total': 0,
+            'dropped_total': 0,
+            'records_written_total': 0,
+            'files_rotated_total': 0
+        }
+
+    def log(self, images, probabilities, model_version, latency_s):
+        """Queue one request's images (0-255, any dtype) and probabilities; never blocks"""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.stats['sampled_out_total'] += 1
+            return False
+        if len(self._queue) >= self.max_queue_size:
+            self.stats['dropped_total'] += 1
+            return False
+        # Conversion happens on the writer thread; the arrays are not modified after the response
+        self._queue.append((time.time(), images, probabilities, model_version, latency_s))
+        self.stats['logged_total'] += 1
+        if len(self._queue) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+            self._thread.start()
+            print(f"✓ Prediction log started ({self.log_dir}, sample_rate={self.sample_rate})")
+
+    def stop(self):
+        """Write everything still queued and close the current file"""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Encode and write all queued entries; returns the number of records written"""
+        entries = []
+        while self._queue:
+            entries.append(self._queue.popleft())
+        if not entries:
+            return 0
+
+        records = encode_records(entries)
+        for start in range(0, len(records), self.batch_size):
+            self._write(records[start:start + self.batch_size])
+        self.stats['records_written_total'] += len(records)
+        return len(records)
+
+    def _write(self, records):
+        if self._file is None or self._file_bytes + records.nbytes > self.max_file_bytes:
+            self._rotate()
+        self._file.write(records.tobytes())
+        self._file.flush()
+        self._file_bytes += records.nbytes
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self.stats['files_rotated_total'] += 1
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        path = self.log_dir / f"{self._prefix}-{self._sequence:05d}{LOG_SUFFIX}"
+        self._sequence += 1
+        self._file = open(path, 'wb')
+        self._file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, RECORD_DTYPE.itemsize))
+        self._file_bytes = LOG_HEADER.size
+        if self.max_files:
+            # Other workers' files share log_dir and may still be open, so only prune our own
+            own_files = [p for p in log_files(self.log_dir) if p.name.startswith(f"{self._prefix}-")]
+            for old in own_files[:-self.max_files]:
+                old.unlink()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, 'queue_depth': len(self._queue), 'sample_rate': self.sample_rate}
+
+
+def encode_records(entries):
+    """Fixed-size records from queued (timestamp, images, probabilities, version, latency) entries"""
+    counts = [len(images) for _, images, _, _, _ in entries]
+    records = np.zeros(sum(counts), dtype=RECORD_DTYPE)
+    row = 0
+    for (timestamp, images, probabilities, model_version, latency_s), count in zip(entries, counts):
+        rows = slice(row, row + count)
+        pixels = np.asarray(images).reshape(count, -1)
+        if pixels.dtype != np.uint8:
+            pixels = np.clip(np.rint(pixels), 0, 255).astype(np.uint8)
+        probabilities = np.asarray(probabilities, dtype=np.float32).reshape(count, -1)
+        records['timestamp'][rows] = timestamp
+        records['latency_ms'][rows] = latency_s * 1000.0
+        records['prediction'][rows] = probabilities.argmax(axis=1)
+        records['confidence'][rows] = probabilities.max(axis=1)
+        records['probabilities'][rows] = probabilities
+        records['model_version'][rows] = str(model_version).encode()[:MODEL_VERSION_BYTES]
+        records['pixels'][rows] = pixels
+        row += count
+    return records
+
+
+def log_files(path):
+    """Log files under a directory, oldest first, or the single file given"""
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    return sorted(path.glob(f'*{LOG_SUFFIX}'), key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+
+def read_log_file(path):
+    """Memory-map the complete records of one log file"""
+    with open(path, 'rb') as f:
+        header = f.read(LOG_HEADER.size)
+    if len(header) < LOG_HEADER.size:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    magic, version, record_size = LOG_HEADER.unpack(header)
+    if magic != LOG_MAGIC or version != LOG_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {LOG_VERSION} prediction log")
+    # A crash can leave a partial record at the end of the newest file
+    count = (Path(path).stat().st_size - LOG_HEADER.size) // record_size
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=LOG_HEADER.size, shape=(count,))
+
+
+def iter_prediction_log(path):
+    """Record arrays of every log file under path, oldest first"""
+    for log_file in log_files(path):
+        records = read_log_file(log_file)
+        if len(records):
+            yield records
+
+
+def read_prediction_log(path, since=None):
+    """All logged records under path as one array, optionally only those after a timestamp"""
+    chunks = list(iter_prediction_log(path))
+    records = np.concatenate(chunks) if chunks else np.zeros(0, dtype=RECORD_DTYPE)
+    if since is not None:
+        records = records[records['timestamp'] >= since]
+    return records
@@ -21,29 +21,28 @@ if uploaded_file is not None:
     st.image(image, caption='Uploaded Image', use_container_width=True)    
     # Preprocess image
     image = image.resize((28, 28))
-    image_array = np.array(image)
-    image_array = image_array.astype('float32') / 255.0
-    image_array = image_array.reshape(1, 28, 28, 1)
+    image_array = np.array(image, dtype=np.uint8)
     
-    # Prepare for API call
-    pixel_list = image_array.flatten().tolist()
+    # Prepare for API call: raw uint8 pixels, scaled to [0, 1] by the API
+    payload = image_array.tobytes()
     
     # Make prediction via API
     if st.button('Classify Digit'):
         try:
             response = requests.post(
-                "http://localhost:8001/predict",
-                json={"image": pixel_list}
+                "http://localhost:8001/predict/batch",
+                data=payload,
+                headers={"Content-Type": "application/octet-stream"}
             )
             
             if response.status_code == 200:
                 result = response.json()
-                st.success(f"**Prediction:** {result['prediction']}")
-                st.info(f"**Confidence:** {result['confidence']:.2%}")
+                st.success(f"**Prediction:** {result['predictions'][0]}")
+                st.info(f"**Confidence:** {result['confidences'][0]:.2%}")
                 
                 # Show probabilities
                 st.write("**Class Probabilities:**")
-                for i, prob in enumerate(result['probabilities']):
+                for i, prob in enumerate(result['probabilities'][0]):
                     st.write(f"Digit {i}: {prob:.2%}")
             else:
                 st.error("Prediction failed. Please check if the API server is running.")
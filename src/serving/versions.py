@@ -0,0 +1,192 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+VERSION_MODES = ('canary', 'shadow')
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        # Without /proc only the peak is available, which never goes down
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _percentile_ms(samples, q):
+    return float(np.percentile(samples, q) * 1000.0) if samples else None
+
+
+class ServedVersion:
+    """One loaded model version with its traffic, latency and agreement counters"""
+
+    def __init__(self, name, engine, mode='shadow', weight=0.0, memory_mb=None, max_samples=2000):
+        if mode not in VERSION_MODES + ('primary',):
+            raise ValueError(f"Unknown version mode '{mode}', expected one of {VERSION_MODES}")
+        self.name = name
+        self.engine = engine
+        self.mode = mode
+        self.weight = weight
+        self.memory_mb = memory_mb
+        self.latencies_s = deque(maxlen=max_samples)
+        self.stats = {
+            'requests_total': 0,
+            'images_total': 0,
+            'compared_total': 0,
+            'agreed_total': 0,
+            'dropped_total': 0,
+            'errors_total': 0,
+            'busy_s': 0.0,
+            'cpu_s': 0.0
+        }
+
+    def record(self, num_images, latency_s):
+        self.stats['requests_total'] += 1
+        self.stats['images_total'] += num_images
+        self.stats['busy_s'] += latency_s
+        self.latencies_s.append(latency_s)
+
+    def compare(self, probabilities, reference_probabilities):
+        """Count images where this version's top class matches the reference's"""
+        agreed = probabilities.argmax(axis=1) == reference_probabilities.argmax(axis=1)
+        self.stats['compared_total'] += len(agreed)
+        self.stats['agreed_total'] += int(agreed.sum())
+
+    def get_stats(self) -> dict:
+        stats = self.stats
+        latencies = list(self.latencies_s)
+        return {
+            **stats,
+            'version': self.engine.version,
+            'engine': self.engine.name,
+            'mode': self.mode,
+            'weight': self.weight,
+            'memory_mb': self.memory_mb,
+            'agreement_rate': stats['agreed_total'] / stats['compared_total'] if stats['compared_total'] else None,
+            'latency_ms_p50': _percentile_ms(latencies, 50),
+            'latency_ms_p95': _percentile_ms(latencies, 95),
+            'cpu_ms_per_image': stats['cpu_s'] * 1000.0 / stats['images_total'] if stats['images_total'] else None
+        }
+
+
+class VersionRouter:
+    """Serve candidate model versions next to the primary one
+
+    Canary versions take a weighted share of requests: choose() draws once
+    per request and returns the canary that serves it, or None for the
+    primary. Shadow versions never answer: after the primary has answered,
+    shadow() copies the batch and predicts it on a single background thread,
+    off the response path, comparing top classes with the primary's. When
+    max_pending shadow batches are already queued new ones are dropped, so
+    a slow candidate cannot build up memory or delay the primary.
+    """
+
+    def __init__(self, versions=(), max_pending=8, seed=None, failed=None):
+        self.versions = {version.name: version for version in versions}
+        # Candidates that could not be loaded, by name, with the error
+        self.failed = dict(failed or {})
+        self.primary = ServedVersion('primary', None, mode='primary')
+        self.max_pending = max_pending
+        self._canaries = [v for v in versions if v.mode == 'canary' and v.weight > 0]
+        self._shadows = [v for v in versions if v.mode == 'shadow']
+        if sum(v.weight for v in self._canaries) > 1.0:
+            raise ValueError("Canary weights must add up to at most 1")
+        self._random = random.Random(seed)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow") if self._shadows else None
+
+    def choose(self):
+        """The canary version serving this request, or None for the primary"""
+        if not self._canaries:
+            return None
+        draw = self._random.random()
+        for version in self._canaries:
+            draw -= version.weight
+            if draw < 0:
+                return version
+        return None
+
+    def record_primary(self, engine, num_images, latency_s):
+        self.primary.engine = engine
+        self.primary.record(num_images, latency_s)
+
+    def shadow(self, images, primary_probabilities):
+        """Queue a copy of a served batch for every shadow version; never blocks"""
+        if self._pool is None:
+            return False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                for version in self._shadows:
+                    version.stats['dropped_total'] += 1
+                return False
+            self._pending += 1
+        # The caller may reuse its buffers once the response is sent
+        images = np.array(images, dtype=np.float32)
+        primary_probabilities = np.array(primary_probabilities, dtype=np.float32)
+        self._pool.submit(self._run_shadows, images, primary_probabilities)
+        return True
+
+    def _run_shadows(self, images, primary_probabilities):
+        try:
+            for version in self._shadows:
+                # Thread CPU time; kernels TensorFlow runs on its own pools are not included
+                cpu_start = time.thread_time()
+                start = time.perf_counter()
+                try:
+                    probabilities = version.engine.predict(images)
+                except Exception as e:
+                    version.stats['errors_total'] += 1
+                    print(f"❌ Shadow version {version.name} failed: {e}")
+                    continue
+                version.record(len(images), time.perf_counter() - start)
+                version.stats['cpu_s'] += time.thread_time() - cpu_start
+                version.compare(probabilities, primary_probabilities)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def drain(self, timeout_s=10.0):
+        """Wait until queued shadow batches have run; returns False on timeout"""
+        deadline = time.perf_counter() + timeout_s
+        while self._pending and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        return not self._pending
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        versions = {name: version.get_stats() for name, version in self.versions.items()}
+        primary = self.primary.get_stats() if self.primary.engine is not None else None
+        shadow_busy_s = sum(version.stats['busy_s'] for version in self._shadows)
+        primary_busy_s = self.primary.stats['busy_s']
+        return {
+            'primary': primary,
+            'versions': versions,
+            'failed': self.failed,
+            'shadow_pending': self._pending,
+            # Model time spent shadowing per second of primary model time
+            'shadow_overhead_ratio': shadow_busy_s / primary_busy_s if primary_busy_s else None
+        }
+
+
+def load_version(name, source, mode='shadow', weight=0.0, warmup_batch_sizes=(1,)):
+    """Load and warm up a version from a model source, measuring the memory it adds"""
+    rss_before = current_rss_mb()
+    engine = source.load()
+    for batch_size in warmup_batch_sizes:
+        engine.warmup(batch_size)
+    # Includes the first forward passes' buffers, which every served version pays
+    memory_mb = current_rss_mb() - rss_before
+    print(f"✓ Loaded {mode} version '{name}' ({engine.version}, +{memory_mb:.0f}MB RSS)")
+    return ServedVersion(name, engine, mode=mode, weight=weight, memory_mb=memory_mb)
@@ -0,0 +1,123 @@
+import tensorflow as tf
+from ..utils.config import config
+
+FLOAT32_POLICY = 'float32'
+PRECISION_POLICIES = (FLOAT32_POLICY, 'mixed_bfloat16')
+# Without one of these, bfloat16 is emulated on the CPU and slower than float32
+BF16_CPU_FLAGS = ('avx512_bf16', 'amx_bf16')
+
+
+def cpu_supports_bf16():
+    """True when the CPU has native bfloat16 instructions"""
+    try:
+        with open('/proc/cpuinfo') as f:
+            flags = set(f.read().split())
+    except OSError:
+        return False
+    return any(flag in flags for flag in BF16_CPU_FLAGS)
+
+
+class TrainingAccelerator:
+    """Config-driven XLA, mixed-precision and steps_per_execution settings for model.fit
+
+    The precision policy must be set before the model is built; jit_compile and
+    steps_per_execution are applied to an already compiled model.
+    """
+
+    def __init__(self, jit_compile=None, mixed_precision=None, steps_per_execution=None, parity_tolerance=None):
+        acceleration_config = config.base.get('acceleration', {})
+        # None keeps whatever the model was compiled with
+        self.jit_compile = jit_compile if jit_compile is not None else acceleration_config.get('jit_compile')
+        self.steps_per_execution = steps_per_execution or acceleration_config.get('steps_per_execution') or 1
+        self.parity_tolerance = (parity_tolerance if parity_tolerance is not None
+                                 else acceleration_config.get('parity_tolerance', 0.005))
+        self.policy = self._resolve_policy(mixed_precision or acceleration_config.get('mixed_precision'))
+
+    @staticmethod
+    def _resolve_policy(requested):
+        if requested in (None, FLOAT32_POLICY):
+            return FLOAT32_POLICY
+        if requested not in PRECISION_POLICIES:
+            raise ValueError(f"Unknown precision policy '{requested}', expected one of {PRECISION_POLICIES}")
+        if not tf.config.list_logical_devices('GPU') and not cpu_supports_bf16():
+            print(f"❌ CPU has no native bfloat16 support, training in {FLOAT32_POLICY} instead of {requested}")
+            return FLOAT32_POLICY
+        return requested
+
+    @property
+    def is_baseline(self):
+        """Plain float32 training with one step per call and no forced XLA"""
+        return self.policy == FLOAT32_POLICY and not self.jit_compile and self.steps_per_execution == 1
+
+    def params(self):
+        return {
+            'precision_policy': self.policy,
+            'jit_compile': bool(self.jit_compile),
+            'steps_per_execution': self.steps_per_execution
+        }
+
+    def set_policy(self):
+        """Set the global Keras dtype policy; call before building the model"""
+        tf.keras.mixed_precision.set_global_policy(self.policy)
+
+    def restore_policy(self):
+        """Put the global policy back to float32 so later steps do not build bf16 models"""
+        tf.keras.mixed_precision.set_global_policy(FLOAT32_POLICY)
+
+    def float32_copy(self, model):
+        """Rebuild a model trained under a mixed policy in float32 and copy its weights
+
+        Saved and exported artifacts, and anything built from them, stay float32;
+        the TFLite converter has no bfloat16 Conv2D. Restores the global policy too.
+        """
+        self.restore_policy()
+        if self.policy == FLOAT32_POLICY:
+            return model
+
+        def float32_layer(layer):
+            return layer.__class__.from_config({**layer.get_config(), 'dtype': FLOAT32_POLICY})
+
+        copy = tf.keras.models.clone_model(model, clone_function=float32_layer)
+        # Mixed policies keep float32 variables, so the weights copy over as they are
+        copy.set_weights(model.get_weights())
+        if model.compiled:
+            copy.compile_from_config(model.get_compile_config())
+        print(f"✓ Rebuilt {self.policy} model in {FLOAT32_POLICY} for saving and export")
+        return copy
+
+    def configure(self, model):
+        """Apply jit_compile and steps_per_execution to a compiled model"""
+        if self.jit_compile is not None:
+            model.jit_compile = self.jit_compile
+        model.steps_per_execution = self.steps_per_execution
+        # Compiled train/test functions capture both settings, so rebuild them
+        model.make_train_function(force=True)
+        model.make_test_function(force=True)
+        print(f"✓ Training with policy={self.policy}, jit_compile={model.jit_compile}, "
+              f"steps_per_execution={self.steps_per_execution}")
+        return model
+
+    def baseline_accuracy(self, tracker):
+        """Final val_accuracy of the latest float32 baseline run in the experiment, if any"""
+        runs = tracker.get_experiment_runs()
+        columns = ('params.precision_policy', 'params.jit_compile', 'params.steps_per_execution',
+                   'metrics.val_accuracy')
+        if runs is None or runs.empty or any(column not in runs for column in columns):
+            return None
+        baseline = runs[
+            (runs['params.precision_policy'] == FLOAT32_POLICY)
+            & (runs['params.jit_compile'] == 'False')
+            & (runs['params.steps_per_execution'] == '1')
+            & runs['metrics.val_accuracy'].notna()
+        ].sort_values('start_time', ascending=False)
+        return None if baseline.empty else float(baseline['metrics.val_accuracy'].iloc[0])
+
+    def check_parity(self, accuracy, baseline_accuracy):
+        """Compare accuracy against the float32 baseline within parity_tolerance"""
+        accuracy_delta = accuracy - baseline_accuracy
+        parity_ok = accuracy_delta >= -self.parity_tolerance
+        status = "✓" if parity_ok else "❌"
+        print(f"{status} Accuracy parity: {accuracy:.4f} vs float32 baseline {baseline_accuracy:.4f} "
+              f"(delta {accuracy_delta:+.4f}, tolerance {self.parity_tolerance})")
+        return {'baseline_val_accuracy': baseline_accuracy, 'accuracy_delta': accuracy_delta,
+                'parity_ok': float(parity_ok)}
@@ -0,0 +1,158 @@
+import time
+import numpy as np
+import tensorflow as tf
+
+
+class ThroughputCallback(tf.keras.callbacks.Callback):
+    """Records wall time and examples/sec for every training epoch, optionally logged to MLflow"""
+
+    def __init__(self, num_examples, tracker=None):
+        super().__init__()
+        self.num_examples = num_examples
+        self.tracker = tracker
+        self.epoch_stats = []
+        self._epoch_start = None
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        epoch_time = time.perf_counter() - self._epoch_start
+        examples_per_sec = self.num_examples / epoch_time
+        stats = {
+            'epoch': epoch,
+            'epoch_time_s': epoch_time,
+            'examples_per_sec': examples_per_sec
+        }
+        self.epoch_stats.append(stats)
+        print(f"\n✓ Epoch {epoch + 1}: {epoch_time:.2f}s, {examples_per_sec:.0f} examples/sec")
+        self.update_stats(stats)
+
+        if self.tracker is not None:
+            self.tracker.log_metrics({k: v for k, v in stats.items() if k != 'epoch'}, step=epoch)
+
+    def update_stats(self, stats):
+        """Hook for subclasses to add to an epoch's stats before they are logged"""
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+class ProfilingCallback(ThroughputCallback):
+    """Per-step and per-epoch timing, input-pipeline cost and peak memory, logged to MLflow
+
+    Keras fetches batches inside the compiled train step, so input time cannot
+    be split out of a step directly. Instead, when given the training dataset,
+    the callback times the input pipeline on its own for a few batches before
+    training and reports how that compares with the measured step time.
+    """
+
+    def __init__(self, num_examples, tracker=None, input_dataset=None, input_probe_steps=20,
+                 profile_steps=None, profile_dir=None):
+        super().__init__(num_examples, tracker)
+        self.input_dataset = input_dataset
+        self.input_probe_steps = input_probe_steps
+        self.profile_steps = tuple(profile_steps) if profile_steps else None
+        self.profile_dir = profile_dir
+        self.input_time_per_step = None
+        self.step_times = []
+        self._global_step = 0
+        self._step_start = None
+        self._profiling = False
+
+    def on_train_begin(self, logs=None):
+        if self.input_dataset is not None and self.input_probe_steps:
+            self.input_time_per_step = self._probe_input()
+            print(f"✓ Input pipeline: {self.input_time_per_step * 1000:.2f} ms/batch on its own")
+
+    def _probe_input(self):
+        """Seconds per batch to produce input, excluding the first (warm-up) batch"""
+        iterator = iter(self.input_dataset)
+        next(iterator)
+        start = time.perf_counter()
+        steps = 0
+        for _ in range(self.input_probe_steps):
+            try:
+                next(iterator)
+            except StopIteration:
+                break
+            steps += 1
+        return (time.perf_counter() - start) / max(steps, 1)
+
+    def on_epoch_begin(self, epoch, logs=None):
+        super().on_epoch_begin(epoch, logs)
+        self.step_times = []
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.profile_steps and self._global_step == self.profile_steps[0]:
+            tf.profiler.experimental.start(str(self.profile_dir))
+            self._profiling = True
+        self._step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.step_times.append(time.perf_counter() - self._step_start)
+        self._global_step += 1
+        if self._profiling and self._global_step >= self.profile_steps[1]:
+            self._stop_profiler()
+
+    def on_train_end(self, logs=None):
+        if self._profiling:
+            self._stop_profiler()
+
+    def _stop_profiler(self):
+        tf.profiler.experimental.stop()
+        self._profiling = False
+        print(f"✓ Profiler trace for steps {self.profile_steps[0]}-{self.profile_steps[1]} written to {self.profile_dir}")
+
+    def update_stats(self, stats):
+        # The first step of a run includes tracing and compilation
+        step_times = np.array(self.step_times[1:] if len(self.step_times) > 1 else self.step_times) * 1000.0
+        stats.update({
+            'steps': len(self.step_times),
+            'step_time_ms_p50': float(np.percentile(step_times, 50)),
+            'step_time_ms_p90': float(np.percentile(step_times, 90)),
+            'step_time_ms_max': float(step_times.max()),
+            'host_overhead_s': stats['epoch_time_s'] - float(np.sum(self.step_times)),
+            'peak_rss_mb': peak_rss_mb()
+        })
+        if tf.config.list_logical_devices('GPU'):
+            stats['peak_gpu_mb'] = tf.config.experimental.get_memory_info('GPU:0')['peak'] / 2 ** 20
+        if self.input_time_per_step is not None:
+            input_ms = self.input_time_per_step * 1000.0
+            stats['input_time_per_step_ms'] = input_ms
+            # Near 1 the step is as slow as the input pipeline alone: input-bound
+            stats['input_bound_ratio'] = min(input_ms / stats['step_time_ms_p50'], 1.0)
+            # Upper bound on time spent waiting for input, if none of it overlapped compute
+            stats['input_wait_s_max'] = min(input_ms, stats['step_time_ms_p50']) / 1000.0 * stats['steps']
+        print(f"  step p50={stats['step_time_ms_p50']:.2f}ms p90={stats['step_time_ms_p90']:.2f}ms, "
+              f"peak RSS {stats['peak_rss_mb']:.0f}MB"
+              + (f", input-bound ratio {stats['input_bound_ratio']:.2f}" if 'input_bound_ratio' in stats else ""))
+
+
+class MLflowLoggingCallback(tf.keras.callbacks.Callback):
+    """Buffers epoch metrics in an MLflowTracker and flushes them in the background
+
+    Training never waits on the tracking store; whatever is still buffered is
+    written when training ends.
+    """
+
+    def __init__(self, tracker, flush_interval_s=5.0):
+        super().__init__()
+        self.tracker = tracker
+        self.flush_interval_s = flush_interval_s
+
+    def on_train_begin(self, logs=None):
+        self.tracker.start_background_flush(self.flush_interval_s)
+
+    def on_epoch_end(self, epoch, logs=None):
+        metrics = {
+            name if name.startswith('val_') or name == 'learning_rate' else f'train_{name}': value
+            for name, value in (logs or {}).items()
+        }
+        self.tracker.log_metrics(metrics, step=epoch)
+
+    def on_train_end(self, logs=None):
+        self.tracker.stop_background_flush()
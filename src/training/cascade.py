@@ -0,0 +1,125 @@
+import json
+import time
+from pathlib import Path
+import numpy as np
+from ..serving.cascade import CASCADE_CONFIG_NAME, FIRST_STAGE_NAME, CascadeEngine, DenseEngine
+from ..utils.config import config
+
+
+class CascadeTrainer:
+    """Train the cascade's cheap first stage and calibrate its confidence threshold
+
+    The first stage is a logistic regression, or a small MLP with hidden_units,
+    trained on the same preprocessed arrays as the CNN. The threshold is the
+    lowest one whose validation accuracy stays within max_accuracy_drop of the
+    full model alone, so as many images as possible skip the CNN. When none
+    does, the threshold is None and the cascade is saved as disabled, so
+    serving keeps using the full model alone.
+    """
+
+    def __init__(self, output_dir=None, hidden_units=None, epochs=None, batch_size=None,
+                 thresholds=None, max_accuracy_drop=None, benchmark_batch_size=None):
+        cascade_config = config.base.get('cascade', {})
+        self.output_dir = Path(output_dir or config.model_paths['deployed'])
+        self.hidden_units = hidden_units if hidden_units is not None else cascade_config.get('hidden_units', [])
+        self.epochs = epochs or cascade_config.get('epochs', 5)
+        self.batch_size = batch_size or cascade_config.get('batch_size', 128)
+        self.thresholds = thresholds or cascade_config.get('thresholds', [0.5, 0.7, 0.8, 0.9, 0.95, 0.99])
+        self.max_accuracy_drop = (max_accuracy_drop if max_accuracy_drop is not None
+                                  else cascade_config.get('max_accuracy_drop', 0.002))
+        self.benchmark_batch_size = benchmark_batch_size or cascade_config.get('benchmark_batch_size', 32)
+        self.first_stage = None
+        self.threshold = None
+
+    def build_first_stage(self):
+        import tensorflow as tf
+        layers = [tf.keras.Input(shape=(28, 28, 1)), tf.keras.layers.Flatten()]
+        layers += [tf.keras.layers.Dense(units, activation='relu') for units in self.hidden_units]
+        layers.append(tf.keras.layers.Dense(10, activation='softmax'))
+        model = tf.keras.Sequential(layers)
+        model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+        return model
+
+    def train(self, processed):
+        """Fit the first stage on the training split and keep it as a NumPy engine"""
+        model = self.build_first_stage()
+        model.fit(
+            processed['x_train'], processed['y_train'],
+            validation_data=(processed['x_val'], processed['y_val']),
+            epochs=self.epochs, batch_size=self.batch_size, verbose=2
+        )
+        self.first_stage = DenseEngine.from_keras(model)
+        return self.first_stage
+
+    def calibrate(self, full_model, x_val, y_val):
+        """Pick the lowest threshold that keeps validation accuracy near the full model's"""
+        first_probabilities = self.first_stage.predict(x_val)
+        full_predictions = np.argmax(full_model.predict(x_val), axis=1)
+        full_accuracy = float(np.mean(full_predictions == y_val))
+
+        confidence = first_probabilities.max(axis=1)
+        first_predictions = first_probabilities.argmax(axis=1)
+        self.threshold = None
+        for threshold in sorted(self.thresholds):
+            predictions = np.where(confidence >= threshold, first_predictions, full_predictions)
+            if np.mean(predictions == y_val) >= full_accuracy - self.max_accuracy_drop:
+                self.threshold = threshold
+                break
+        if self.threshold is None:
+            print(f"❌ No cascade threshold keeps validation accuracy within {self.max_accuracy_drop} "
+                  f"of the full model's {full_accuracy:.4f}; the cascade is saved disabled")
+        else:
+            print(f"✓ Cascade threshold calibrated to {self.threshold} "
+                  f"(full model validation accuracy {full_accuracy:.4f})")
+        return self.threshold
+
+    def evaluate(self, full_model, x_test, y_test):
+        """Accuracy, fraction escalated and mean batch latency of the full model and each threshold"""
+        # Shapes and tracing are paid once here, not by whichever row is measured first
+        full_model.predict(x_test[:self.benchmark_batch_size])
+        report = [self._measure(full_model, x_test, y_test, threshold=None)]
+        for threshold in sorted(self.thresholds):
+            report.append(self._measure(CascadeEngine(self.first_stage, full_model, threshold), x_test, y_test,
+                                        threshold=threshold))
+        self._print_report(report)
+        return report
+
+    def _measure(self, engine, x_test, y_test, threshold):
+        """Predict x_test in serving-sized batches, timing each batch"""
+        predictions = []
+        start = time.perf_counter()
+        for i in range(0, len(x_test), self.benchmark_batch_size):
+            predictions.append(np.argmax(engine.predict(x_test[i:i + self.benchmark_batch_size]), axis=1))
+        elapsed = time.perf_counter() - start
+        num_batches = len(predictions)
+        return {
+            'threshold': threshold,
+            'accuracy': float(np.mean(np.concatenate(predictions) == y_test)),
+            'escalated_fraction': engine.get_stats()['escalated_fraction'] if threshold is not None else 1.0,
+            'batch_latency_ms': elapsed / num_batches * 1000.0
+        }
+
+    def _print_report(self, report):
+        """Print the threshold comparison table"""
+        print(f"{'threshold':>10} {'accuracy':>9} {'escalated':>10} {'batch ms':>9}")
+        for row in report:
+            label = 'full' if row['threshold'] is None else f"{row['threshold']:g}"
+            marker = ' <' if row['threshold'] == self.threshold else ''
+            print(f"{label:>10} {row['accuracy']:>9.4f} {row['escalated_fraction']:>10.1%} "
+                  f"{row['batch_latency_ms']:>9.3f}{marker}")
+
+    def save(self, report=None):
+        """Write the first-stage weights and the calibrated threshold beside the deployed model"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        first_stage_path = self.first_stage.save(self.output_dir / FIRST_STAGE_NAME)
+        config_path = self.output_dir / CASCADE_CONFIG_NAME
+        config_path.write_text(json.dumps({
+            'enabled': self.threshold is not None,
+            'threshold': self.threshold,
+            'hidden_units': list(self.hidden_units),
+            'max_accuracy_drop': self.max_accuracy_drop,
+            'benchmark_batch_size': self.benchmark_batch_size,
+            'report': report
+        }, indent=2))
+        print(f"✓ Cascade first stage saved to: {first_stage_path}")
+        return first_stage_path, config_path
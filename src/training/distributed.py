@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+
+
+def limit_tf_threads(intra_op, inter_op=1):
+    """Cap TensorFlow and BLAS threads; must run before TensorFlow executes any op"""
+    os.environ['OMP_NUM_THREADS'] = str(intra_op)
+    os.environ['TF_NUM_INTRAOP_THREADS'] = str(intra_op)
+    os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_op)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+
+
+def cluster_from_env():
+    """(num_workers, task_index) from TF_CONFIG, or a single local worker without it"""
+    tf_config = json.loads(os.environ.get('TF_CONFIG', '{}'))
+    workers = tf_config.get('cluster', {}).get('worker', [])
+    if not workers:
+        return 1, 0
+    return len(workers), int(tf_config.get('task', {}).get('index', 0))
+
+
+def is_chief():
+    """Worker 0 is the chief: the only one that logs to MLflow and saves models"""
+    return cluster_from_env()[1] == 0
+
+
+def local_tf_configs(num_workers, base_port=23456):
+    """One TF_CONFIG JSON string per worker of a cluster on this host"""
+    cluster = {'worker': [f'localhost:{base_port + i}' for i in range(num_workers)]}
+    return [
+        json.dumps({'cluster': cluster, 'task': {'type': 'worker', 'index': i}})
+        for i in range(num_workers)
+    ]
+
+
+def launch_local_workers(argv, num_workers, base_port=23456, threads_per_worker=None, capture_output=False):
+    """Run `python argv` once per worker with its TF_CONFIG and wait for all of them
+
+    Returns the completed processes in worker order. With threads_per_worker
+    unset, the host's cores are divided evenly between workers.
+    """
+    threads = threads_per_worker or max(1, (os.cpu_count() or 1) // num_workers)
+    processes = []
+    for tf_config in local_tf_configs(num_workers, base_port):
+        env = {
+            **os.environ,
+            'TF_CONFIG': tf_config,
+            'OMP_NUM_THREADS': str(threads),
+            'TF_NUM_INTRAOP_THREADS': str(threads),
+            'TF_NUM_INTEROP_THREADS': '1'
+        }
+        output = subprocess.PIPE if capture_output else None
+        processes.append(subprocess.Popen([sys.executable, *argv], env=env, stdout=output, text=True))
+
+    completed = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        completed.append(subprocess.CompletedProcess(process.args, process.returncode, stdout))
+    failed = [i for i, process in enumerate(completed) if process.returncode != 0]
+    if failed:
+        raise RuntimeError(f"Workers {failed} exited with errors")
+    return completed
+
+
+def scale_learning_rate(base_learning_rate, global_batch_size, base_batch_size):
+    """Linear scaling rule: the learning rate grows with the global batch size"""
+    return base_learning_rate * global_batch_size / base_batch_size
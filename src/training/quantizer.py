@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+import numpy as np
+from ..serving.engines import QUANTIZATION_MODES, TFLiteEngine, export_tflite, tflite_model_name
+from ..utils.config import config
+
+
+class ModelQuantizer:
+    """Post-training quantization of the trained model to TFLite variants"""
+
+    def __init__(self, output_dir=None):
+        self.output_dir = Path(output_dir or config.model_paths['deployed'])
+        quantization_config = config.base.get('quantization', {})
+        self.calibration_samples = quantization_config.get('calibration_samples', 500)
+        self.benchmark_batch_size = quantization_config.get('benchmark_batch_size', 32)
+        self.model_paths = {}
+
+    def representative_sample(self, x_val, random_state=42):
+        """Draw the calibration sample from the validation split"""
+        rng = np.random.RandomState(random_state)
+        size = min(self.calibration_samples, len(x_val))
+        indices = rng.choice(len(x_val), size=size, replace=False)
+        return x_val[indices].astype('float32')
+
+    def quantize(self, model, x_val):
+        """Export dynamic-range and full-int8 TFLite models beside the float32 export"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        calibration_data = self.representative_sample(x_val)
+
+        float_path = self.output_dir / tflite_model_name()
+        if not float_path.exists():
+            export_tflite(model, float_path)
+
+        self.model_paths = {'float32': float_path}
+        for mode in QUANTIZATION_MODES:
+            self.model_paths[mode] = export_tflite(
+                model,
+                self.output_dir / tflite_model_name(mode),
+                quantization=mode,
+                representative_data=calibration_data
+            )
+        return self.model_paths
+
+    def evaluate(self, x_test, y_test, repeats=20):
+        """Compare accuracy, size and per-batch latency of each variant against float32"""
+        report = {}
+        batch = x_test[:self.benchmark_batch_size].astype('float32')
+
+        for variant, model_path in self.model_paths.items():
+            engine = TFLiteEngine.from_path(model_path)
+            predictions = np.argmax(engine.predict(x_test.astype('float32')), axis=1)
+
+            engine.predict(batch)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                engine.predict(batch)
+            latency_ms = (time.perf_counter() - start) / repeats * 1000.0
+
+            report[variant] = {
+                'accuracy': float(np.mean(predictions == y_test)),
+                'size_kb': model_path.stat().st_size / 1024.0,
+                'batch_latency_ms': latency_ms
+            }
+
+        baseline = report['float32']
+        for metrics in report.values():
+            metrics['accuracy_delta'] = metrics['accuracy'] - baseline['accuracy']
+
+        self._print_report(report)
+        return report
+
+    def _print_report(self, report):
+        """Print the quantization comparison table"""
+        print(f"{'variant':<10} {'accuracy':>9} {'delta':>8} {'size KB':>9} {'batch ms':>9}")
+        for variant, metrics in report.items():
+            print(f"{variant:<10} {metrics['accuracy']:>9.4f} {metrics['accuracy_delta']:>+8.4f} "
+                  f"{metrics['size_kb']:>9.1f} {metrics['batch_latency_ms']:>9.3f}")
@@ -0,0 +1,191 @@
+import itertools
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from ..utils.config import config
+from .distributed import limit_tf_threads
+
+STRATEGIES = ('grid', 'random', 'halving')
+
+
+def grid_trials(space):
+    """Every combination of the listed values"""
+    names = sorted(space)
+    if any(isinstance(space[name], dict) for name in names):
+        raise ValueError("Grid search needs explicit value lists, not distributions")
+    values = [space[name] if isinstance(space[name], list) else [space[name]] for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def sample_value(spec, rng):
+    """Draw one value from a list (choice) or a {type, low, high} distribution"""
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    if not isinstance(spec, dict):
+        return spec
+    if spec['type'] == 'loguniform':
+        return math.exp(rng.uniform(math.log(spec['low']), math.log(spec['high'])))
+    if spec['type'] == 'uniform':
+        return rng.uniform(spec['low'], spec['high'])
+    if spec['type'] == 'int':
+        return rng.randint(spec['low'], spec['high'])
+    raise ValueError(f"Unknown distribution type: {spec['type']}")
+
+
+def random_trials(space, num_trials, seed=0):
+    rng = random.Random(seed)
+    return [{name: sample_value(spec, rng) for name, spec in sorted(space.items())} for _ in range(num_trials)]
+
+
+def apply_overrides(params):
+    """Apply dotted 'section.key' trial params to this process's config"""
+    for name, value in params.items():
+        section, key = name.split('.', 1)
+        config.base.setdefault(section, {})[key] = value
+
+
+def init_worker(threads):
+    """Limit TensorFlow and BLAS threads before TensorFlow starts in this worker"""
+    limit_tf_threads(threads)
+
+
+def run_trial(trial, data_dir, parent_run_id, checkpoint_dir):
+    """Train one trial up to trial['target_epochs'], resuming from its checkpoint
+
+    Runs in a worker process. The preprocessed arrays are memory-mapped from the
+    shared cache directory, so every worker reads the same page-cache copy.
+    """
+    import mlflow
+    import tensorflow as tf
+    from mlflow.utils.mlflow_tags import MLFLOW_PARENT_RUN_ID
+    from ..data.dataset_builder import DatasetBuilder
+    from ..data.processed_cache import ProcessedDataCache
+    from ..mlflow_pipeline.tracking import MLflowTracker
+    from ..models.model_builder import ModelBuilder
+    from .callbacks import MLflowLoggingCallback
+
+    apply_overrides(trial['params'])
+    processed = ProcessedDataCache.open(data_dir)
+    # No in-memory tf.data cache: each worker would hold a private copy of the mmap'd arrays
+    builder = DatasetBuilder(cache='none')
+    train_dataset = builder.build(processed['x_train'], processed['y_train'], training=True, name='train')
+    val_dataset = builder.build(processed['x_val'], processed['y_val'], name='val')
+
+    checkpoint_path = Path(checkpoint_dir) / f"trial_{trial['trial_id']}.keras"
+    if trial['epochs_done'] and checkpoint_path.exists():
+        model = tf.keras.models.load_model(checkpoint_path)
+    else:
+        model_builder = ModelBuilder()
+        model = model_builder.create_cnn_model()
+        model_builder.compile_model()
+
+    tracker = MLflowTracker()
+    if trial.get('run_id'):
+        run_context = mlflow.start_run(run_id=trial['run_id'])
+    else:
+        run_context = mlflow.start_run(
+            run_name=f"trial-{trial['trial_id']}", tags={MLFLOW_PARENT_RUN_ID: parent_run_id}
+        )
+    with run_context as run:
+        if not trial['epochs_done']:
+            tracker.log_params(trial['params'])
+        history = model.fit(
+            train_dataset,
+            validation_data=val_dataset,
+            initial_epoch=trial['epochs_done'],
+            epochs=trial['target_epochs'],
+            callbacks=[MLflowLoggingCallback(tracker)],
+            verbose=0
+        )
+        score = float(history.history['val_accuracy'][-1])
+        tracker.log_metrics({'score': score}, step=trial['target_epochs'])
+        tracker.flush()
+
+    model.save(checkpoint_path)
+    return {**trial, 'run_id': run.info.run_id, 'epochs_done': trial['target_epochs'], 'score': score}
+
+
+class SweepRunner:
+    """Runs hyperparameter trials concurrently in a process pool
+
+    'grid' and 'random' train every trial for max_epochs. 'halving' runs
+    successive halving: all trials start with min_epochs, only the best 1/eta
+    continue, each rung training eta times longer, until max_epochs.
+    """
+
+    def __init__(self, space=None, strategy=None, num_trials=None, max_workers=None,
+                 threads_per_trial=None, min_epochs=None, max_epochs=None, eta=None, seed=None):
+        sweep_config = config.base.get('sweep', {})
+        self.space = space or sweep_config.get('space', {})
+        self.strategy = strategy or sweep_config.get('strategy', 'grid')
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown sweep strategy '{self.strategy}', expected one of {STRATEGIES}")
+        self.num_trials = num_trials or sweep_config.get('num_trials', 8)
+        cpus = os.cpu_count() or 1
+        self.threads_per_trial = threads_per_trial or sweep_config.get('threads_per_trial') or 2
+        # By default, enough workers to use every core without oversubscribing
+        self.max_workers = max_workers or sweep_config.get('max_workers') or max(1, cpus // self.threads_per_trial)
+        self.min_epochs = min_epochs or sweep_config.get('min_epochs', 1)
+        self.max_epochs = max_epochs or sweep_config.get('max_epochs', config.base['model']['epochs'])
+        self.eta = eta or sweep_config.get('eta', 3)
+        self.seed = seed if seed is not None else config.base['data']['random_state']
+
+    def trials(self):
+        """Initial trial list for the configured strategy"""
+        if self.strategy == 'grid':
+            params = grid_trials(self.space)
+        else:
+            params = random_trials(self.space, self.num_trials, self.seed)
+        return [{'trial_id': i, 'params': p, 'epochs_done': 0, 'run_id': None} for i, p in enumerate(params)]
+
+    def rungs(self):
+        """Epoch budget of each successive-halving rung, ending at max_epochs"""
+        if self.strategy != 'halving':
+            return [self.max_epochs]
+        budgets = []
+        epochs = self.min_epochs
+        while epochs < self.max_epochs:
+            budgets.append(epochs)
+            epochs *= self.eta
+        return budgets + [self.max_epochs]
+
+    def promote(self, results):
+        """Split a finished rung into the best 1/eta, which continue, and the rest, which stop"""
+        ranked = sorted(results, key=lambda t: t['score'], reverse=True)
+        keep = max(1, len(ranked) // self.eta)
+        return ranked[:keep], ranked[keep:]
+
+    def run(self, data_dir, parent_run_id, checkpoint_dir):
+        """Run the sweep and return every trial's final state, best first"""
+        Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+        active = self.trials()
+        finished = []
+        print(f"✓ Sweep: {len(active)} trials, strategy={self.strategy}, rungs={self.rungs()}, "
+              f"{self.max_workers} workers x {self.threads_per_trial} threads")
+
+        # Spawned workers start TensorFlow fresh, so their thread limits take effect
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(self.max_workers, mp_context=context,
+                                 initializer=init_worker, initargs=(self.threads_per_trial,)) as pool:
+            rungs = self.rungs()
+            for rung, epochs in enumerate(rungs):
+                futures = [
+                    pool.submit(run_trial, {**trial, 'target_epochs': epochs}, str(data_dir), parent_run_id,
+                                str(checkpoint_dir))
+                    for trial in active
+                ]
+                results = sorted((f.result() for f in as_completed(futures)), key=lambda t: t['score'], reverse=True)
+                for trial in results:
+                    print(f"  rung {rung} ({epochs} epochs) trial {trial['trial_id']}: "
+                          f"val_accuracy={trial['score']:.4f} {trial['params']}")
+
+                if rung == len(rungs) - 1:
+                    finished.extend(results)
+                else:
+                    active, stopped = self.promote(results)
+                    finished.extend(stopped)
+
+        return sorted(finished, key=lambda t: (t['epochs_done'], t['score']), reverse=True)
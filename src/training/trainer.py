@@ -1,15 +1,25 @@
+import shutil
+import tempfile
+import time
+import numpy as np
 import tensorflow as tf
 import mlflow
 import mlflow.keras
+from contextlib import nullcontext
 from pathlib import Path
+from ..data.dataset_builder import DatasetBuilder
+from ..mlflow_pipeline.tracking import MLflowTracker
 from ..utils.config import config
+from .callbacks import MLflowLoggingCallback
+from .distributed import cluster_from_env, scale_learning_rate
 
 class ModelTrainer:
     """Model training class with MLflow tracking"""
     
-    def __init__(self):
+    def __init__(self, tracker=None):
         self.history = None
         self.callbacks = []
+        self.tracker = tracker
     
     def setup_callbacks(self, checkpoint_path='best_model.h5', patience=10):
         """Setup training callbacks"""
@@ -34,39 +44,183 @@ class ModelTrainer:
         ]
         return self.callbacks
     
-    def train_model(self, model, train_dataset, val_dataset, epochs=10):
-        """Train the model with MLflow tracking"""
-        # Start MLflow run
-        mlflow.set_tracking_uri(config.base['mlflow']['tracking_uri'])
-        mlflow.set_experiment(config.base['mlflow']['experiment_name'])
+    def train_model(self, model, train_dataset, val_dataset, epochs=10, accelerator=None):
+        """Train the model with MLflow tracking
+
+        With a TrainingAccelerator, its settings are logged as params and the
+        final val_accuracy is checked against the latest float32 baseline run.
+        """
+        if self.tracker is None:
+            self.tracker = MLflowTracker()
         
-        with mlflow.start_run():
-            # Log parameters
-            mlflow.log_param("epochs", epochs)
-            mlflow.log_param("batch_size", config.base['model']['batch_size'])
-            mlflow.log_param("learning_rate", config.base['model']['learning_rate'])
+        with self.tracker.start_run():
+            # Params and per-epoch metrics are buffered and written with batched calls
+            self.tracker.log_params({
+                "epochs": epochs,
+                "batch_size": config.base['model']['batch_size'],
+                "learning_rate": config.base['model']['learning_rate'],
+                **(accelerator.params() if accelerator else {})
+            })
             
             # Train model
             self.history = model.fit(
                 train_dataset,
                 epochs=epochs,
                 validation_data=val_dataset,
-                callbacks=self.callbacks,
+                callbacks=self.callbacks + [MLflowLoggingCallback(self.tracker)],
                 verbose=1
             )
             
-            # Log metrics
-            for epoch in range(len(self.history.history['accuracy'])):
-                mlflow.log_metric("train_accuracy", self.history.history['accuracy'][epoch], step=epoch)
-                mlflow.log_metric("val_accuracy", self.history.history['val_accuracy'][epoch], step=epoch)
-                mlflow.log_metric("train_loss", self.history.history['loss'][epoch], step=epoch)
-                mlflow.log_metric("val_loss", self.history.history['val_loss'][epoch], step=epoch)
+            if accelerator is not None and not accelerator.is_baseline:
+                baseline_accuracy = accelerator.baseline_accuracy(self.tracker)
+                if baseline_accuracy is None:
+                    print("❌ No float32 baseline run found, accuracy parity not checked")
+                else:
+                    self.tracker.log_metrics(accelerator.check_parity(
+                        float(self.history.history['val_accuracy'][-1]), baseline_accuracy
+                    ))
             
             # Log model
             mlflow.keras.log_model(model, "model")
             
         return self.history
     
+    def train_distributed(self, build_model, processed, epochs=10, global_batch_size=None):
+        """Data-parallel training across the workers listed in TF_CONFIG
+
+        Every worker calls this with the same arguments. build_model must return
+        a compiled model; it is called inside the strategy scope so its variables
+        are mirrored. Keras 3's fit() rejects MultiWorkerMirroredStrategy inputs,
+        so steps run in a custom loop that all-reduces gradients every step.
+        Only the chief logs to MLflow and keeps the saved model.
+        """
+        strategy = tf.distribute.MultiWorkerMirroredStrategy()
+        num_workers, task_index = cluster_from_env()
+        chief = task_index == 0
+
+        # config.model.batch_size is per worker and is what the base learning rate was tuned for
+        base_batch_size = config.base['model']['batch_size']
+        global_batch_size = global_batch_size or base_batch_size * num_workers
+        learning_rate = config.base['model']['learning_rate']
+        if config.base.get('distributed', {}).get('scale_learning_rate', True):
+            learning_rate = scale_learning_rate(learning_rate, global_batch_size, base_batch_size)
+
+        with strategy.scope():
+            model = build_model()
+            model.optimizer.learning_rate.assign(learning_rate)
+            train_accuracy = tf.keras.metrics.SparseCategoricalAccuracy()
+
+        x_train, y_train = processed['x_train'], processed['y_train']
+
+        def dataset_fn(input_context):
+            builder = DatasetBuilder(batch_size=input_context.get_per_replica_batch_size(global_batch_size))
+            return builder.build(x_train, y_train, training=True,
+                                 num_shards=input_context.num_input_pipelines,
+                                 shard_index=input_context.input_pipeline_id)
+
+        train_dataset = strategy.distribute_datasets_from_function(dataset_fn)
+        # Every worker must run the same number of steps or the all-reduce deadlocks
+        steps_per_epoch = len(x_train) // global_batch_size
+        val_dataset = DatasetBuilder(batch_size=base_batch_size).build(
+            processed['x_val'], processed['y_val'], name='val'
+        )
+
+        @tf.function
+        def train_step(iterator):
+            def step_fn(inputs):
+                images, labels = inputs
+                with tf.GradientTape() as tape:
+                    probabilities = model(images, training=True)
+                    per_example_loss = tf.keras.losses.sparse_categorical_crossentropy(labels, probabilities)
+                    loss = tf.nn.compute_average_loss(per_example_loss, global_batch_size=global_batch_size)
+                gradients = tape.gradient(loss, model.trainable_variables)
+                model.optimizer.apply_gradients(zip(gradients, model.trainable_variables))
+                train_accuracy.update_state(labels, probabilities)
+                return loss
+
+            per_replica_loss = strategy.run(step_fn, args=(next(iterator),))
+            return strategy.reduce(tf.distribute.ReduceOp.SUM, per_replica_loss, axis=None)
+
+        if chief:
+            self.tracker = self.tracker or MLflowTracker()
+            run_context = self.tracker.start_run(run_name=f"distributed-{num_workers}-workers")
+        else:
+            run_context = nullcontext()
+
+        history = {name: [] for name in (
+            'loss', 'accuracy', 'val_loss', 'val_accuracy', 'epoch_time_s', 'examples_per_sec'
+        )}
+        with run_context:
+            if chief:
+                self.tracker.log_params({
+                    "epochs": epochs,
+                    "num_workers": num_workers,
+                    "global_batch_size": global_batch_size,
+                    "batch_size": base_batch_size,
+                    "learning_rate": learning_rate
+                })
+
+            for epoch in range(epochs):
+                start = time.perf_counter()
+                iterator = iter(train_dataset)
+                total_loss = 0.0
+                for _ in range(steps_per_epoch):
+                    total_loss += float(train_step(iterator))
+                epoch_time = time.perf_counter() - start
+
+                # Weights are identical on every worker, so validation needs no communication
+                val_loss, val_accuracy = self._evaluate_local(model, val_dataset)
+                history['loss'].append(total_loss / steps_per_epoch)
+                history['accuracy'].append(float(train_accuracy.result()))
+                history['val_loss'].append(val_loss)
+                history['val_accuracy'].append(val_accuracy)
+                history['epoch_time_s'].append(epoch_time)
+                history['examples_per_sec'].append(steps_per_epoch * global_batch_size / epoch_time)
+                train_accuracy.reset_state()
+
+                if chief:
+                    print(f"Epoch {epoch + 1}/{epochs} - loss: {history['loss'][-1]:.4f} - "
+                          f"accuracy: {history['accuracy'][-1]:.4f} - val_accuracy: {val_accuracy:.4f} - "
+                          f"{history['examples_per_sec'][-1]:.0f} examples/sec on {num_workers} workers")
+                    self.tracker.log_metrics({
+                        'train_loss': history['loss'][-1],
+                        'train_accuracy': history['accuracy'][-1],
+                        'val_loss': val_loss,
+                        'val_accuracy': val_accuracy,
+                        'epoch_time_s': epoch_time,
+                        'examples_per_sec': history['examples_per_sec'][-1]
+                    }, step=epoch)
+
+            # All workers save, since saving may need collectives; only the chief's copy is kept
+            if chief:
+                models_dir = config.model_paths['trained']
+                models_dir.mkdir(parents=True, exist_ok=True)
+                model_path = models_dir / 'mnist_cnn_model.keras'
+                model.save(model_path)
+                print(f"Model saved to: {model_path}")
+            else:
+                scratch_dir = tempfile.mkdtemp(prefix=f'worker{task_index}_')
+                model.save(Path(scratch_dir) / 'mnist_cnn_model.keras')
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        self.history = history
+        return model, history
+
+    @staticmethod
+    def _evaluate_local(model, dataset):
+        """Mean loss and accuracy of a model on this worker, without collectives"""
+        predict = tf.function(lambda images: model(images, training=False))
+        total_loss = correct = count = 0.0
+        for images, labels in dataset:
+            probabilities = predict(images).numpy()
+            labels = labels.numpy()
+            total_loss += float(tf.reduce_sum(
+                tf.keras.losses.sparse_categorical_crossentropy(labels, probabilities)
+            ))
+            correct += int(np.sum(probabilities.argmax(axis=1) == labels))
+            count += len(labels)
+        return total_loss / count, correct / count
+
     def evaluate_model(self, model, test_dataset):
         """Evaluate model on test dataset"""
         test_loss, test_accuracy = model.evaluate(test_dataset, verbose=1)
@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import tensorflow as tf
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.training import acceleration
+from src.training.acceleration import TrainingAccelerator
+
+
+class FakeTracker:
+    def __init__(self, runs):
+        self.runs = runs
+
+    def get_experiment_runs(self):
+        return self.runs
+
+
+def test_configure_applies_settings_to_compiled_model():
+    model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(2, activation='softmax')])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+
+    accelerator = TrainingAccelerator(jit_compile=True, steps_per_execution=8)
+    accelerator.configure(model)
+
+    assert model.jit_compile is True
+    assert model.steps_per_execution == 8
+    assert not accelerator.is_baseline
+    assert TrainingAccelerator(jit_compile=False, mixed_precision='float32').is_baseline
+
+
+def test_bf16_falls_back_to_float32_without_cpu_support(monkeypatch):
+    monkeypatch.setattr(acceleration, 'cpu_supports_bf16', lambda: False)
+    monkeypatch.setattr(tf.config, 'list_logical_devices', lambda device_type: [])
+
+    assert TrainingAccelerator(mixed_precision='mixed_bfloat16').policy == 'float32'
+    with pytest.raises(ValueError):
+        TrainingAccelerator(mixed_precision='mixed_float8')
+
+
+def test_parity_against_latest_float32_baseline():
+    runs = pd.DataFrame({
+        'start_time': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+        'params.precision_policy': ['float32', 'float32', 'mixed_bfloat16'],
+        'params.jit_compile': ['False', 'False', 'False'],
+        'params.steps_per_execution': ['1', '1', '1'],
+        'metrics.val_accuracy': [0.97, 0.98, 0.90]
+    })
+    accelerator = TrainingAccelerator(mixed_precision='mixed_bfloat16', parity_tolerance=0.005)
+
+    baseline = accelerator.baseline_accuracy(FakeTracker(runs))
+    assert baseline == 0.98
+    assert accelerator.check_parity(0.978, baseline)['parity_ok'] == 1.0
+    assert accelerator.check_parity(0.97, baseline)['parity_ok'] == 0.0
+    assert accelerator.baseline_accuracy(FakeTracker(None)) is None
+
+
+def test_model_trained_under_bf16_exports_as_float32(monkeypatch, tmp_path):
+    from src.serving.engines import export_tflite
+
+    monkeypatch.setattr(acceleration, 'cpu_supports_bf16', lambda: True)
+    accelerator = TrainingAccelerator(mixed_precision='mixed_bfloat16')
+    accelerator.set_policy()
+    try:
+        model = tf.keras.Sequential([
+            tf.keras.Input((28, 28, 1)),
+            tf.keras.layers.Conv2D(4, 3, activation='relu'),
+            tf.keras.layers.Flatten(),
+            tf.keras.layers.Dense(10, activation='softmax', dtype='float32')
+        ])
+        model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+        images = tf.random.uniform((8, 28, 28, 1))
+        model.fit(images, tf.zeros(8, dtype=tf.int32), epochs=1, verbose=0)
+
+        exported = accelerator.float32_copy(model)
+    finally:
+        tf.keras.mixed_precision.set_global_policy('float32')
+
+    assert tf.keras.mixed_precision.global_policy().name == 'float32'
+    assert all(layer.compute_dtype == 'float32' for layer in exported.layers)
+    assert exported.compiled
+    assert export_tflite(exported, tmp_path / 'model.tflite').stat().st_size > 0
+    assert abs(exported.predict(images, verbose=0) - model.predict(images, verbose=0)).max() < 0.05
@@ -0,0 +1,233 @@
+import io
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.api import main
+from src.serving.payload import encode_npy
+from src.serving.prediction_log import read_prediction_log
+from src.serving.versions import ServedVersion, VersionRouter
+
+
+class FakeEngine:
+    """Stand-in inference engine that predicts the mean pixel bucket"""
+
+    name = 'fake'
+    version = 'test'
+
+    def predict(self, images):
+        labels = np.clip((images.reshape(len(images), -1).mean(axis=1) * 10).astype(int), 0, 9)
+        return np.eye(10, dtype='float32')[labels]
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'load_model', lambda: main.activate_engine(FakeEngine()))
+    monkeypatch.setitem(main.config.base['serving']['prediction_log'], 'log_dir', str(tmp_path / 'prediction_log'))
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_predict(client):
+    """Single-image predictions go through the batcher"""
+    response = client.post('/predict', json={'image': [128] * 784})
+
+    assert response.status_code == 200
+    assert response.json()['prediction'] == 5
+
+
+def test_repeated_predictions_hit_the_cache(client):
+    """Identical images are answered from the prediction cache"""
+    for _ in range(2):
+        assert client.post('/predict', json={'image': [64] * 784}).status_code == 200
+
+    stats = client.get('/stats').json()['cache']
+    assert stats['hits_total'] == 1
+    assert stats['model_version'] == 'test'
+
+
+def test_predict_batch_json(client):
+    """JSON batches return one prediction per image"""
+    response = client.post('/predict/batch', json={'images': [[0] * 784, [255] * 784]})
+
+    assert response.status_code == 200
+    assert response.json()['predictions'] == [0, 9]
+
+
+def test_predict_batch_raw_bytes(client):
+    """Raw uint8 bodies are decoded into N images"""
+    images = np.stack([np.full((28, 28), v, dtype=np.uint8) for v in (0, 128, 255)])
+    response = client.post(
+        '/predict/batch', content=images.tobytes(),
+        headers={'Content-Type': 'application/octet-stream'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()['predictions'] == [0, 5, 9]
+
+
+def test_predict_batch_npy_response(client):
+    """Binary clients can request probabilities back as .npy"""
+    images = np.full((4, 28, 28), 255, dtype=np.uint8)
+    response = client.post(
+        '/predict/batch', content=encode_npy(images),
+        headers={'Content-Type': 'application/x-npy', 'Accept': 'application/x-npy'}
+    )
+
+    probabilities = np.load(io.BytesIO(response.content))
+    assert probabilities.shape == (4, 10)
+    assert np.argmax(probabilities, axis=1).tolist() == [9] * 4
+
+
+def test_predict_batch_rejects_bad_payload(client):
+    """Malformed bodies are a client error"""
+    response = client.post(
+        '/predict/batch', content=b'\x00' * 10,
+        headers={'Content-Type': 'application/octet-stream'}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('body', [b'{"images": [', b'{"pixels": []}', b'[[0, 0]]'])
+def test_predict_batch_rejects_bad_json(client, body):
+    """Malformed JSON, a missing images field and non-object bodies are client errors"""
+    response = client.post('/predict/batch', content=body, headers={'Content-Type': 'application/json'})
+
+    assert response.status_code == 400
+
+
+def test_drift_endpoint_tracks_live_traffic(client):
+    """Served images are fed to the streaming drift monitor"""
+    client.post('/predict/batch', json={'images': [[0] * 784, [255] * 784]})
+    main.drift_monitor.update()
+
+    response = client.get('/drift')
+    assert response.status_code == 200
+    assert response.json()['monitor']['images_seen'] == 2
+
+
+def test_metrics_endpoint_exposes_stage_timings(client):
+    """Prediction stages and model info are exported in text format"""
+    client.post('/predict', json={'image': [32] * 784})
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'mnist_stage_seconds_count{endpoint="/predict",stage="inference"}' in response.text
+    assert 'mnist_model_info{engine="fake",version="test"} 1' in response.text
+    assert 'mnist_http_requests_total{path="/predict",status="200"}' in response.text
+
+
+def test_ready_after_startup(client):
+    """Readiness is reported separately from liveness once the model is warm"""
+    response = client.get('/ready')
+
+    assert response.status_code == 200
+    assert response.json()['status'] == 'ready'
+    assert client.get('/health').status_code == 200
+
+
+def test_background_load_is_not_ready_until_model_loads(monkeypatch, tmp_path):
+    """With background loading the worker answers /health but refuses traffic until warm"""
+    loaded = threading.Event()
+
+    def slow_load_model():
+        loaded.wait(timeout=10)
+        main.activate_engine(FakeEngine())
+
+    monkeypatch.setattr(main, 'load_model', slow_load_model)
+    monkeypatch.setitem(main.config.base['serving'], 'startup', {'background_load': True})
+    monkeypatch.setitem(main.config.base['serving']['prediction_log'], 'log_dir', str(tmp_path / 'prediction_log'))
+    with TestClient(main.app) as test_client:
+        assert test_client.get('/health').status_code == 200
+        assert test_client.get('/ready').status_code == 503
+        assert test_client.post('/predict', json={'image': [0] * 784}).status_code == 503
+
+        loaded.set()
+        for _ in range(100):
+            if test_client.get('/ready').status_code == 200:
+                break
+            time.sleep(0.02)
+        assert test_client.get('/ready').json()['status'] == 'ready'
+        assert test_client.post('/predict', json={'image': [0] * 784}).status_code == 200
+
+
+def test_predictions_are_logged(client, tmp_path):
+    """Served images, predictions and model version reach the prediction log"""
+    client.post('/predict', json={'image': [128] * 784})
+    client.post('/predict/batch', json={'images': [[0] * 784, [255] * 784]})
+    main.prediction_log.flush()
+
+    records = read_prediction_log(tmp_path / 'prediction_log')
+    assert records['prediction'].tolist() == [5, 0, 9]
+    assert records['pixels'][0].tolist() == [128] * 784
+    assert set(records['model_version']) == {b'test'}
+
+
+def test_shadow_version_is_compared_with_primary(monkeypatch, tmp_path):
+    """A shadow candidate sees served traffic without changing responses"""
+    shadow = ServedVersion('staging', FakeEngine(), mode='shadow')
+    monkeypatch.setattr(main, 'load_model', lambda: main.activate_engine(FakeEngine()))
+    monkeypatch.setattr(main, 'create_router', lambda: VersionRouter([shadow]))
+    monkeypatch.setitem(main.config.base['serving']['prediction_log'], 'log_dir', str(tmp_path / 'prediction_log'))
+    with TestClient(main.app) as client:
+        response = client.post('/predict/batch', json={'images': [[0] * 784, [255] * 784]})
+        assert response.json()['predictions'] == [0, 9]
+        main.router.drain()
+
+        stats = client.get('/versions').json()
+        assert stats['versions']['staging']['agreement_rate'] == 1.0
+        assert stats['primary']['images_total'] == 2
+
+
+def test_primary_time_and_shadow_copies_follow_model_batches(monkeypatch, tmp_path):
+    """Coalesced /predict requests count as one primary model call and one shadow batch"""
+    class SlowEngine(FakeEngine):
+        def predict(self, images):
+            time.sleep(0.05)
+            return super().predict(images)
+
+    shadow = ServedVersion('staging', FakeEngine(), mode='shadow')
+    monkeypatch.setattr(main, 'load_model', lambda: main.activate_engine(SlowEngine()))
+    monkeypatch.setattr(main, 'create_router', lambda: VersionRouter([shadow], max_pending=64))
+    monkeypatch.setattr(main, 'create_cache', lambda: None)
+    monkeypatch.setitem(main.config.base['serving']['prediction_log'], 'log_dir', str(tmp_path / 'prediction_log'))
+    with TestClient(main.app) as client:
+        threads = [threading.Thread(target=client.post, args=('/predict',), kwargs={'json': {'image': [i] * 784}})
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        main.router.drain()
+
+        stats = client.get('/versions').json()
+    primary = stats['primary']
+    assert primary['images_total'] == 8
+    assert primary['requests_total'] < 8
+    # Busy time is model time per batch, not request wall time summed per image
+    assert primary['busy_s'] < 0.05 * primary['requests_total'] + 0.05
+    assert stats['versions']['staging']['requests_total'] == primary['requests_total']
+    assert stats['versions']['staging']['images_total'] == 8
+
+
+def test_broken_candidate_does_not_block_the_primary(monkeypatch, tmp_path):
+    """A candidate that fails to load is skipped and reported; the primary still serves"""
+    monkeypatch.setattr(main, 'load_model', lambda: main.activate_engine(FakeEngine()))
+    monkeypatch.setitem(main.config.base['serving'], 'versions', {
+        'candidates': [{'name': 'next', 'source': 'directory', 'model_dir': str(tmp_path / 'missing'), 'mode': 'shadow'}]
+    })
+    monkeypatch.setitem(main.config.base['serving']['prediction_log'], 'log_dir', str(tmp_path / 'prediction_log'))
+    with TestClient(main.app) as client:
+        assert client.get('/ready').status_code == 200
+        assert client.post('/predict', json={'image': [128] * 784}).status_code == 200
+        assert 'next' in client.get('/versions').json()['failed']
@@ -0,0 +1,107 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.batch_inference import BulkScorer, decode_batch, plan_input, write_png_listing
+
+
+class MeanEngine:
+    """Predicts the mean pixel bucket; optionally fails after a number of calls"""
+
+    name = 'mean'
+    version = 'test'
+
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def predict(self, images):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("interrupted")
+        labels = np.clip((images.reshape(len(images), -1).mean(axis=1) * 10).astype(int), 0, 9)
+        return np.eye(10, dtype='float32')[labels]
+
+
+def make_images(count):
+    return np.repeat((np.arange(count) * 25 % 256).astype(np.uint8), 28 * 28).reshape(count, 28, 28)
+
+
+def expected_predictions(images):
+    return np.clip((images.reshape(len(images), -1).mean(axis=1) / 255.0 * 10).astype(int), 0, 9)
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_npz_members_are_streamed_in_batches(tmp_path, compressed):
+    images = make_images(10)
+    save = np.savez_compressed if compressed else np.savez
+    save(tmp_path / 'data.npz', labels=np.arange(10), images=images)
+
+    num_images, task_fn, _ = plan_input(tmp_path / 'data.npz')
+    batches = [decode_batch(task) for task in task_fn(0, 4)]
+
+    assert num_images == 10
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    np.testing.assert_allclose(np.concatenate(batches)[..., 0], images / 255.0, rtol=1e-6)
+
+
+def test_score_npy_writes_predictions(tmp_path):
+    images = make_images(10)
+    np.save(tmp_path / 'images.npy', images)
+
+    summary = BulkScorer(MeanEngine(), batch_size=4, num_workers=1).score(tmp_path / 'images.npy', tmp_path / 'out')
+
+    np.testing.assert_array_equal(np.load(tmp_path / 'out' / 'predictions.npy'), expected_predictions(images))
+    assert np.load(tmp_path / 'out' / 'probabilities.npy').shape == (10, 10)
+    assert summary['images_scored'] == 10
+    assert summary['images_per_sec'] > 0
+
+
+def test_score_png_directory(tmp_path):
+    from PIL import Image
+    images = make_images(3)
+    (tmp_path / 'pngs').mkdir()
+    for i, image in enumerate(images):
+        Image.fromarray(image).save(tmp_path / 'pngs' / f'{i}.png')
+
+    BulkScorer(MeanEngine(), batch_size=2, num_workers=1).score(tmp_path / 'pngs', tmp_path / 'out')
+
+    np.testing.assert_array_equal(np.load(tmp_path / 'out' / 'predictions.npy'), expected_predictions(images))
+    assert (tmp_path / 'out' / 'files.txt').read_text().split() == [str(tmp_path / 'pngs' / f'{i}.png') for i in range(3)]
+
+
+def test_png_listing_is_sorted_in_chunks(tmp_path):
+    """Chunked listing matches a full sort of the directory tree"""
+    for name in ('b/3.png', 'a/2.png', 'c.png', 'a/1.png', 'b/0.png', 'notes.txt'):
+        (tmp_path / 'pngs' / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / 'pngs' / name).write_bytes(b'')
+
+    count = write_png_listing(tmp_path / 'pngs', tmp_path / 'files.txt', chunk_size=2)
+
+    expected = sorted(str(p) for p in (tmp_path / 'pngs').rglob('*.png'))
+    assert count == 5
+    assert (tmp_path / 'files.txt').read_text().split() == expected
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['files.txt', 'pngs']
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    images = make_images(10)
+    np.save(tmp_path / 'images.npy', images)
+    settings = dict(batch_size=2, num_workers=1, prefetch_batches=1, checkpoint_every=1)
+
+    with pytest.raises(RuntimeError):
+        BulkScorer(MeanEngine(fail_after=2), **settings).score(tmp_path / 'images.npy', tmp_path / 'out')
+    assert json.loads((tmp_path / 'out' / 'checkpoint.json').read_text())['images_done'] == 4
+
+    engine = MeanEngine()
+    summary = BulkScorer(engine, **settings).score(tmp_path / 'images.npy', tmp_path / 'out')
+
+    assert engine.calls == 3
+    assert summary['images_scored'] == 6
+    np.testing.assert_array_equal(np.load(tmp_path / 'out' / 'predictions.npy'), expected_predictions(images))
@@ -0,0 +1,104 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.batcher import MicroBatcher, QueueFullError
+
+
+def fake_predict(images):
+    """Return one-hot probabilities keyed off the first pixel"""
+    labels = images.reshape(len(images), -1)[:, 0].astype(int)
+    return np.eye(10, dtype='float32')[labels]
+
+
+def test_concurrent_requests_are_coalesced():
+    """Concurrent submissions should share one model call"""
+    calls = []
+
+    def predict(images):
+        calls.append(len(images))
+        return fake_predict(images)
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        images = [np.full((28, 28, 1), i, dtype='float32') for i in range(8)]
+        results = await asyncio.gather(*(batcher.submit(image) for image in images))
+        stats = batcher.get_stats()
+        await batcher.stop()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+
+    assert calls == [8]
+    assert [int(np.argmax(r)) for r in results] == list(range(8))
+    assert stats['batches_total'] == 1
+    assert stats['avg_batch_size'] == 8
+
+
+def test_batch_is_flushed_after_wait_budget():
+    """A lone request must not wait for the batch to fill"""
+    async def run():
+        batcher = MicroBatcher(fake_predict, max_batch_size=32, max_wait_ms=1)
+        await batcher.start()
+        result = await asyncio.wait_for(batcher.submit(np.full((28, 28, 1), 3, dtype='float32')), 1.0)
+        await batcher.stop()
+        return result
+
+    assert int(np.argmax(asyncio.run(run()))) == 3
+
+
+def test_full_queue_rejects_requests():
+    """Submissions beyond the queue depth should be rejected"""
+    async def run():
+        batcher = MicroBatcher(fake_predict, max_batch_size=1, max_wait_ms=1, max_queue_size=1)
+        await batcher.start()
+        image = np.zeros((28, 28, 1), dtype='float32')
+        first = asyncio.ensure_future(batcher.submit(image))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await batcher.submit(image)
+        await first
+        stats = batcher.get_stats()
+        await batcher.stop()
+        return stats
+
+    assert asyncio.run(run())['rejected_total'] == 1
+
+
+def test_model_errors_propagate_to_every_request():
+    """A failing model call should fail each request in the batch"""
+    def broken(images):
+        raise ValueError("boom")
+
+    async def run():
+        batcher = MicroBatcher(broken, max_batch_size=4, max_wait_ms=20)
+        await batcher.start()
+        image = np.zeros((28, 28, 1), dtype='float32')
+        results = await asyncio.gather(*(batcher.submit(image) for _ in range(4)), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(run()))
+
+
+def test_stop_answers_a_half_collected_batch():
+    """Requests taken off the queue before stop() still get a result"""
+    async def run():
+        batcher = MicroBatcher(fake_predict, max_batch_size=8, max_wait_ms=10000)
+        await batcher.start()
+        images = [np.full((28, 28, 1), label, dtype='float32') for label in (1, 2)]
+        pending = [asyncio.ensure_future(batcher.submit(image)) for image in images]
+        # Let the worker move both requests into its batch and wait for more
+        await asyncio.sleep(0.01)
+        assert batcher.get_stats()['queue_depth'] == 0
+        await batcher.stop()
+        return await asyncio.wait_for(asyncio.gather(*pending), 1.0)
+
+    assert [int(np.argmax(r)) for r in asyncio.run(run())] == [1, 2]
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.cache import InMemoryBackend, PredictionCache, SQLiteBackend
+
+
+def make_image(value):
+    return np.full((28, 28, 1), value, dtype='float32')
+
+
+def test_hits_and_misses():
+    """Identical images hit, different images miss"""
+    cache = PredictionCache(InMemoryBackend(), model_version='v1')
+    probabilities = np.eye(10, dtype='float32')[3]
+
+    assert cache.get(make_image(0.5)) is None
+    cache.put(make_image(0.5), probabilities)
+    np.testing.assert_array_equal(cache.get(make_image(0.5)), probabilities)
+    assert cache.get(make_image(0.25)) is None
+
+    stats = cache.get_stats()
+    assert stats['hits_total'] == 1
+    assert stats['misses_total'] == 2
+
+
+def test_lru_eviction_is_bounded():
+    """The least recently used entry is evicted once max_entries is reached"""
+    cache = PredictionCache(InMemoryBackend(max_entries=2), model_version='v1')
+    for value in (0.1, 0.2):
+        cache.put(make_image(value), np.zeros(10))
+    cache.get(make_image(0.1))
+    cache.put(make_image(0.3), np.zeros(10))
+
+    assert cache.get(make_image(0.2)) is None
+    assert cache.get(make_image(0.1)) is not None
+    assert cache.get_stats()['evictions_total'] == 1
+    assert cache.get_stats()['entries'] == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(InMemoryBackend(ttl_s=0.01), model_version='v1')
+    cache.put(make_image(0.5), np.zeros(10))
+    time.sleep(0.02)
+
+    assert cache.get(make_image(0.5)) is None
+
+
+def test_new_model_version_invalidates():
+    """Loading a different model must not serve the old model's results"""
+    cache = PredictionCache(InMemoryBackend(), model_version='v1')
+    cache.put(make_image(0.5), np.zeros(10))
+    cache.set_model_version('v2')
+
+    assert cache.get(make_image(0.5)) is None
+    assert cache.get_stats()['invalidations_total'] == 1
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    """Two caches on one file see each other's entries, like two workers would"""
+    path = tmp_path / 'predictions.sqlite'
+    first = PredictionCache(SQLiteBackend(path), model_version='v1')
+    second = PredictionCache(SQLiteBackend(path), model_version='v1')
+    probabilities = np.eye(10, dtype='float32')[7]
+
+    first.put(make_image(0.5), probabilities)
+
+    np.testing.assert_array_equal(second.get(make_image(0.5)), probabilities)
+
+
+def test_model_swap_keeps_other_workers_entries_in_a_shared_backend(tmp_path):
+    """One worker reloading must not wipe what another already cached for the new version"""
+    path = tmp_path / 'predictions.sqlite'
+    reloading = PredictionCache(SQLiteBackend(path), model_version='v1')
+    other = PredictionCache(SQLiteBackend(path), model_version='v2')
+    probabilities = np.eye(10, dtype='float32')[4]
+    other.put(make_image(0.5), probabilities)
+
+    reloading.set_model_version('v2')
+
+    np.testing.assert_array_equal(reloading.get(make_image(0.5)), probabilities)
+    assert reloading.get_stats()['invalidations_total'] == 1
+
+
+def test_sqlite_lookups_run_off_the_event_loop(tmp_path):
+    """SQLite reads and writes happen in a worker thread; in-memory ones stay inline"""
+    threads = []
+
+    def record_thread(images, model_version):
+        threads.append(threading.get_ident())
+        return [None] * len(images)
+
+    async def run(cache):
+        await cache.run(record_thread, [make_image(0.5)], 'v1')
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run(PredictionCache(SQLiteBackend(tmp_path / 'predictions.sqlite'))))
+    assert threads[-1] != loop_thread
+    loop_thread = asyncio.run(run(PredictionCache(InMemoryBackend())))
+    assert threads[-1] == loop_thread
+
+
+def test_get_many_and_put_many_round_trip(tmp_path):
+    cache = PredictionCache(SQLiteBackend(tmp_path / 'predictions.sqlite'), model_version='v1')
+    images = np.stack([make_image(0.25), make_image(0.5)])
+    probabilities = np.eye(10, dtype='float32')[[1, 2]]
+
+    async def run():
+        assert await cache.run(cache.get_many, images, 'v1') == [None, None]
+        await cache.run(cache.put_many, images, probabilities, 'v1')
+        return await cache.run(cache.get_many, images, 'v1')
+
+    np.testing.assert_array_equal(np.stack(asyncio.run(run())), probabilities)
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.training.callbacks import ProfilingCallback
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.logged = []
+
+    def log_metrics(self, metrics, step=None):
+        self.logged.append((step, metrics))
+
+
+def test_profiling_callback_records_steps_and_logs_each_epoch(tmp_path):
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(28, 28, 1)),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(10, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy')
+    x = np.random.rand(64, 28, 28, 1).astype('float32')
+    y = np.arange(64) % 10
+    dataset = tf.data.Dataset.from_tensor_slices((x, y)).batch(16)
+
+    tracker = RecordingTracker()
+    callback = ProfilingCallback(
+        len(x), tracker=tracker, input_dataset=dataset, input_probe_steps=2,
+        profile_steps=(1, 3), profile_dir=tmp_path / 'trace'
+    )
+    model.fit(dataset, epochs=2, callbacks=[callback], verbose=0)
+
+    assert [step for step, _ in tracker.logged] == [0, 1]
+    stats = callback.epoch_stats[-1]
+    assert stats['steps'] == 4
+    assert stats['step_time_ms_p50'] > 0
+    assert stats['peak_rss_mb'] > 0
+    assert 0 < stats['input_bound_ratio'] <= 1
+    assert 'examples_per_sec' in tracker.logged[-1][1]
+    assert any((tmp_path / 'trace').rglob('*.xplane.pb'))
@@ -0,0 +1,98 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.cascade import CascadeEngine, DenseEngine, load_cascade
+from src.serving.engines import InferenceEngine
+from src.training.cascade import CascadeTrainer
+
+
+class RecordingEngine(InferenceEngine):
+    """Full-model stand-in predicting 0 for bright images and 9 otherwise, recording batch sizes"""
+
+    name = 'recording'
+    version = 'full'
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, images):
+        self.batch_sizes.append(len(images))
+        bright = images.reshape(len(images), -1).mean(axis=1) > 0.5
+        return np.eye(10, dtype='float32')[np.where(bright, 0, 9)]
+
+
+def confident_on_bright_images():
+    """First stage whose confidence in class 0 grows with mean brightness"""
+    weights = np.zeros((784, 10), dtype='float32')
+    weights[:, 0] = 20.0 / 784
+    return DenseEngine([weights], [np.zeros(10, dtype='float32')])
+
+
+def test_dense_engine_matches_keras(tmp_path):
+    """Weights copied from Keras give the same probabilities after a save and load"""
+    trainer = CascadeTrainer(tmp_path, hidden_units=[8])
+    model = trainer.build_first_stage()
+    images = np.random.RandomState(0).rand(5, 28, 28, 1).astype('float32')
+
+    engine = DenseEngine.from_keras(model)
+    loaded = DenseEngine.from_path(engine.save(tmp_path / 'first_stage.npz'))
+
+    np.testing.assert_allclose(loaded.predict(images), model.predict(images, verbose=0), atol=1e-5)
+
+
+def test_uncertain_images_are_escalated_in_one_batch():
+    full_model = RecordingEngine()
+    cascade = CascadeEngine(confident_on_bright_images(), full_model, threshold=0.9)
+    images = np.zeros((6, 28, 28, 1), dtype='float32')
+    images[:2] = 1.0
+
+    predictions = cascade.predict(images).argmax(axis=1)
+
+    assert predictions.tolist() == [0, 0, 9, 9, 9, 9]
+    assert full_model.batch_sizes == [4]
+    assert cascade.get_stats()['escalated_fraction'] == 4 / 6
+
+
+def test_calibration_picks_lowest_threshold_within_accuracy_budget(tmp_path):
+    """Thresholds that let the first stage answer wrongly are rejected"""
+    trainer = CascadeTrainer(tmp_path, thresholds=[0.5, 0.9, 0.99], max_accuracy_drop=0.0,
+                             benchmark_batch_size=4)
+    trainer.first_stage = confident_on_bright_images()
+    images = np.zeros((8, 28, 28, 1), dtype='float32')
+    images[:4] = 1.0
+    images[4:6] = 0.3
+    labels = np.array([0, 0, 0, 0, 9, 9, 9, 9])
+
+    # Dim images are class 9 but get ~0.98 first-stage confidence in class 0
+    assert trainer.calibrate(RecordingEngine(), images, labels) == 0.99
+    report = trainer.evaluate(RecordingEngine(), images, labels)
+    trainer.save(report)
+
+    assert report[0]['threshold'] is None and report[0]['accuracy'] == 1.0
+    assert [row['accuracy'] for row in report[1:]] == [0.75, 0.75, 1.0]
+    assert [row['escalated_fraction'] for row in report[1:]] == [0.25, 0.25, 0.5]
+    assert json.loads((tmp_path / 'cascade.json').read_text())['threshold'] == 0.99
+    assert load_cascade(RecordingEngine(), tmp_path).threshold == 0.99
+
+
+def test_cascade_is_disabled_when_no_threshold_meets_the_budget(tmp_path):
+    """Falling back to the strictest threshold would still ship an accuracy regression"""
+    trainer = CascadeTrainer(tmp_path, thresholds=[0.5, 0.9], max_accuracy_drop=0.0, benchmark_batch_size=4)
+    trainer.first_stage = confident_on_bright_images()
+    images = np.zeros((8, 28, 28, 1), dtype='float32')
+    images[:4] = 1.0
+    images[4:6] = 0.3
+    labels = np.array([0, 0, 0, 0, 9, 9, 9, 9])
+
+    assert trainer.calibrate(RecordingEngine(), images, labels) is None
+    trainer.save(trainer.evaluate(RecordingEngine(), images, labels))
+
+    assert json.loads((tmp_path / 'cascade.json').read_text())['enabled'] is False
+    full_model = RecordingEngine()
+    assert load_cascade(full_model, tmp_path) is full_model
@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_preprocessor import DataPreprocessor
+
+
+def make_data(seed=0):
+    rng = np.random.RandomState(seed)
+    x_train = rng.randint(0, 256, size=(300, 28, 28)).astype(np.uint8)
+    x_test = rng.randint(0, 256, size=(80, 28, 28)).astype(np.uint8)
+    x_train[[3, 50]] = 0
+    x_test[7] = 0
+    return x_train, np.arange(300) % 10, x_test, np.arange(80) % 10
+
+
+def test_chunked_matches_eager_preprocessing():
+    """Chunked mode yields the same cleaned splits as the step-by-step methods"""
+    data = make_data()
+    eager = DataPreprocessor().preprocess(*data)
+    chunked = DataPreprocessor().preprocess_chunked(*data, chunk_size=64)
+
+    assert len(chunked['x_train']) + len(chunked['x_val']) == 298
+    assert len(chunked['x_test']) == 79
+    for name, array in eager.items():
+        assert chunked[name].shape == array.shape
+        np.testing.assert_array_equal(chunked[name], array)
+
+
+def test_chunked_float16_output():
+    data = make_data()
+    chunked = DataPreprocessor().preprocess_chunked(*data, chunk_size=50, dtype='float16')
+
+    assert chunked['x_train'].dtype == np.float16
+    assert chunked['x_train'].shape[1:] == (28, 28, 1)
+    assert 0.0 <= chunked['x_train'].min() and chunked['x_train'].max() <= 1.0
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.monitoring.data_validator import DataValidator
+
+
+def make_data(n=500, seed=0):
+    rng = np.random.RandomState(seed)
+    return rng.randint(0, 256, size=(n, 28, 28)).astype(np.uint8), np.arange(n) % 10
+
+
+def test_checks_match_multi_pass_reference(tmp_path):
+    x, y = make_data()
+    results = DataValidator(chunk_size=64, cache_dir=tmp_path).validate(x, y)
+
+    assert all(results['checks'].values())
+    assert results['class_counts'] == np.bincount(y, minlength=10).tolist()
+    assert results['pixel_stats']['min'] == x.min()
+    assert results['pixel_stats']['max'] == x.max()
+    np.testing.assert_allclose(results['pixel_stats']['mean'], x.mean())
+    np.testing.assert_allclose(results['pixel_stats']['std'], x.std())
+
+
+def test_detects_duplicates_nans_and_bad_labels(tmp_path):
+    x, y = make_data()
+    x = x.astype('float32')
+    x[10] = x[3]
+    x[20] = x[3]
+    x[7, 0, 0] = np.nan
+    y[5] = 12
+
+    results = DataValidator(chunk_size=64, cache_dir=tmp_path).validate(x, y)
+
+    assert results['duplicate_count'] == 2
+    assert results['checks']['no_nulls'] is False
+    assert results['checks']['labels_range'] is False
+    assert results['checks']['pixel_range'] is True
+
+
+def test_results_are_cached_by_dataset_hash(tmp_path, monkeypatch):
+    x, y = make_data()
+    validator = DataValidator(cache_dir=tmp_path)
+    first = validator.validate(x, y)
+
+    def fail(*args):
+        raise AssertionError("cached dataset was validated again")
+    monkeypatch.setattr(validator, '_compute', fail)
+
+    assert validator.validate(x, y) == first
+    assert (tmp_path / f"{first['dataset_hash']}.json").exists()
+
+    # Any change to the data is a different dataset
+    x[0, 0, 0] ^= 1
+    assert validator.dataset_hash(x, y) != first['dataset_hash']
+
+
+def test_report_is_only_built_on_demand(tmp_path):
+    x, y = make_data()
+    passed, report = DataValidator(cache_dir=tmp_path).validate_mnist_data(x, y)
+
+    assert passed is True
+    assert report is None
@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.dataset_builder import DatasetBuilder
+from src.utils.config import config
+
+
+def test_batch_size_defaults_to_config():
+    assert DatasetBuilder().batch_size == config.base['model']['batch_size']
+
+
+def test_uint8_images_are_normalized_on_the_fly():
+    x = np.full((10, 28, 28), 255, dtype=np.uint8)
+    y = np.arange(10)
+    images, labels = next(iter(DatasetBuilder(batch_size=4, cache='none').build(x, y)))
+
+    assert images.shape == (4, 28, 28, 1)
+    assert float(images.numpy().max()) == 1.0
+    assert labels.numpy().tolist() == [0, 1, 2, 3]
+
+
+def test_training_pipeline_with_augmentation_and_disk_cache(tmp_path):
+    x = np.random.rand(20, 28, 28, 1).astype('float32')
+    y = np.arange(20) % 10
+    builder = DatasetBuilder(batch_size=8, cache=str(tmp_path), augment=True, deterministic=False)
+    dataset = builder.build(x, y, training=True, name='train')
+
+    sizes = [len(labels) for _, labels in dataset]
+    assert sizes == [8, 8, 4]
+    assert all(images.shape[1:] == (28, 28, 1) for images, _ in dataset)
+    assert any(path.name.startswith('train') for path in tmp_path.iterdir())
+
+
+def test_disk_cache_is_keyed_by_data(tmp_path):
+    """Changed arrays are read fresh instead of from an earlier run's cache files"""
+    builder = DatasetBuilder(batch_size=10, cache=str(tmp_path))
+    y = np.arange(10)
+    for value in (0.25, 0.75):
+        x = np.full((10, 28, 28, 1), value, dtype='float32')
+        # A full pass writes the cache files
+        (images, _), = list(builder.build(x, y, name='val'))
+        assert float(images.numpy().max()) == value
+
+    # The first run's files were removed when the data changed
+    prefixes = {path.name.split('.')[0] for path in tmp_path.iterdir()}
+    assert len(prefixes) == 1
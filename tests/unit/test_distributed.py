@@ -0,0 +1,50 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.dataset_builder import DatasetBuilder
+from src.training.distributed import cluster_from_env, is_chief, local_tf_configs, scale_learning_rate
+
+
+def test_local_tf_configs_describe_one_cluster(monkeypatch):
+    tf_configs = local_tf_configs(3, base_port=30000)
+
+    assert len(tf_configs) == 3
+    for index, tf_config in enumerate(tf_configs):
+        parsed = json.loads(tf_config)
+        assert parsed['cluster']['worker'] == ['localhost:30000', 'localhost:30001', 'localhost:30002']
+        assert parsed['task'] == {'type': 'worker', 'index': index}
+
+        monkeypatch.setenv('TF_CONFIG', tf_config)
+        assert cluster_from_env() == (3, index)
+        assert is_chief() == (index == 0)
+
+
+def test_single_worker_without_tf_config(monkeypatch):
+    monkeypatch.delenv('TF_CONFIG', raising=False)
+
+    assert cluster_from_env() == (1, 0)
+    assert is_chief()
+
+
+def test_learning_rate_scales_linearly_with_global_batch():
+    assert scale_learning_rate(0.001, 32, 32) == 0.001
+    assert np.isclose(scale_learning_rate(0.001, 128, 32), 0.004)
+
+
+def test_shards_are_disjoint_and_cover_the_data():
+    x = np.arange(10, dtype=np.float32).reshape(10, 1)
+    y = np.arange(10)
+    builder = DatasetBuilder(batch_size=4, cache='none')
+
+    seen = []
+    for shard_index in range(3):
+        dataset = builder.build(x, y, num_shards=3, shard_index=shard_index)
+        seen.extend(int(label) for _, labels in dataset for label in labels.numpy())
+
+    assert sorted(seen) == list(range(10))
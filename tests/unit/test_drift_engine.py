@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.monitoring.data_drift import DataDriftMonitor
+from src.monitoring.drift_engine import DriftEngine, ReferenceStatistics, feature_histograms
+
+
+def make_images(n, seed, shift=0):
+    rng = np.random.RandomState(seed)
+    images = rng.randint(0, 120, size=(n, 28, 28)) + shift
+    return np.clip(images, 0, 255).astype(np.uint8), rng.randint(0, 10, size=n)
+
+
+def test_feature_histograms_match_numpy_histogram():
+    values = np.random.RandomState(0).randint(0, 256, size=(500, 6)).astype(np.uint8)
+    counts = feature_histograms(values, n_bins=8, scale=255.0, chunk_size=64)
+
+    for feature in range(6):
+        expected, _ = np.histogram(values[:, feature] / 255.0, bins=8, range=(0.0, 1.0))
+        np.testing.assert_array_equal(counts[feature], expected)
+
+
+def test_uint8_and_normalized_inputs_agree():
+    """Raw pixels and [0, 1] floats produce the same reference statistics"""
+    x, y = make_images(300, seed=0)
+    raw = ReferenceStatistics().fit(x, y)
+    normalized = ReferenceStatistics().fit(x.astype('float32') / 255.0, y)
+
+    np.testing.assert_array_equal(raw.pixel_histograms, normalized.pixel_histograms)
+    np.testing.assert_allclose(raw.pixel_mean, normalized.pixel_mean, rtol=1e-5)
+
+
+def test_same_distribution_does_not_drift_but_shift_does():
+    x_ref, y_ref = make_images(2000, seed=0)
+    x_same, y_same = make_images(1000, seed=1)
+    x_shifted, _ = make_images(1000, seed=2, shift=100)
+    engine = DriftEngine(ReferenceStatistics().fit(x_ref, y_ref))
+
+    same = engine.score(x_same, y_same)
+    shifted = engine.score(x_shifted, np.zeros(1000, dtype=int))
+
+    assert not same['dataset_drift']
+    assert same['pixel_psi_mean'] < 0.05
+    assert shifted['dataset_drift']
+    assert shifted['label_drift']
+    assert shifted['pixel_wasserstein_mean'] > same['pixel_wasserstein_mean']
+
+
+def test_reference_statistics_round_trip(tmp_path):
+    x, y = make_images(200, seed=0)
+    stats = ReferenceStatistics().fit(x, y, embeddings=np.random.rand(200, 4))
+    loaded = ReferenceStatistics.load(stats.save(tmp_path / 'reference.npz'))
+
+    np.testing.assert_array_equal(loaded.pixel_histograms, stats.pixel_histograms)
+    np.testing.assert_array_equal(loaded.label_counts, stats.label_counts)
+    assert loaded.count == 200
+
+
+def test_monitor_uses_numpy_engine_by_default():
+    x_ref, y_ref = make_images(500, seed=0)
+    monitor = DataDriftMonitor()
+    monitor.set_reference_data(x_ref, y_ref)
+
+    result = monitor.check_drift(*make_images(200, seed=1))
+
+    assert isinstance(result, dict)
+    assert monitor.reference_data is None
+    assert not result['dataset_drift']
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.engines import KERAS_MODEL_NAME, TFLITE_MODEL_NAME, export_tflite, load_engine
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    """Save a small CNN and its TFLite export like the training pipeline does"""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(28, 28, 1)),
+        tf.keras.layers.Conv2D(4, 3, activation='relu'),
+        tf.keras.layers.MaxPooling2D(),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(10, activation='softmax')
+    ])
+    directory = tmp_path_factory.mktemp('deployed')
+    model.save(directory / KERAS_MODEL_NAME)
+    export_tflite(model, directory / TFLITE_MODEL_NAME)
+    return directory
+
+
+def test_engines_agree_on_argmax(model_dir):
+    """Every engine must predict the same classes as Keras"""
+    images = np.random.RandomState(0).rand(64, 28, 28, 1).astype('float32')
+    reference = load_engine('keras', model_dir).predict(images)
+
+    for name in ('tf_function', 'tflite'):
+        probabilities = load_engine(name, model_dir).predict(images)
+        assert probabilities.shape == (64, 10)
+        np.testing.assert_array_equal(np.argmax(probabilities, axis=1), np.argmax(reference, axis=1))
+        np.testing.assert_allclose(probabilities, reference, atol=1e-5)
+
+
+def test_engines_handle_changing_batch_sizes(model_dir):
+    """Engines must serve any batch size after a single load"""
+    for name in ('tf_function', 'tflite'):
+        engine = load_engine(name, model_dir)
+        for batch_size in (1, 7, 32, 1):
+            assert engine.predict(np.zeros((batch_size, 28, 28, 1), dtype='float32')).shape == (batch_size, 10)
+
+
+def test_load_engine_rejects_unknown_name(model_dir):
+    with pytest.raises(ValueError):
+        load_engine('onnx', model_dir)
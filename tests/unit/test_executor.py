@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.executor import ExecutorSaturatedError, InferenceExecutor, InferenceTimeoutError
+
+
+def test_inference_runs_off_the_event_loop():
+    """Work runs in a pool thread while the loop stays responsive"""
+    async def run():
+        executor = InferenceExecutor(max_workers=1)
+        loop_thread = threading.get_ident()
+        task = asyncio.ensure_future(executor.run(lambda: (time.sleep(0.05), threading.get_ident())[1]))
+
+        ticks = 0
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.005)
+        executor.shutdown()
+        return loop_thread, task.result(), ticks
+
+    loop_thread, worker_thread, ticks = asyncio.run(run())
+
+    assert worker_thread != loop_thread
+    assert ticks > 1
+
+
+def test_saturated_executor_rejects():
+    """Calls beyond max_pending are rejected immediately"""
+    async def run():
+        executor = InferenceExecutor(max_workers=1, max_pending=1)
+        first = asyncio.ensure_future(executor.run(time.sleep, 0.05))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.sleep, 0)
+        await first
+        stats = executor.get_stats()
+        executor.shutdown()
+        return stats
+
+    stats = asyncio.run(run())
+
+    assert stats['rejected_total'] == 1
+    assert stats['pending'] == 0
+
+
+def test_slow_inference_times_out():
+    """Calls exceeding the time budget raise InferenceTimeoutError"""
+    async def run():
+        executor = InferenceExecutor(max_workers=1, timeout_s=0.01)
+        with pytest.raises(InferenceTimeoutError):
+            await executor.run(time.sleep, 0.2)
+        stats = executor.get_stats()
+        executor.shutdown()
+        return stats
+
+    assert asyncio.run(run())['timeouts_total'] == 1
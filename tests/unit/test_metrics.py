@@ -0,0 +1,60 @@
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.metrics import MetricsMiddleware, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('latency_seconds', 'Latency', ['stage'], buckets=(0.1, 1.0))
+    child = histogram.labels('decode')
+    for value in (0.05, 0.5, 0.5, 5.0):
+        child.observe(value)
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{stage="decode",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="decode",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{stage="decode",le="+Inf"} 4' in text
+    assert 'latency_seconds_sum{stage="decode"} 6.05' in text
+    assert 'latency_seconds_count{stage="decode"} 4' in text
+
+
+def test_counters_and_gauges():
+    registry = MetricsRegistry()
+    errors = registry.counter('errors_total', 'Errors', ['type'])
+    depth = registry.gauge('queue_depth', 'Queue depth')
+    errors.labels('timeout').inc()
+    errors.labels('timeout').inc()
+    depth.set(7)
+
+    text = registry.render()
+    assert 'errors_total{type="timeout"} 2' in text
+    assert 'queue_depth 7' in text
+
+
+def test_middleware_counts_requests_by_route_and_status():
+    registry = MetricsRegistry()
+    requests_total = registry.counter('requests_total', 'Requests', ['path', 'status'])
+    request_seconds = registry.histogram('request_seconds', 'Latency', ['path'])
+
+    async def app(scope, receive, send):
+        status = 200 if scope['path'] == '/health' else 404
+        await send({'type': 'http.response.start', 'status': status, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def send(message):
+        pass
+
+    middleware = MetricsMiddleware(app, requests_total, request_seconds, paths=['/health'])
+    for path in ('/health', '/health', '/missing/123'):
+        asyncio.run(middleware({'type': 'http', 'path': path}, None, send))
+
+    text = registry.render()
+    assert 'requests_total{path="/health",status="200"} 2' in text
+    assert 'requests_total{path="other",status="404"} 1' in text
+    assert 'request_seconds_count{path="/health"} 2' in text
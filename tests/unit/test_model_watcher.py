@@ -0,0 +1,135 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.cascade import CASCADE_CONFIG_NAME, FIRST_STAGE_NAME, CascadeEngine, DenseEngine
+from src.serving.engines import KERAS_MODEL_NAME, InferenceEngine
+from src.serving.model_watcher import DirectoryModelSource, ModelWatcher
+
+
+class ConstantEngine(InferenceEngine):
+    name = 'constant'
+
+    def __init__(self, version):
+        self.version = version
+        self.warmed_up = False
+        self.batch_sizes = []
+
+    def predict(self, images):
+        self.warmed_up = True
+        self.batch_sizes.append(len(images))
+        return np.zeros((len(images), 10), dtype='float32')
+
+
+class FakeSource:
+    def __init__(self, version, fail=False):
+        self.version = version
+        self.fail = fail
+
+    def current_version(self):
+        return self.version
+
+    def load(self):
+        if self.fail:
+            raise OSError("corrupt artifact")
+        return ConstantEngine(self.version)
+
+
+def test_new_version_is_warmed_up_and_activated():
+    activated = []
+    source = FakeSource('v1')
+    watcher = ModelWatcher(source, activated.append)
+
+    async def run():
+        watcher.active_version = 'v1'
+        unchanged = await watcher.check()
+        source.version = 'v2'
+        changed = await watcher.check()
+        return unchanged, changed
+
+    unchanged, changed = asyncio.run(run())
+
+    assert not unchanged
+    assert changed
+    assert [e.version for e in activated] == ['v2']
+    assert activated[0].warmed_up
+
+
+def test_swapped_model_is_warmed_at_every_startup_batch_size():
+    activated = []
+    watcher = ModelWatcher(FakeSource('v2'), activated.append, warmup_batch_sizes=[1, 32])
+
+    assert asyncio.run(watcher.check())
+    assert set(activated[0].batch_sizes) == {1, 32}
+    assert watcher.get_stats()['active_version'] == 'v2'
+
+
+def test_failed_reload_keeps_the_active_model():
+    activated = []
+    watcher = ModelWatcher(FakeSource('v2', fail=True), activated.append)
+    watcher.active_version = 'v1'
+
+    assert not asyncio.run(watcher.check())
+    assert activated == []
+    assert watcher.get_stats()['reload_failures_total'] == 1
+    assert watcher.get_stats()['active_version'] == 'v1'
+
+
+def test_failed_version_is_not_reloaded_until_it_changes():
+    source = FakeSource('v2', fail=True)
+    loads = []
+    original_load = source.load
+    source.load = lambda: loads.append(source.version) or original_load()
+    watcher = ModelWatcher(source, lambda engine: None)
+    watcher.active_version = 'v1'
+
+    async def run():
+        await watcher.check()
+        await watcher.check()
+        source.version = 'v3'
+        await watcher.check()
+
+    asyncio.run(run())
+
+    assert loads == ['v2', 'v3']
+    assert watcher.get_stats()['failed_version'] == 'v3'
+
+
+def test_directory_source_tracks_artifact_content(tmp_path):
+    source = DirectoryModelSource(tmp_path, engine_name='keras')
+    assert source.current_version() is None
+
+    source.model_path.write_bytes(b'first model')
+    first = source.current_version()
+    source.model_path.write_bytes(b'second model!')
+
+    assert first is not None
+    assert source.current_version() != first
+
+
+def test_directory_source_reloads_when_the_cascade_first_stage_changes(tmp_path):
+    """Retraining only the first stage gives a new version that load() builds as a cascade"""
+    model = tf.keras.Sequential([tf.keras.Input(shape=(28, 28, 1)), tf.keras.layers.Flatten(),
+                                 tf.keras.layers.Dense(10, activation='softmax')])
+    model.save(tmp_path / KERAS_MODEL_NAME)
+    first_stage = DenseEngine([np.zeros((784, 10), dtype='float32')], [np.zeros(10, dtype='float32')])
+    first_stage.save(tmp_path / FIRST_STAGE_NAME)
+    (tmp_path / CASCADE_CONFIG_NAME).write_text(json.dumps({'threshold': 0.9}))
+    source = DirectoryModelSource(tmp_path, engine_name='keras', cascade=True)
+
+    engine = source.load()
+    first = source.current_version()
+    first_stage.biases[0][3] = 1.0
+    first_stage.save(tmp_path / FIRST_STAGE_NAME)
+
+    assert isinstance(engine, CascadeEngine)
+    assert engine.version == first
+    assert source.current_version() != first
+    assert source.load().version == source.current_version()
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.payload import (
+    PayloadError, decode_images, decode_json, decode_npy, decode_raw, encode_npy, preprocess_images
+)
+
+
+def test_decode_raw_is_zero_copy():
+    """Raw uint8 bodies should be viewed, not copied"""
+    images = np.arange(3 * 784, dtype=np.uint8).reshape(3, 28, 28)
+    body = images.tobytes()
+    decoded = decode_raw(body)
+
+    assert decoded.shape == (3, 28, 28)
+    assert not decoded.flags.owndata
+    np.testing.assert_array_equal(decoded, images)
+
+
+def test_decode_raw_rejects_partial_images():
+    """Bodies that are not a whole number of images are rejected"""
+    with pytest.raises(PayloadError):
+        decode_raw(b'\x00' * 100)
+
+
+def test_decode_npy_round_trip():
+    """An .npy body decodes to the original array"""
+    images = np.random.randint(0, 256, size=(5, 28, 28, 1)).astype(np.uint8)
+    decoded = decode_npy(encode_npy(images))
+
+    assert decoded.shape == (5, 28, 28)
+    np.testing.assert_array_equal(decoded, images[..., 0])
+
+
+def test_decode_images_dispatches_on_content_type():
+    """Content type selects the decoder"""
+    images = np.zeros((2, 28, 28), dtype=np.uint8)
+
+    assert decode_images(images.tobytes(), 'application/octet-stream').shape == (2, 28, 28)
+    assert decode_images(encode_npy(images), 'application/x-npy').shape == (2, 28, 28)
+    with pytest.raises(PayloadError):
+        decode_images(images.tobytes(), 'text/plain')
+
+
+def test_decode_json_and_preprocess():
+    """Flattened JSON images are reshaped and scaled for the CNN"""
+    images = decode_json([[255] * 784, [0] * 784])
+    processed = preprocess_images(images)
+
+    assert processed.shape == (2, 28, 28, 1)
+    assert processed.dtype == np.float32
+    assert processed[0].max() == 1.0 and processed[1].max() == 0.0
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_loader import DataLoader
+from src.monitoring.stream_monitor import StreamingDriftMonitor
+from src.serving.prediction_log import RECORD_DTYPE, PredictionLog, log_files, read_prediction_log
+
+
+def one_hot(labels):
+    return np.eye(10, dtype=np.float32)[labels]
+
+
+def test_records_round_trip_and_rotate(tmp_path):
+    log = PredictionLog(tmp_path, batch_size=4, max_file_bytes=10 * RECORD_DTYPE.itemsize)
+    images = np.arange(25, dtype=np.uint8)[:, None].repeat(784, axis=1)
+    for i in range(25):
+        log.log(images[i:i + 1], one_hot([i % 10]), 'v1', 0.002)
+    log.stop()
+
+    records = read_prediction_log(tmp_path)
+    assert len(records) == 25
+    assert len(log_files(tmp_path)) == 3
+    assert records['prediction'].tolist() == [i % 10 for i in range(25)]
+    np.testing.assert_array_equal(records['pixels'], images)
+    assert records['model_version'][0] == b'v1'
+    np.testing.assert_allclose(records['latency_ms'], 2.0)
+
+
+def test_rotation_only_prunes_this_workers_files(tmp_path):
+    """Another worker's files in the shared directory are never deleted"""
+    other_worker = tmp_path / 'predictions-20240101T000000-1-00000.plog'
+    other_worker.write_bytes(b'')
+    log = PredictionLog(tmp_path, batch_size=4, max_file_bytes=10 * RECORD_DTYPE.itemsize, max_files=1)
+    images = np.zeros((25, 784), dtype=np.uint8)
+    for i in range(25):
+        log.log(images[i:i + 1], one_hot([0]), 'v1', 0.002)
+    log.stop()
+
+    assert other_worker.exists()
+    assert len(log_files(tmp_path)) == 2
+
+
+def test_float_pixels_are_stored_as_uint8(tmp_path):
+    log = PredictionLog(tmp_path)
+    log.log(np.full((2, 28, 28, 1), 254.6), one_hot([3, 4]), 'v1', 0.0)
+    log.stop()
+
+    assert read_prediction_log(tmp_path)['pixels'].max() == 255
+
+
+def test_sampling_and_full_queue_drop_without_blocking(tmp_path):
+    sampled = PredictionLog(tmp_path / 'sampled', sample_rate=0.0)
+    assert not sampled.log(np.zeros((1, 784)), one_hot([0]), 'v1', 0.0)
+    assert sampled.get_stats()['sampled_out_total'] == 1
+
+    full = PredictionLog(tmp_path / 'full', max_queue_size=2)
+    results = [full.log(np.zeros((1, 784)), one_hot([0]), 'v1', 0.0) for _ in range(3)]
+    assert results == [True, True, False]
+    assert full.get_stats()['dropped_total'] == 1
+
+
+def test_partial_trailing_record_is_ignored(tmp_path):
+    log = PredictionLog(tmp_path)
+    log.log(np.zeros((3, 784)), one_hot([1, 2, 3]), 'v1', 0.0)
+    log.stop()
+    with open(log_files(tmp_path)[0], 'ab') as f:
+        f.write(b'\x00' * 100)
+
+    assert len(read_prediction_log(tmp_path)) == 3
+
+
+def test_log_feeds_drift_monitor_and_data_loader(tmp_path):
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, (50, 784), dtype=np.uint8)
+    labels = rng.integers(0, 10, 50)
+    probabilities = one_hot(labels) * 0.9 + 0.01
+    log = PredictionLog(tmp_path)
+    log.log(images, probabilities, 'v1', 0.001)
+    log.stop()
+
+    monitor = StreamingDriftMonitor(window_size=100, num_blocks=2)
+    assert monitor.replay(read_prediction_log(tmp_path)) == 50
+    assert monitor.get_stats()['images_seen'] == 50
+
+    x, y = DataLoader().load_prediction_log(tmp_path, min_confidence=0.5)
+    assert x.shape == (50, 28, 28)
+    np.testing.assert_array_equal(y, labels)
+    assert len(DataLoader().load_prediction_log(tmp_path, min_confidence=0.95)[0]) == 0
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.data_preprocessor import DataPreprocessor
+from src.data.processed_cache import ProcessedDataCache, load_processed_data
+from src.utils.config import config
+
+
+def make_raw_data(path, seed=0):
+    rng = np.random.RandomState(seed)
+    np.savez_compressed(
+        path,
+        x_train=rng.randint(1, 256, size=(200, 28, 28)).astype(np.uint8),
+        y_train=np.arange(200) % 10,
+        x_test=rng.randint(1, 256, size=(50, 28, 28)).astype(np.uint8),
+        y_test=np.arange(50) % 10
+    )
+    return path
+
+
+def test_cache_round_trip_is_memory_mapped(tmp_path):
+    """Saved arrays are reloaded memory-mapped and identical"""
+    raw_path = make_raw_data(tmp_path / 'raw.npz')
+    cache = ProcessedDataCache(raw_path, params={'validation_size': 0.2}, cache_dir=tmp_path / 'processed')
+    assert cache.load() is None
+
+    with np.load(raw_path) as raw:
+        processed = DataPreprocessor().preprocess(raw['x_train'], raw['y_train'], raw['x_test'], raw['y_test'])
+    cache.save(processed)
+    reloaded = ProcessedDataCache(raw_path, params={'validation_size': 0.2}, cache_dir=tmp_path / 'processed').load()
+
+    assert isinstance(reloaded['x_train'], np.memmap)
+    for name, array in processed.items():
+        np.testing.assert_array_equal(reloaded[name], array)
+
+
+def test_key_changes_with_raw_data_and_params(tmp_path):
+    """A different raw file or different params must not reuse the cache"""
+    raw_path = make_raw_data(tmp_path / 'raw.npz')
+    base = ProcessedDataCache(raw_path, params={'validation_size': 0.2}).key
+
+    assert ProcessedDataCache(raw_path, params={'validation_size': 0.3}).key != base
+    make_raw_data(raw_path, seed=1)
+    assert ProcessedDataCache(raw_path, params={'validation_size': 0.2}).key != base
+
+
+def test_narrow_dtype_is_rejected_outside_chunked_mode(tmp_path, monkeypatch):
+    """Only chunked preprocessing applies the dtype, so the full in-memory path refuses it"""
+    class RawOnlyLoader:
+        raw_data_path = make_raw_data(tmp_path / 'raw.npz')
+
+        def load_data(self):
+            raise AssertionError("nothing should be loaded")
+
+    monkeypatch.setitem(config.base['data'], 'preprocessing', {'mode': None, 'dtype': 'float16'})
+    with pytest.raises(ValueError, match='chunked'):
+        load_processed_data(RawOnlyLoader(), DataPreprocessor())
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.engines import load_engine
+from src.training.quantizer import ModelQuantizer
+
+
+def test_quantize_and_evaluate(tmp_path):
+    """Quantized variants are exported, servable and reported against float32"""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(28, 28, 1)),
+        tf.keras.layers.Conv2D(4, 3, activation='relu'),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dense(10, activation='softmax')
+    ])
+    rng = np.random.RandomState(0)
+    x_val = rng.rand(50, 28, 28, 1).astype('float32')
+    x_test = rng.rand(40, 28, 28, 1).astype('float32')
+    y_test = np.argmax(model.predict(x_test, verbose=0), axis=1)
+
+    quantizer = ModelQuantizer(tmp_path)
+    quantizer.calibration_samples = 20
+    paths = quantizer.quantize(model, x_val)
+    report = quantizer.evaluate(x_test, y_test, repeats=2)
+
+    assert set(paths) == {'float32', 'dynamic', 'int8'}
+    assert all(path.exists() for path in paths.values())
+    assert report['float32']['accuracy_delta'] == 0.0
+    assert report['int8']['size_kb'] < report['float32']['size_kb']
+    assert load_engine('tflite', tmp_path, quantization='int8').predict(x_test).shape == (40, 10)
@@ -0,0 +1,102 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.monitoring.drift_engine import ReferenceStatistics
+from src.monitoring.stream_monitor import RingBuffer, StreamingDriftMonitor
+
+
+def make_traffic(n, seed, shift=0):
+    rng = np.random.RandomState(seed)
+    images = np.clip(rng.randint(0, 120, size=(n, 28, 28, 1)) + shift, 0, 255) / 255.0
+    probabilities = rng.dirichlet(np.ones(10), size=n).astype(np.float32)
+    return images.astype(np.float32), probabilities
+
+
+def make_reference():
+    rng = np.random.RandomState(0)
+    x = rng.randint(0, 120, size=(2000, 28, 28)).astype(np.uint8)
+    return ReferenceStatistics().fit(x, rng.randint(0, 10, size=2000))
+
+
+def test_ring_buffer_wraps_and_drops_when_full():
+    buffer = RingBuffer(capacity=4)
+    images = np.arange(3)[:, None].repeat(784, axis=1).astype(np.uint8)
+    probabilities = np.zeros((3, 10), dtype=np.float32)
+
+    assert buffer.push(images, probabilities) == 3
+    assert buffer.push(images, probabilities) == 1
+    assert buffer.dropped == 2
+
+    drained, _ = buffer.drain()
+    np.testing.assert_array_equal(drained[:, 0], [0, 1, 2, 0])
+    assert len(buffer) == 0
+
+    # Writes continue past the end of the underlying array
+    buffer.push(images, probabilities)
+    drained, _ = buffer.drain()
+    np.testing.assert_array_equal(drained[:, 0], [0, 1, 2])
+
+
+def test_out_of_range_pixels_saturate():
+    """Values outside [0, 1] clip to 0 and 255 instead of wrapping around"""
+    monitor = StreamingDriftMonitor(window_size=100, num_blocks=4)
+    images = np.array([-0.5, 0.0, 1.0, 300.0 / 255.0], dtype=np.float32)[:, None].repeat(784, axis=1)
+
+    monitor.record(images, np.zeros((4, 10), dtype=np.float32))
+    pixels, _ = monitor.buffer.drain()
+
+    np.testing.assert_array_equal(pixels[:, 0], [0, 0, 255, 255])
+
+
+def test_window_only_keeps_the_most_recent_blocks():
+    monitor = StreamingDriftMonitor(window_size=100, num_blocks=4, reservoir_size=10)
+    for seed in range(5):
+        monitor.record(*make_traffic(60, seed))
+        monitor.update()
+
+    sketch = monitor.window_sketch()
+    # 300 images in blocks of 25: four full blocks in the window plus nothing partial
+    assert sketch.count == 100
+    assert sketch.pixel_histograms.sum(axis=1).tolist() == [100] * 784
+    assert monitor.get_stats()['images_seen'] == 300
+    assert monitor.get_stats()['reservoir_size'] == 10
+
+
+def test_scores_flag_shifted_traffic_and_persist(tmp_path):
+    reference = make_reference()
+
+    steady = StreamingDriftMonitor(reference, window_size=1000, output_dir=tmp_path / 'steady')
+    steady.record(*make_traffic(1000, seed=1))
+    steady.update()
+    assert steady.score()['dataset_drift'] is False
+
+    shifted = StreamingDriftMonitor(reference, window_size=1000, output_dir=tmp_path / 'shifted')
+    shifted.record(*make_traffic(1000, seed=1, shift=80))
+    shifted.update()
+    scores = shifted.score()
+    assert scores['dataset_drift'] is True
+    assert 'label_psi' in scores
+
+    history = (tmp_path / 'shifted' / 'drift_scores.jsonl').read_text().splitlines()
+    assert json.loads(history[-1])['pixel_psi_mean'] == scores['pixel_psi_mean']
+
+    # The persisted window can be compared offline like any reference
+    window = ReferenceStatistics.load(tmp_path / 'shifted' / 'live_window.npz')
+    assert window.count == 1000
+    np.testing.assert_array_equal(window.pixel_histograms, shifted.window_sketch().pixel_histograms)
+
+
+def test_background_thread_drains_on_stop():
+    monitor = StreamingDriftMonitor(window_size=100, num_blocks=4, score_interval_s=3600)
+    monitor.start()
+    monitor.record(*make_traffic(30, seed=0))
+    monitor.stop()
+
+    assert monitor.get_stats()['window_count'] == 30
+    assert monitor.get_stats()['buffered'] == 0
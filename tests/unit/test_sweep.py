@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.training.sweep import SweepRunner, apply_overrides, grid_trials, random_trials
+from src.utils.config import config
+
+
+def test_grid_covers_every_combination():
+    trials = grid_trials({'model.batch_size': [32, 64], 'model.learning_rate': [0.01, 0.001, 0.0001]})
+
+    assert len(trials) == 6
+    assert {'model.batch_size': 64, 'model.learning_rate': 0.001} in trials
+    with pytest.raises(ValueError):
+        grid_trials({'model.learning_rate': {'type': 'loguniform', 'low': 1e-4, 'high': 1e-2}})
+
+
+def test_random_trials_are_reproducible_and_in_range():
+    space = {'model.learning_rate': {'type': 'loguniform', 'low': 1e-4, 'high': 1e-2}, 'model.batch_size': [32, 128]}
+    trials = random_trials(space, 20, seed=1)
+
+    assert trials == random_trials(space, 20, seed=1)
+    assert all(1e-4 <= t['model.learning_rate'] <= 1e-2 for t in trials)
+    assert {t['model.batch_size'] for t in trials} == {32, 128}
+
+
+def test_successive_halving_rungs_and_promotion():
+    runner = SweepRunner(space={'model.batch_size': [32]}, strategy='halving', num_trials=9,
+                         min_epochs=1, max_epochs=9, eta=3, max_workers=1)
+    assert runner.rungs() == [1, 3, 9]
+    assert SweepRunner(strategy='grid', max_epochs=5).rungs() == [5]
+
+    results = [{'trial_id': i, 'score': score} for i, score in enumerate([0.5, 0.9, 0.7, 0.1, 0.8, 0.3])]
+    promoted, stopped = runner.promote(results)
+    assert [t['trial_id'] for t in promoted] == [1, 4]
+    assert len(stopped) == 4
+
+
+def test_overrides_update_config_sections(monkeypatch):
+    monkeypatch.setitem(config.base, 'model', dict(config.base['model']))
+    apply_overrides({'model.learning_rate': 0.005})
+
+    assert config.base['model']['learning_rate'] == 0.005
@@ -0,0 +1,114 @@
+import sys
+import time
+from pathlib import Path
+
+import mlflow
+import pytest
+from mlflow.store.tracking.file_store import FileStore
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.mlflow_pipeline.tracking import MLflowTracker
+from src.training.callbacks import MLflowLoggingCallback
+from src.utils.config import config
+
+EPOCHS = 10
+METRICS = ('train_accuracy', 'val_accuracy', 'train_loss', 'val_loss')
+
+
+@pytest.fixture
+def store_calls(tmp_path, monkeypatch):
+    """Point tracking at a local file store and count writes that reach it"""
+    monkeypatch.setenv('MLFLOW_ALLOW_FILE_STORE', 'true')
+    monkeypatch.setitem(config.base['mlflow'], 'tracking_uri', f'file:{tmp_path / "mlruns"}')
+    calls = {}
+    for name in ('log_metric', 'log_param', 'log_batch'):
+        original = getattr(FileStore, name)
+
+        def counted(self, *args, _original=original, _name=name, **kwargs):
+            calls[_name] = calls.get(_name, 0) + 1
+            return _original(self, *args, **kwargs)
+        monkeypatch.setattr(FileStore, name, counted)
+    yield calls
+    mlflow.set_tracking_uri(None)
+
+
+def test_batched_logging_makes_one_store_call(store_calls):
+    tracker = MLflowTracker()
+
+    with mlflow.start_run() as run:
+        start = time.perf_counter()
+        for epoch in range(EPOCHS):
+            for name in METRICS:
+                mlflow.log_metric(name, 0.5, step=epoch)
+        per_key_time = time.perf_counter() - start
+    per_key_calls = sum(store_calls.values())
+    store_calls.clear()
+
+    with tracker.start_run() as batched_run:
+        start = time.perf_counter()
+        tracker.log_params({'epochs': EPOCHS, 'batch_size': 32})
+        for epoch in range(EPOCHS):
+            tracker.log_metrics({name: 0.5 for name in METRICS}, step=epoch)
+        tracker.flush()
+        batched_time = time.perf_counter() - start
+
+    print(f"per-key: {per_key_calls} calls in {per_key_time * 1000:.1f}ms, "
+          f"batched: {sum(store_calls.values())} calls in {batched_time * 1000:.1f}ms")
+    assert per_key_calls == EPOCHS * len(METRICS)
+    assert store_calls == {'log_batch': 1}
+
+    history = tracker.client.get_metric_history(batched_run.info.run_id, 'val_loss')
+    assert [metric.step for metric in history] == list(range(EPOCHS))
+    assert tracker.client.get_run(batched_run.info.run_id).data.params['epochs'] == str(EPOCHS)
+
+
+def test_callback_flushes_in_background_and_at_train_end(store_calls):
+    tracker = MLflowTracker()
+    callback = MLflowLoggingCallback(tracker, flush_interval_s=0.01)
+
+    with tracker.start_run() as run:
+        callback.on_train_begin()
+        callback.on_epoch_end(0, {'accuracy': 0.9, 'val_loss': 0.3})
+        time.sleep(0.2)
+        assert store_calls.get('log_batch') == 1
+
+        callback.on_epoch_end(1, {'accuracy': 0.95, 'val_loss': 0.2})
+        callback.on_train_end()
+
+    metrics = tracker.client.get_run(run.info.run_id).data.metrics
+    assert metrics == {'train_accuracy': 0.95, 'val_loss': 0.2}
+
+
+def test_logging_outside_a_run_starts_one(store_calls):
+    tracker = MLflowTracker()
+
+    tracker.log_metrics({'val_loss': 0.3})
+    run = mlflow.active_run()
+    try:
+        assert run is not None
+        tracker.flush()
+        assert tracker.client.get_run(run.info.run_id).data.metrics == {'val_loss': 0.3}
+    finally:
+        mlflow.end_run()
+
+
+def test_failed_flush_keeps_buffered_entries(store_calls, monkeypatch):
+    tracker = MLflowTracker()
+    original = FileStore.log_batch
+
+    def failing(self, *args, **kwargs):
+        raise ConnectionError("tracking server unavailable")
+
+    with tracker.start_run() as run:
+        tracker.log_metrics({'val_loss': 0.3}, step=0)
+        monkeypatch.setattr(FileStore, 'log_batch', failing)
+        with pytest.raises(Exception):
+            tracker.flush()
+
+        tracker.log_metrics({'val_loss': 0.2}, step=1)
+        monkeypatch.setattr(FileStore, 'log_batch', original)
+
+    history = tracker.client.get_metric_history(run.info.run_id, 'val_loss')
+    assert [(metric.step, metric.value) for metric in history] == [(0, 0.3), (1, 0.2)]
@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.serving.engines import InferenceEngine
+from src.serving.versions import ServedVersion, VersionRouter, load_version
+
+
+class ClassEngine(InferenceEngine):
+    """Predicts the same class for every image"""
+
+    name = 'class'
+
+    def __init__(self, label, version):
+        self.label = label
+        self.version = version
+
+    def predict(self, images):
+        return np.tile(np.eye(10, dtype='float32')[self.label], (len(images), 1))
+
+
+class FakeSource:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def load(self):
+        return self.engine
+
+
+def images(n):
+    return np.zeros((n, 28, 28, 1), dtype='float32')
+
+
+def test_canary_weight_sets_traffic_share():
+    """A canary with weight 0.2 serves about a fifth of requests"""
+    canary = ServedVersion('next', ClassEngine(1, 'v2'), mode='canary', weight=0.2)
+    router = VersionRouter([canary], seed=0)
+
+    chosen = [router.choose() for _ in range(5000)]
+
+    share = sum(version is canary for version in chosen) / len(chosen)
+    assert 0.17 < share < 0.23
+    assert all(version in (None, canary) for version in chosen)
+
+
+def test_canary_weights_cannot_exceed_all_traffic():
+    versions = [ServedVersion(name, ClassEngine(0, name), mode='canary', weight=0.6) for name in ('a', 'b')]
+
+    with pytest.raises(ValueError):
+        VersionRouter(versions)
+
+
+def test_shadow_compares_a_copy_with_the_primary():
+    """Shadow predictions run in the background and count agreement per image"""
+    agreeing = ServedVersion('same', ClassEngine(3, 'v1b'), mode='shadow')
+    disagreeing = ServedVersion('other', ClassEngine(4, 'v2'), mode='shadow')
+    router = VersionRouter([agreeing, disagreeing])
+    batch = images(4)
+    primary = ClassEngine(3, 'v1').predict(batch)
+
+    assert router.shadow(batch, primary)
+    batch[:] = 1.0
+    assert router.drain()
+
+    stats = router.get_stats()['versions']
+    assert stats['same']['agreement_rate'] == 1.0
+    assert stats['other']['agreement_rate'] == 0.0
+    assert stats['other']['images_total'] == 4
+    assert stats['other']['latency_ms_p50'] is not None
+    router.shutdown()
+
+
+def test_shadow_drops_batches_when_behind():
+    """Beyond max_pending queued batches new ones are dropped, not queued"""
+    shadow = ServedVersion('slow', ClassEngine(0, 'v2'), mode='shadow')
+    router = VersionRouter([shadow], max_pending=0)
+
+    assert not router.shadow(images(1), np.zeros((1, 10)))
+    assert router.get_stats()['versions']['slow']['dropped_total'] == 1
+    router.shutdown()
+
+
+def test_load_version_reports_memory():
+    version = load_version('staging', FakeSource(ClassEngine(0, 'v2')), mode='shadow')
+
+    stats = version.get_stats()
+    assert stats['version'] == 'v2'
+    assert stats['memory_mb'] is not None